@@ -3,14 +3,20 @@
 
 import argparse
 import datetime
+import hashlib
 import importlib.metadata
 import json
 import logging
+import mmap
+import os
 import re
 import statistics
 import subprocess
 import xml.etree.ElementTree as ET
+from collections import Counter
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from itertools import pairwise
 from pathlib import Path
 from typing import Any
 
@@ -19,6 +25,13 @@ from parse_raw_benchmark import BenchmarkReportParser
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
+# JSONL files smaller than this are parsed without a process pool
+PARALLEL_JSONL_MIN_SIZE = 16 << 20
+# Largest chunk of a JSONL file decoded at once by a worker
+JSONL_CHUNK_SIZE = 64 << 20
+# Version of the cached JSONL statistics, bumped when their format changes
+JSONL_STATS_VERSION = 1
+
 # Query categories in priority order. First match wins.
 # Each entry: (category_name, classifier_function)
 CATEGORY_RULES: list[tuple[str, Callable[[str], bool]]] = []
@@ -131,15 +144,81 @@ def classify_query(query: str) -> str:
     return "Complex Patterns"
 
 
+def _jsonl_chunks(mm: mmap.mmap, count: int) -> list[tuple[int, int]]:
+    """Split a memory-mapped file into about `count` ranges ending at newlines."""
+    bounds = [0]
+    for i in range(1, count):
+        newline = mm.find(b"\n", max(bounds[-1], len(mm) * i // count))
+        if newline == -1:
+            break
+        bounds.append(newline + 1)
+    bounds.append(len(mm))
+    return [(start, end) for start, end in pairwise(bounds) if start < end]
+
+
+def _parse_jsonl_chunk(path: str, start: int, end: int) -> dict[str, Any]:
+    """Collect the statistics of the JSONL lines between two byte offsets."""
+    total_nodes = 0
+    total_relationships = 0
+    node_labels: Counter[str] = Counter()
+    rel_types: Counter[str] = Counter()
+
+    # json.loads is faster on str than on bytes: decode the chunk at once
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode()
+
+    # Not splitlines(), which also splits at separators allowed in JSON strings
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        record_type = record.get("type")
+        if record_type == "node":
+            total_nodes += 1
+            node_labels.update(record.get("labels", []))
+        elif record_type == "relationship":
+            total_relationships += 1
+            rel_types[record.get("label", "UNKNOWN")] += 1
+
+    return {
+        "total_nodes": total_nodes,
+        "total_relationships": total_relationships,
+        "node_labels": dict(node_labels),
+        "rel_types": dict(rel_types),
+    }
+
+
+def _merge_jsonl_stats(chunks: list[dict[str, Any]]) -> dict[str, Any]:
+    """Merge the statistics of consecutive chunks of a JSONL file."""
+    node_labels: Counter[str] = Counter()
+    rel_types: Counter[str] = Counter()
+    for chunk in chunks:
+        node_labels.update(chunk["node_labels"])
+        rel_types.update(chunk["rel_types"])
+
+    return {
+        "total_nodes": sum(chunk["total_nodes"] for chunk in chunks),
+        "total_relationships": sum(chunk["total_relationships"] for chunk in chunks),
+        "node_labels": dict(node_labels),
+        "rel_types": dict(rel_types),
+    }
+
+
 class ReportGenerator:
     def __init__(
-        self, reports_dir: Path, template_path: Path, dumps_dir: Path | None = None
+        self,
+        reports_dir: Path,
+        template_path: Path,
+        dumps_dir: Path | None = None,
+        jobs: int | None = None,
     ):
         self.reports_dir = reports_dir
         self.template_path = template_path
         self.dumps_dir = (
             dumps_dir if dumps_dir is not None else reports_dir.parent / "dumps"
         )
+        self.jobs = jobs or os.cpu_count() or 1
         self.parsers: dict[str, BenchmarkReportParser] = {}
         self.summaries: dict[str, list[dict[str, str]]] = {}
 
@@ -160,7 +239,13 @@ class ReportGenerator:
         report_files = self._discover_reports()
         for dataset, path in report_files.items():
             try:
-                parser = BenchmarkReportParser(str(path))
+                samples = self.reports_dir / f"{dataset}_samples.csv.gz"
+                startup = self.reports_dir / f"{dataset}_startup.jsonl"
+                parser = BenchmarkReportParser(
+                    str(path),
+                    samples_files=[str(samples)] if samples.exists() else None,
+                    startup_file=str(startup) if startup.exists() else None,
+                )
                 parser.parse()
                 summary = parser.create_summary()
                 if summary:
@@ -198,7 +283,8 @@ class ReportGenerator:
                 ]:
                     val = row.get(col, "-")
                     match = re.match(r"([\d.]+)x", val)
-                    if match:
+                    # Speedups over an engine returning other results (⚠) do not count
+                    if match and "⚠" not in val:
                         target.append(float(match.group(1)))
 
         def _stats(values: list[float]) -> dict[str, Any]:
@@ -288,34 +374,80 @@ class ReportGenerator:
         return "\n".join(lines)
 
     def _parse_jsonl_stats(self, jsonl_path: Path) -> dict[str, Any]:
-        """Parse a JSONL file line-by-line and collect dataset statistics."""
-        total_nodes = 0
-        total_relationships = 0
-        node_labels: dict[str, int] = {}
-        rel_types: dict[str, int] = {}
-
-        with open(jsonl_path) as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                record = json.loads(line)
-                record_type = record.get("type")
-                if record_type == "node":
-                    total_nodes += 1
-                    for label in record.get("labels", []):
-                        node_labels[label] = node_labels.get(label, 0) + 1
-                elif record_type == "relationship":
-                    total_relationships += 1
-                    rel_label = record.get("label", "UNKNOWN")
-                    rel_types[rel_label] = rel_types.get(rel_label, 0) + 1
-
-        return {
-            "total_nodes": total_nodes,
-            "total_relationships": total_relationships,
-            "node_labels": node_labels,
-            "rel_types": rel_types,
-        }
+        """
+        Collect dataset statistics from a JSONL file, or from their cache next
+        to it. The cache is used if the file's size and mtime are unchanged,
+        or if its content hash is.
+        """
+        cache_path = jsonl_path.with_name(jsonl_path.name + ".stats.json")
+        stat = jsonl_path.stat()
+        cache: dict[str, Any] = {}
+        if cache_path.exists():
+            try:
+                cache = json.loads(cache_path.read_text())
+            except (OSError, json.JSONDecodeError):
+                logger.warning(f"Ignoring unreadable stats cache {cache_path}")
+        if (
+            cache.get("version") != JSONL_STATS_VERSION
+            or cache.get("size") != stat.st_size
+        ):
+            cache = {}
+        elif cache.get("mtime_ns") == stat.st_mtime_ns:
+            return cache["stats"]
+        if stat.st_size == 0:
+            return _merge_jsonl_stats([])
+
+        with (
+            open(jsonl_path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            if cache and hashlib.blake2b(mm).hexdigest() == cache.get("hash"):
+                stats = cache["stats"]
+                digest = cache["hash"]
+            else:
+                stats, digest = self._parse_jsonl_mmap(jsonl_path, mm)
+
+        try:
+            cache_path.write_text(
+                json.dumps(
+                    {
+                        "version": JSONL_STATS_VERSION,
+                        "size": stat.st_size,
+                        "mtime_ns": stat.st_mtime_ns,
+                        "hash": digest,
+                        "stats": stats,
+                    }
+                )
+            )
+        except OSError as e:
+            # e.g. a read-only dumps directory: the stats are still reported
+            logger.warning(f"Could not write stats cache {cache_path}: {e}")
+        return stats
+
+    def _parse_jsonl_mmap(
+        self, jsonl_path: Path, mm: mmap.mmap
+    ) -> tuple[dict[str, Any], str]:
+        """
+        Parse a memory-mapped JSONL file in chunks split at newlines, over a
+        process pool for large files. The file is hashed while the workers
+        parse. Returns the statistics and the hash.
+        """
+        chunks = _jsonl_chunks(mm, max(self.jobs * 4, -(-len(mm) // JSONL_CHUNK_SIZE)))
+        if len(mm) < PARALLEL_JSONL_MIN_SIZE or self.jobs == 1:
+            stats = _merge_jsonl_stats(
+                [_parse_jsonl_chunk(str(jsonl_path), *chunk) for chunk in chunks]
+            )
+            return stats, hashlib.blake2b(mm).hexdigest()
+
+        logger.info(f"Parsing {jsonl_path} with {self.jobs} processes")
+        with ProcessPoolExecutor(self.jobs) as pool:
+            futures = [
+                pool.submit(_parse_jsonl_chunk, str(jsonl_path), start, end)
+                for start, end in chunks
+            ]
+            digest = hashlib.blake2b(mm).hexdigest()
+            stats = _merge_jsonl_stats([future.result() for future in futures])
+        return stats, digest
 
     def _build_dataset_info(self) -> str:
         """Build dataset statistics section from JSONL files."""
@@ -389,6 +521,7 @@ class ReportGenerator:
             "Memgraph",
             "Speedup vs Neo4j",
             "Speedup vs Memgraph",
+            "Results",
         ]
         # Only include columns that exist in the data
         columns = [c for c in columns if any(c in row for row in rows)]
@@ -800,13 +933,22 @@ def main() -> None:
         default=None,
         help="Directory containing {dataset}.jsonl files (default: <reports-dir>/../dumps)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Processes parsing the JSONL files (default: number of CPUs)",
+    )
     args = parser.parse_args()
 
     if not args.template.exists():
         logger.error(f"Template file not found: {args.template}")
         return
 
-    generator = ReportGenerator(args.reports_dir, args.template, args.dumps_dir)
+    generator = ReportGenerator(
+        args.reports_dir, args.template, args.dumps_dir, args.jobs
+    )
     generator.save(args.output)
 
 
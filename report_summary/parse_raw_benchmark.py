@@ -4,17 +4,105 @@
 import os
 import platform
 import re
+import statistics
 import subprocess
 import csv
+import gzip
+import json
 import logging
+from array import array
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, ClassVar, Dict, List, Tuple
+
+import numpy as np
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 
+def load_samples(
+    samples_file: str | Path, variants: Dict[str, str] | None = None
+) -> Dict[str, Dict[str, array]]:
+    """
+    Load the latency samples (in microseconds) of sequential runs from a
+    --samples file written by turingbench: engine -> query -> samples.
+    Only one variant of each engine is loaded, `variants[engine]` or else the
+    first one in the file, since runs with other consume modes, session
+    strategies or plan modes are not comparable.
+    """
+    samples: Dict[str, Dict[str, array]] = {}
+    variants = dict(variants or {})
+    ignored: Dict[str, set[str]] = {}
+
+    with gzip.open(samples_file, "rt", newline="") as f:
+        for row in csv.DictReader(f):
+            # Load levels (--concurrency/--rate) are not comparable to sequential runs
+            if row["level"]:
+                continue
+            engine = row["engine"]
+            if row["variant"] != variants.setdefault(engine, row["variant"]):
+                ignored.setdefault(engine, set()).add(row["variant"])
+                continue
+            samples.setdefault(engine, {}).setdefault(row["query"], array("q")).append(
+                int(row["latency_us"])
+            )
+
+    for engine, others in ignored.items():
+        logger.warning(
+            f"Using the '{variants[engine]}' samples of {engine} in {samples_file}, "
+            f"ignoring {', '.join(sorted(others))}"
+        )
+    return samples
+
+
+def load_startup(startup_file: str | Path) -> Dict[str, Dict[str, float]]:
+    """
+    Load the startup times recorded by scripts/manage_servers.py --metrics:
+    engine -> "Time to ready"/"Graph load" -> seconds, of its last start
+    """
+    startup: Dict[str, Dict[str, float]] = {}
+    with open(startup_file) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            metrics = startup[record["engine"]] = {}
+            if record.get("ready_s") is not None:
+                metrics["Time to ready"] = record["ready_s"]
+            if record.get("graph_load_s") is not None:
+                metrics["Graph load"] = record["graph_load_s"]
+    return startup
+
+
+def parse_variants(values: List[str] | None) -> Dict[str, str]:
+    """Parse --variant ENGINE=VARIANT options"""
+    variants = {}
+    for value in values or []:
+        engine, sep, variant = value.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid --variant '{value}', expected ENGINE=VARIANT")
+        variants[engine] = variant
+    return variants
+
+
+def bootstrap_statistic(
+    times: array, metric: str, resamples: int, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Mean or median of `resamples` bootstrap resamples of latency samples,
+    drawn as multinomial counts over their distinct values
+    """
+    values, counts = np.unique(np.frombuffer(times, dtype=np.int64), return_counts=True)
+    n = len(times)
+    drawn = rng.multinomial(n, counts / n, size=resamples)
+
+    if metric == "median":
+        cumulative = np.cumsum(drawn, axis=1)
+        return values[np.argmax(cumulative >= (n + 1) // 2, axis=1)].astype(float)
+    return drawn @ values / n
+
+
 class BenchmarkReportParser:
     """Parse benchmark report files and extract mean runtimes"""
 
@@ -22,8 +110,27 @@ class BenchmarkReportParser:
 
     TOOL_DISPLAY_ORDER = ["TuringDB", "Neo4j", "Memgraph"]
 
+    # Startup metrics printed by scripts/manage_servers.py and the drivers,
+    # read from the raw output when no startup file is given
+    READY_PATTERN = re.compile(r"(TuringDB|Neo4j|Memgraph) started, ready in ([\d.]+)s")
+    GRAPH_LOAD_PATTERN = re.compile(r"[Gg]raph \S+ loaded in ([\d.]+)s")
+
+    # Metrics that can be computed from raw samples
+    SAMPLE_METRICS: ClassVar[Dict[str, Callable[..., float]]] = {
+        "mean": statistics.fmean,
+        "median": statistics.median,
+        "min": min,
+        "max": max,
+    }
+
     def __init__(
-        self, report_file: str, metric: str = "mean", output_dir: str | None = None
+        self,
+        report_file: str,
+        metric: str = "mean",
+        output_dir: str | None = None,
+        samples_files: List[str] | None = None,
+        variants: Dict[str, str] | None = None,
+        startup_file: str | None = None,
     ):
         self.report_file = Path(report_file)
 
@@ -36,6 +143,17 @@ class BenchmarkReportParser:
         self.summary: List[Dict[str, str]] = []
         self.metric = metric.lower()
         self.output_dir = Path(output_dir) if output_dir else None
+        self.samples_files = [Path(path) for path in samples_files or []]
+        self.variants = variants
+        # tool -> query -> raw samples, or 95% confidence interval (in µs) of
+        # the metric when read from a report table, to compute speedup intervals
+        self.tools_samples: Dict[str, Dict[str, array]] = {}
+        self.tools_intervals: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        # tool -> "Time to ready"/"Graph load" -> seconds
+        self.tools_startup: Dict[str, Dict[str, float]] = {}
+        self.startup_file = Path(startup_file) if startup_file else None
+        # tool -> query -> row count and fingerprint of its result (--validate)
+        self.tools_fingerprints: Dict[str, Dict[str, Tuple[str, str]]] = {}
 
     def _get_repo_root(self) -> Path:
         """Get the git repository root"""
@@ -80,6 +198,7 @@ class BenchmarkReportParser:
         table_lines = []
         header_match = None
         in_table = False
+        in_fingerprints = False
 
         for line in lines:
             # Format 1: Unicode box drawing header (║ TuringDB ║)
@@ -91,7 +210,7 @@ class BenchmarkReportParser:
                 current_tool = self.TOOL_NAME_MAP[header_box_match.group(1).lower()]
                 header_match = None
                 table_lines = []
-                in_table = False
+                in_table = in_fingerprints = False
 
             # Format 2: "Running benchmark for 'toolname'"
             tool_match = re.search(
@@ -104,12 +223,38 @@ class BenchmarkReportParser:
                 current_tool = self.TOOL_NAME_MAP[tool_match.group(1).lower()]
                 header_match = None
                 table_lines = []
-                in_table = False
+                in_table = in_fingerprints = False
+
+            ready_match = None if self.startup_file else self.READY_PATTERN.search(line)
+            if ready_match:
+                self.tools_startup.setdefault(ready_match.group(1), {})[
+                    "Time to ready"
+                ] = float(ready_match.group(2))
+            graph_match = (
+                None if self.startup_file else self.GRAPH_LOAD_PATTERN.search(line)
+            )
+            if graph_match and current_tool:
+                self.tools_startup.setdefault(current_tool, {})["Graph load"] = float(
+                    graph_match.group(1)
+                )
 
-            # Detect table header (contains Query and Mean columns)
-            if "Query" in line and "Mean" in line and "|" in line:
-                header_match = line
-                in_table = True
+            # Detect table header (contains Query and Mean columns). Rows of other
+            # per-query tables (comparisons, plan split) are not collected, but
+            # those of the result fingerprints are (Query, Rows, Fingerprint)
+            if "Query" in line and "|" in line:
+                cells = [part.strip() for part in line.split("|")]
+                in_table = "Mean" in cells
+                in_fingerprints = "Fingerprint" in cells
+                if in_table:
+                    header_match = line
+
+            elif in_fingerprints and current_tool and line.startswith("|"):
+                parts = [p.strip() for p in line.split("|")]
+                if len(parts) >= 5 and parts[1].lower().startswith(("match", "create")):
+                    self.tools_fingerprints.setdefault(current_tool, {})[parts[1]] = (
+                        parts[2],
+                        parts[3],
+                    )
 
             # Collect table rows
             elif (
@@ -131,9 +276,16 @@ class BenchmarkReportParser:
             tools[tool] = {"header": header, "table": "\n".join(lines)}
 
     def _parse_table(
-        self, table_info: Dict[str, str], metric: str = "mean"
+        self,
+        table_info: Dict[str, str],
+        metric: str = "mean",
+        intervals: Dict[str, Tuple[float, float]] | None = None,
     ) -> Dict[str, str]:
-        """Parse table content and extract query -> metric mapping"""
+        """
+        Parse table content and extract query -> metric mapping, and the
+        confidence intervals of the metric into `intervals` if the table has a
+        '<metric> CI' column
+        """
         query_metric = {}
 
         # Find column indices from header
@@ -146,6 +298,8 @@ class BenchmarkReportParser:
         except ValueError:
             logger.warning("Could not find required columns in header")
             return query_metric
+        ci_column = f"{metric.lower()} ci"
+        ci_idx = header_parts.index(ci_column) if ci_column in header_parts else None
 
         # Parse table rows
         for line in table_info["table"].split("\n"):
@@ -163,13 +317,54 @@ class BenchmarkReportParser:
             if query and metric_value and query.lower().startswith(("match", "create")):
                 query_metric[query] = metric_value
 
+                # Interval formatted as "[low, high]"
+                if intervals is not None and ci_idx is not None and len(parts) > ci_idx:
+                    bounds = [
+                        self._parse_us(bound)
+                        for bound in parts[ci_idx].strip("[]").split(",")
+                    ]
+                    low, high = bounds if len(bounds) == 2 else (None, None)
+                    if low is not None and high is not None:
+                        intervals[query] = (low, high)
+
         return query_metric
 
+    def _parse_samples(self) -> Dict[str, Dict[str, str]]:
+        """Compute query -> metric mappings for each tool from raw sample files"""
+        tools: Dict[str, Dict[str, str]] = {}
+        compute = self.SAMPLE_METRICS.get(self.metric)
+        if compute is None:
+            logger.warning(f"Metric '{self.metric}' can't be computed from samples")
+            return tools
+
+        for samples_file in self.samples_files:
+            for engine, queries in load_samples(samples_file, self.variants).items():
+                tool = self.TOOL_NAME_MAP.get(engine.lower())
+                if tool is None:
+                    logger.warning(f"Unknown engine '{engine}' in {samples_file}")
+                    continue
+                tools[tool] = {
+                    query: self._format_us(compute(times))
+                    for query, times in queries.items()
+                }
+                self.tools_samples[tool] = queries
+
+        return tools
+
     def parse(self) -> Dict[str, Dict[str, str]]:
-        """Parse the entire report and return data for all tools"""
+        """
+        Parse the entire report and return data for all tools.
+        Tools found in the raw sample files use the samples instead of the
+        rounded values of the report tables.
+        """
         tables = self._extract_tables()
         for tool, table_info in tables.items():
-            self.tools_data[tool] = self._parse_table(table_info, self.metric)
+            self.tools_data[tool] = self._parse_table(
+                table_info, self.metric, self.tools_intervals.setdefault(tool, {})
+            )
+        self.tools_data.update(self._parse_samples())
+        if self.startup_file:
+            self.tools_startup = load_startup(self.startup_file)
         return self.tools_data
 
     def get_all_queries(self) -> List[str]:
@@ -188,14 +383,29 @@ class BenchmarkReportParser:
 
         return queries
 
-    @staticmethod
-    def _parse_ms(value: str) -> float | None:
-        """Parse a metric value like '5ms' or '1265ms' into a float, or None if unparseable"""
-        match = re.match(r"(\d+(?:\.\d+)?)\s*ms", value.strip())
+    # Microseconds per unit of the durations printed by turingbench
+    UNIT_US: ClassVar[Dict[str, int]] = {"µs": 1, "us": 1, "ms": 1_000, "s": 1_000_000}
+
+    @classmethod
+    def _parse_us(cls, value: str) -> float | None:
+        """
+        Parse a metric value like '850µs', '12.345ms', '1265ms' or '3.210s' into
+        microseconds, or None if unparseable
+        """
+        match = re.match(r"(\d+(?:\.\d+)?)\s*(µs|us|ms|s)$", value.strip())
         if match:
-            return float(match.group(1))
+            return float(match.group(1)) * cls.UNIT_US[match.group(2)]
         return None
 
+    @staticmethod
+    def _format_us(us: float) -> str:
+        """Format microseconds like turingbench does: 950µs, 12.345ms, 3.210s"""
+        if us < 1_000:
+            return f"{us:.0f}µs"
+        if us < 1_000_000:
+            return f"{us / 1_000:.3f}ms"
+        return f"{us / 1_000_000:.3f}s"
+
     @staticmethod
     def _format_speedup(ratio: float) -> str:
         """Format a speedup ratio as a human-readable string"""
@@ -203,8 +413,63 @@ class BenchmarkReportParser:
             return f"{ratio:.0f}x"
         return f"{ratio:.1f}x"
 
+    def _speedup_interval(self, query: str, tool: str) -> Tuple[float, float] | None:
+        """
+        95% confidence interval of the speedup of TuringDB over `tool`: a
+        bootstrap of the ratio when both have raw samples, otherwise the
+        (conservative) ratio of the bounds of their confidence intervals
+        """
+        turing_samples = self.tools_samples.get("TuringDB", {}).get(query)
+        other_samples = self.tools_samples.get(tool, {}).get(query)
+        if turing_samples and other_samples and self.metric in ("mean", "median"):
+            rng = np.random.default_rng(0)
+            turing = bootstrap_statistic(turing_samples, self.metric, 1000, rng)
+            other = bootstrap_statistic(other_samples, self.metric, 1000, rng)
+            valid = turing > 0
+            if not valid.any():
+                return None
+            low, high = np.percentile(other[valid] / turing[valid], [2.5, 97.5])
+            return float(low), float(high)
+
+        turing_ci = self.tools_intervals.get("TuringDB", {}).get(query)
+        other_ci = self.tools_intervals.get(tool, {}).get(query)
+        if turing_ci and other_ci and turing_ci[0] > 0:
+            return other_ci[0] / turing_ci[1], other_ci[1] / turing_ci[0]
+        return None
+
+    def _fingerprints_match(self, query: str, tool: str, other: str) -> bool:
+        """Whether two tools returned the same result, if both fingerprinted it"""
+        mine = self.tools_fingerprints.get(tool, {}).get(query)
+        theirs = self.tools_fingerprints.get(other, {}).get(query)
+        return mine is None or theirs is None or mine == theirs
+
+    def _result_status(self, query: str) -> str:
+        """
+        Agreement of the tools' result fingerprints of a query: ✓, or ✗ and the
+        row count and fingerprint prefix of each group of tools that agree
+        """
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for tool in self.TOOL_DISPLAY_ORDER:
+            fingerprint = self.tools_fingerprints.get(tool, {}).get(query)
+            if fingerprint:
+                groups.setdefault(fingerprint, []).append(tool)
+
+        if sum(len(tools) for tools in groups.values()) < 2:
+            return "-"
+        if len(groups) == 1:
+            return "✓"
+        return "✗ " + "; ".join(
+            f"{', '.join(tools)}: {rows} rows #{fingerprint[:8]}"
+            for (rows, fingerprint), tools in groups.items()
+        )
+
     def create_summary(self) -> List[Dict[str, str]]:
-        """Create summary table with queries and metrics per tool, plus speedup columns"""
+        """
+        Create summary table with queries and metrics per tool, plus speedup
+        columns with their 95% confidence interval when it can be computed.
+        With result fingerprints (--validate), a Results column tells whether
+        the tools agree, and speedups over a tool that disagrees are flagged ⚠
+        """
         queries = self.get_all_queries()
         # Use fixed display order, keeping only tools present in the data
         tools = [t for t in self.TOOL_DISPLAY_ORDER if t in self.tools_data]
@@ -217,18 +482,32 @@ class BenchmarkReportParser:
                 row[tool] = metric_value
 
             # Add speedup columns if TuringDB data is present
-            turing_val = self._parse_ms(row.get("TuringDB", "-"))
+            turing_val = self._parse_us(row.get("TuringDB", "-"))
             if turing_val and turing_val > 0:
                 for tool in tools:
                     if tool == "TuringDB":
                         continue
-                    other_val = self._parse_ms(row.get(tool, "-"))
+                    other_val = self._parse_us(row.get(tool, "-"))
                     col = f"Speedup vs {tool}"
                     if other_val:
                         row[col] = self._format_speedup(other_val / turing_val)
+                        interval = self._speedup_interval(query, tool)
+                        if interval:
+                            low, high = interval
+                            row[col] += (
+                                f" [{self._format_speedup(low)}, "
+                                f"{self._format_speedup(high)}]"
+                            )
+                        if not self._fingerprints_match(query, "TuringDB", tool):
+                            row[col] += " ⚠"
                     else:
                         row[col] = "-"
 
+            if self.tools_fingerprints:
+                row["Results"] = self._result_status(query)
+                if row["Results"].startswith("✗"):
+                    logger.warning(f"Results differ for {query}: {row['Results'][2:]}")
+
             self.summary.append(row)
 
         return self.summary
@@ -237,7 +516,8 @@ class BenchmarkReportParser:
         """Get all data columns (tools + speedup columns) in fixed display order"""
         tools = [t for t in self.TOOL_DISPLAY_ORDER if t in self.tools_data]
         speedup_cols = [f"Speedup vs {t}" for t in tools if t != "TuringDB"]
-        return tools + speedup_cols
+        result_cols = ["Results"] if self.tools_fingerprints else []
+        return tools + speedup_cols + result_cols
 
     def save_csv(
         self, output_file: str | None = None, dataset_name: str | None = None
@@ -335,8 +615,11 @@ class BenchmarkReportParser:
         output_path = output_dir / output_file
 
         markdown_table = self._generate_markdown_table()
+        startup_table = self._generate_startup_table()
         with open(output_path, "w") as f:
             f.write(markdown_table)
+            if startup_table:
+                f.write(f"\n\n{startup_table}\n")
 
         logger.info(f"Summary saved to {output_path}")
 
@@ -382,6 +665,28 @@ class BenchmarkReportParser:
 
         return "\n".join(lines)
 
+    def _generate_startup_table(self) -> str:
+        """Generate markdown table of the startup metrics of each tool"""
+        tools = [t for t in self.TOOL_DISPLAY_ORDER if t in self.tools_startup]
+        if not tools:
+            return ""
+
+        metrics = ["Time to ready", "Graph load"]
+        lines = [
+            "| Engine | " + " | ".join(metrics) + " |",
+            "|--------|" + "|".join("-" * (len(m) + 2) for m in metrics) + "|",
+        ]
+        for tool in tools:
+            values = [
+                f"{self.tools_startup[tool][m]:.3f}s"
+                if m in self.tools_startup[tool]
+                else "-"
+                for m in metrics
+            ]
+            lines.append(f"| {tool} | " + " | ".join(values) + " |")
+
+        return "\n".join(lines)
+
     @staticmethod
     def _get_machine_specs() -> str:
         """Collect machine specs and return as a markdown line"""
@@ -490,6 +795,9 @@ class BenchmarkReportParser:
         markdown_table = self._generate_markdown_table()
         machine_specs = self._get_machine_specs()
         section_content = f"> {machine_specs}\n\n{markdown_table}"
+        startup_table = self._generate_startup_table()
+        if startup_table:
+            section_content += f"\n\n{startup_table}"
 
         # Create dataset-specific markers
         start_marker = f"<!-- BENCHMARK_RESULTS_{dataset_name.upper()}_START -->"
@@ -559,6 +867,14 @@ class BenchmarkReportParser:
             )
             print(query + " | " + values)
 
+        for tool in self.TOOL_DISPLAY_ORDER:
+            if tool in self.tools_startup:
+                metrics = ", ".join(
+                    f"{metric} {seconds:.3f}s"
+                    for metric, seconds in self.tools_startup[tool].items()
+                )
+                print(f"{tool} startup: {metrics}")
+
 
 def main():
     import argparse
@@ -574,6 +890,24 @@ def main():
         "--metric", default="mean", help="Metric to extract (default: mean)"
     )
     arg_parser.add_argument("--output-dir", help="Custom output directory for reports")
+    arg_parser.add_argument(
+        "--samples",
+        nargs="+",
+        default=None,
+        help="Raw sample files (turingbench --samples) to compute metrics from",
+    )
+    arg_parser.add_argument(
+        "--startup",
+        help="Startup times file (scripts/manage_servers.py --metrics) to read "
+        "instead of the startup messages of the raw output",
+    )
+    arg_parser.add_argument(
+        "--variant",
+        action="append",
+        metavar="ENGINE=VARIANT",
+        help="Variant of an engine's raw samples, e.g. neo4j=materialize/per-query "
+        "(default: the first one of each engine)",
+    )
     arg_parser.add_argument(
         "--print",
         action="store_true",
@@ -593,9 +927,18 @@ def main():
 
     if args.update_readme and not args.dataset:
         arg_parser.error("--dataset is required when using --update-readme")
+    try:
+        variants = parse_variants(args.variant)
+    except ValueError as e:
+        arg_parser.error(str(e))
 
     parser = BenchmarkReportParser(
-        args.report_file, metric=args.metric, output_dir=args.output_dir
+        args.report_file,
+        metric=args.metric,
+        output_dir=args.output_dir,
+        samples_files=args.samples,
+        variants=variants,
+        startup_file=args.startup,
     )
     parser.parse()
     parser.create_summary()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Report how query latencies grow over the datasets of a scaling sweep."""
+
+import argparse
+import json
+import logging
+import math
+import statistics
+import sys
+from pathlib import Path
+
+import numpy as np
+from parse_raw_benchmark import BenchmarkReportParser, load_samples, parse_variants
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+# Samples are whole microseconds: in log space, medians below that
+# resolution count as 1µs
+MIN_LATENCY_US = 1.0
+
+
+def fit_exponent(sizes: list[int], latencies: list[float]) -> tuple[float, float]:
+    """
+    Least-squares fit of latency = a * size^b in log-log space: the growth
+    exponent b and the R² of the fit
+    """
+    x = np.log2(sizes)
+    y = np.log2(np.maximum(latencies, MIN_LATENCY_US))
+    slope, intercept = np.polyfit(x, y, 1)
+    residual = float(np.sum((y - (slope * x + intercept)) ** 2))
+    total = float(np.sum((y - y.mean()) ** 2))
+    return float(slope), 1.0 - residual / total if total else 1.0
+
+
+def _complete(medians: list[float | None] | None) -> list[float] | None:
+    """Medians of a query, if it ran on every dataset"""
+    if not medians or any(m is None for m in medians):
+        return None
+    return [m for m in medians if m is not None]
+
+
+def _format_nodes(nodes: int) -> str:
+    if nodes >= 1_000_000:
+        return f"{nodes / 1_000_000:g}M"
+    if nodes >= 1_000:
+        return f"{nodes / 1_000:g}k"
+    return str(nodes)
+
+
+def _format_growth(exponent: float, r2: float) -> str:
+    return f"{exponent:.2f} (×{2**exponent:.2f}, R² {r2:.2f})"
+
+
+class ScalingReport:
+    """Median latencies of every engine and query over the sweep's datasets"""
+
+    def __init__(
+        self,
+        sweep_dir: Path,
+        datasets: list[str] | None = None,
+        variants: dict[str, str] | None = None,
+    ):
+        sizes: dict[str, int] = json.loads((sweep_dir / "sizes.json").read_text())
+        if datasets:
+            missing = [d for d in datasets if d not in sizes]
+            if missing:
+                raise ValueError(f"No size recorded for {', '.join(missing)}")
+            sizes = {d: sizes[d] for d in datasets}
+        # Datasets by increasing size
+        self.datasets = sorted(sizes, key=sizes.__getitem__)
+        self.sizes = [sizes[d] for d in self.datasets]
+
+        # engine -> query -> median latency (us) per dataset, None if missing
+        self.medians: dict[str, dict[str, list[float | None]]] = {}
+        for i, dataset in enumerate(self.datasets):
+            samples_file = sweep_dir / f"{dataset}_samples.csv.gz"
+            if not samples_file.exists():
+                logger.warning(f"No samples for {dataset}: {samples_file}")
+                continue
+            for engine, queries in load_samples(samples_file, variants).items():
+                name = BenchmarkReportParser.TOOL_NAME_MAP.get(engine, engine)
+                for query, times in queries.items():
+                    medians = self.medians.setdefault(name, {}).setdefault(
+                        query, [None] * len(self.datasets)
+                    )
+                    medians[i] = statistics.median(times)
+
+        self.engines = [
+            e for e in BenchmarkReportParser.TOOL_DISPLAY_ORDER if e in self.medians
+        ]
+        self.queries = list(
+            dict.fromkeys(q for e in self.engines for q in self.medians[e])
+        )
+
+    def growth(self, engine: str, query: str) -> tuple[float, float] | None:
+        """Growth exponent and R² of a query, if it ran on two sizes or more"""
+        medians = self.medians[engine].get(query, [])
+        sizes = [n for n, m in zip(self.sizes, medians) if m is not None]
+        latencies = [m for m in medians if m is not None]
+        if len(latencies) < 2:
+            return None
+        return fit_exponent(sizes, latencies)
+
+    def suite_medians(self, engine: str) -> list[float] | None:
+        """
+        Geometric mean over the queries that ran on every dataset of their
+        median latencies, per dataset
+        """
+        complete = [
+            m for medians in self.medians[engine].values() if (m := _complete(medians))
+        ]
+        if not complete:
+            return None
+        return [
+            math.exp(
+                statistics.fmean(math.log(max(m[i], MIN_LATENCY_US)) for m in complete)
+            )
+            for i in range(len(self.datasets))
+        ]
+
+    def _chart(self, title: str, lines: dict[str, list[float]]) -> list[str]:
+        """Mermaid line chart of latencies (ms) against the graph size"""
+        x_axis = ", ".join(f'"{_format_nodes(n)}"' for n in self.sizes)
+        lines_md = [
+            "```mermaid",
+            "xychart-beta",
+            f'    title "{title}"',
+            f'    x-axis "Nodes" [{x_axis}]',
+            '    y-axis "Median latency (ms)"',
+        ]
+        for values in lines.values():
+            lines_md.append(
+                f"    line [{', '.join(f'{v / 1000:.3f}' for v in values)}]"
+            )
+        lines_md += ["```", "", f"Lines: {', '.join(lines)}", ""]
+        return lines_md
+
+    def render(self) -> str:
+        md = [
+            "# Scaling Report",
+            "",
+            "| Dataset | Nodes |",
+            "|---|---|",
+        ]
+        md += [f"| {d} | {n:,} |" for d, n in zip(self.datasets, self.sizes)]
+        md += [
+            "",
+            "## Latency growth",
+            "",
+            (
+                "Growth exponent *b* of the median latency, fitted as "
+                "latency ∝ nodes^*b*: 0 is constant, 1 linear in the size of the "
+                "graph. (×*f*) is the factor by which the latency grows every "
+                "time the graph doubles."
+            ),
+            "",
+            "| Query | " + " | ".join(self.engines) + " |",
+            "|---|" + "---|" * len(self.engines),
+        ]
+
+        suite_row = []
+        for engine in self.engines:
+            medians = self.suite_medians(engine)
+            suite_row.append(
+                _format_growth(*fit_exponent(self.sizes, medians)) if medians else "-"
+            )
+        md.append("| **Suite (geometric mean)** | " + " | ".join(suite_row) + " |")
+
+        for query in self.queries:
+            cells = []
+            for engine in self.engines:
+                growth = self.growth(engine, query)
+                cells.append(_format_growth(*growth) if growth else "-")
+            md.append(f"| `{query}` | " + " | ".join(cells) + " |")
+
+        md += ["", "## Charts", ""]
+        suite = {e: m for e in self.engines if (m := self.suite_medians(e))}
+        if suite:
+            md += self._chart("Suite geometric mean", suite)
+
+        for i, query in enumerate(self.queries, 1):
+            lines = {
+                e: m
+                for e in self.engines
+                if (m := _complete(self.medians[e].get(query)))
+            }
+            if not lines:
+                continue
+            md += [
+                "<details>",
+                f"<summary>Q{i}: <code>{query}</code></summary>",
+                "",
+            ]
+            md += self._chart(f"Q{i}", lines)
+            md += ["</details>", ""]
+
+        return "\n".join(md)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fit the latency growth of every query over a scaling sweep"
+    )
+    parser.add_argument(
+        "--sweep-dir",
+        type=Path,
+        default=Path("reports/scaling"),
+        help="Directory of sizes.json and of the <dataset>_samples.csv.gz files "
+        "of scripts/scaling_sweep.py (default: reports/scaling)",
+    )
+    parser.add_argument(
+        "--datasets",
+        nargs="+",
+        default=None,
+        help="Datasets to report on (default: all those of sizes.json)",
+    )
+    parser.add_argument(
+        "--variant",
+        action="append",
+        metavar="ENGINE=VARIANT",
+        help="Variant of an engine's raw samples, e.g. memgraph=materialize/per-query "
+        "(default: the first one of each engine)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=None,
+        help="Output file (default: <sweep dir>/scaling_report.md)",
+    )
+    args = parser.parse_args()
+
+    try:
+        report = ScalingReport(
+            args.sweep_dir, args.datasets, parse_variants(args.variant)
+        )
+    except (FileNotFoundError, ValueError) as e:
+        logger.error(e)
+        sys.exit(1)
+    if len(report.datasets) < 2:
+        logger.error("A scaling report needs at least two datasets")
+        sys.exit(1)
+
+    output = args.output or args.sweep_dir / "scaling_report.md"
+    output.write_text(report.render())
+    logger.info(f"Scaling report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
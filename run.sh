@@ -33,6 +33,9 @@ alias uvrun="uv run --directory $GIT_ROOT python -m turingbench"
 REPORT_DIR="$GIT_ROOT/reports"
 mkdir -p "$REPORT_DIR"
 RAW_FILE="$REPORT_DIR/${DATASET}_raw_benchmark.txt"
+SAMPLES_FILE="$REPORT_DIR/${DATASET}_samples.csv.gz"
+STARTUP_FILE="$REPORT_DIR/${DATASET}_startup.jsonl"
+rm -f "$SAMPLES_FILE" "$STARTUP_FILE"
 
 # Run benchmarks and capture output to raw file (while still printing to stdout)
 {
@@ -46,18 +49,18 @@ echo "- Switching to dataset $DATASET"
 $SCRIPTS/switch-neo4j-dataset.sh $DATASET
 
 echo "- Running benchmark for 'turingdb'"
-bench turingdb start -- -turing-dir "$DUMPS/$DATASET.turingdb" -load "$DATASET"
-uvrun turingdb --query-file $QUERY_FILE_PATH --database=$DATASET
+bench --metrics "$STARTUP_FILE" turingdb start -- -turing-dir "$DUMPS/$DATASET.turingdb" -load "$DATASET"
+uvrun turingdb --query-file $QUERY_FILE_PATH --database=$DATASET --samples "$SAMPLES_FILE"
 bench turingdb stop
 
 echo "- Running benchmark for 'neo4j'"
-bench neo4j start
-uvrun neo4j --query-file $QUERY_FILE_PATH
+bench --metrics "$STARTUP_FILE" neo4j start
+uvrun neo4j --query-file $QUERY_FILE_PATH --samples "$SAMPLES_FILE"
 bench neo4j stop
 
 echo "- Running benchmark for 'memgraph'"
-bench memgraph start -- --data-directory=$DUMPS/$DATASET.memgraph
-uvrun memgraph --query-file $QUERY_FILE_PATH --database=memgraph --url=bolt://localhost:7688
+bench --metrics "$STARTUP_FILE" memgraph start -- --data-directory=$DUMPS/$DATASET.memgraph
+uvrun memgraph --query-file $QUERY_FILE_PATH --database=memgraph --url=bolt://localhost:7688 --samples "$SAMPLES_FILE"
 bench memgraph stop
 
 
@@ -66,7 +69,7 @@ bench memgraph stop
 if [ "$UPDATE_README" = true ]; then
     echo "- Updating README summary table"
     uv run --directory "$GIT_ROOT" python "$GIT_ROOT/report_summary/parse_raw_benchmark.py" \
-        "$RAW_FILE" --dataset "$DATASET" --update-readme
+        "$RAW_FILE" --samples "$SAMPLES_FILE" --startup "$STARTUP_FILE" --dataset "$DATASET" --update-readme
 fi
 
 if [ "$GENERATE_REPORT" = true ]; then
@@ -0,0 +1,3 @@
+MATCH (p:Person{name:$name}) RETURN p;
+MATCH (p:Person{name:$name})-->(n) RETURN n;
+MATCH (p:Person{name:$name})-->(n)-->(m) RETURN count(m);
@@ -0,0 +1,4 @@
+MATCH (n{displayName:$displayName}) RETURN id(n);
+MATCH (n{displayName:$displayName})-->(m) RETURN id(m);
+MATCH (n{displayName:$displayName})-->(m)-->(p) RETURN id(p);
+MATCH (n:Pathway{displayName:$displayName})-->(m) RETURN id(m);
@@ -0,0 +1,11 @@
+MATCH (n:Species) RETURN n;
+MATCH (n:Pathway) RETURN n;
+MATCH (n:Pathway) RETURN count(n);
+MATCH (n:DatabaseObject{isChimeric:true}) RETURN n;
+MATCH (n{displayName:"Homo sapiens"}) RETURN n;
+MATCH (m)-->(n{displayName:"Homo sapiens"}) RETURN m;
+MATCH (n:Pathway)-[:hasEvent]->(m:ReactionLikeEvent) RETURN n,m;
+MATCH (r:ReactionLikeEvent)-[:output]->(m:PhysicalEntity) RETURN r,m;
+MATCH (c:Complex)-[:hasComponent]->(p:EntityWithAccessionedSequence)-[:referenceEntity]->(e) RETURN e;
+MATCH (c)-->(b)-->(a:Pathway) RETURN a;
+MATCH (n) RETURN count(n);
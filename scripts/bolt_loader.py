@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Parallel Bolt loader: streams dumps/<dataset>.jsonl into a running Memgraph or
+Neo4j server. It creates the dataset's indexes, then the nodes, then the
+edges, as UNWIND batches written by several concurrent sessions.
+
+Every batch of nodes returns the ids the engine gave them, which are kept in
+an array indexed by the JSONL node id, so that the batches of edges match
+their endpoints by id(), without an import label or property to index and
+remove afterwards.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from array import array
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from pathlib import Path
+from typing import Any, Dict, List, LiteralString, Optional, Set, Tuple, cast
+
+from neo4j import GraphDatabase
+from neo4j.exceptions import DriverError, Neo4jError
+
+from manage_servers import CLEARLINE, REPO_ROOT, SERVERS
+
+DUMPS_DIR = Path(os.environ.get("DUMPS", REPO_ROOT / "dumps"))
+
+ENGINES = ["memgraph", "neo4j"]
+
+# Schema statements of the Cypher dumps, all at their top
+SCHEMA_PATTERN = re.compile(r"^\s*CREATE\s+(INDEX|CONSTRAINT)\b", re.IGNORECASE)
+# Schema of the temporary label used to match nodes in the Cypher dumps
+IMPORT_SCHEMA_MARKER = "UNIQUE IMPORT"
+
+
+def _neo4j_index(match: re.Match[str]) -> str:
+    # Composite indexes list several properties: Label(a, b)
+    properties = ", ".join(f"n.{p.strip()}" for p in match.group(2).split(","))
+    return f"CREATE INDEX IF NOT EXISTS FOR (n:{match.group(1)}) ON ({properties})"
+
+
+def _neo4j_constraint(match: re.Match[str]) -> str:
+    variable, label, properties = match.groups()
+    if "," in properties:
+        properties = f"({properties})"
+    return (
+        f"CREATE CONSTRAINT IF NOT EXISTS FOR ({variable}:{label}) "
+        f"REQUIRE {properties} IS UNIQUE"
+    )
+
+
+# Rewrites of the Memgraph dialect of the Cypher dumps' schema for Neo4j 5
+NEO4J_SCHEMA_REWRITES = [
+    (re.compile(r"CREATE INDEX ON :(.*)\((.*)\)"), _neo4j_index),
+    (
+        re.compile(r"CREATE CONSTRAINT ON \((.*):(.*)\) ASSERT (.*) IS UNIQUE"),
+        _neo4j_constraint,
+    ),
+]
+
+# Batches queued per session, bounding the rows held in memory
+PENDING_BATCHES_PER_SESSION = 2
+
+Row = Dict[str, Any]
+
+
+def _escape(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def schema_statements(cypher_path: Path) -> List[str]:
+    """
+    CREATE INDEX and CREATE CONSTRAINT statements of a Cypher dump, read from
+    its top up to the first statement creating data
+    """
+    statements = []
+    with open(cypher_path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if not SCHEMA_PATTERN.match(line):
+                break
+            if IMPORT_SCHEMA_MARKER not in line:
+                statements.append(line.rstrip(";"))
+    return statements
+
+
+class IdMap:
+    """JSONL node ids -> engine node ids, in an array indexed by JSONL id"""
+
+    MISSING = -1
+
+    def __init__(self):
+        self.ids = array("q")
+
+    def __setitem__(self, key: int, node_id: int) -> None:
+        if key >= len(self.ids):
+            grow = max(key + 1, 2 * len(self.ids)) - len(self.ids)
+            self.ids.extend(array("q", [self.MISSING]) * grow)
+        self.ids[key] = node_id
+
+    def __getitem__(self, key: int) -> int:
+        node_id = self.ids[key] if 0 <= key < len(self.ids) else self.MISSING
+        if node_id == self.MISSING:
+            raise KeyError(key)
+        return node_id
+
+
+class BoltLoader:
+    """Writes the nodes then the edges of a JSONL export in parallel batches"""
+
+    def __init__(
+        self,
+        url: str,
+        auth: Tuple[str, str],
+        sessions: int,
+        batch_size: int,
+        database: Optional[str] = None,
+    ):
+        self.driver = GraphDatabase.driver(
+            url, auth=auth, max_connection_pool_size=sessions
+        )
+        self.database = database
+        self.batch_size = batch_size
+        self.pool = ThreadPoolExecutor(sessions)
+        self.max_pending = PENDING_BATCHES_PER_SESSION * sessions
+        self.pending: Set[Future] = set()
+
+        self.ids = IdMap()
+        self.nodes = 0
+        self.edges = 0
+        self.read_bytes = 0
+        self.total_bytes = 0
+
+    def close(self) -> None:
+        # After a failure, queued batches are dropped and the running ones
+        # finish before the driver is closed
+        for future in self.pending:
+            future.cancel()
+        wait(self.pending)
+        self.pending.clear()
+        self.pool.shutdown()
+        self.driver.close()
+
+    def run(self, query: str) -> None:
+        """Run a statement in an auto-commit transaction"""
+        with self.driver.session(database=self.database) as session:
+            session.run(cast(LiteralString, query)).consume()
+
+    # Batches
+
+    @staticmethod
+    def _create_nodes(tx, query: str, rows: List[Row]) -> List[Tuple[int, int]]:
+        return [(r["i"], r["node"]) for r in tx.run(query, rows=rows)]
+
+    @staticmethod
+    def _create_edges(tx, query: str, rows: List[Row]) -> int:
+        tx.run(query, rows=rows).consume()
+        return len(rows)
+
+    def _write(self, work, query: str, rows: List[Row]) -> Any:
+        # Transient errors (deadlocks, conflicting transactions) are retried
+        with self.driver.session(database=self.database) as session:
+            return session.execute_write(work, query, rows)
+
+    def _submit(self, work, query: str, rows: List[Row]) -> None:
+        while len(self.pending) >= self.max_pending:
+            self._wait(FIRST_COMPLETED)
+        self.pending.add(self.pool.submit(self._write, work, query, rows))
+
+    def _wait(self, return_when: str) -> None:
+        done, self.pending = wait(self.pending, return_when=return_when)
+        for future in done:
+            result = future.result()
+            if isinstance(result, list):
+                for key, node_id in result:
+                    self.ids[key] = node_id
+                self.nodes += len(result)
+            else:
+                self.edges += result
+        self._progress()
+
+    def _progress(self) -> None:
+        print(
+            f"{CLEARLINE}- Progress: {self.nodes} nodes, {self.edges} edges "
+            f"({self.read_bytes * 100 // max(self.total_bytes, 1)}% read)",
+            end="",
+            flush=True,
+        )
+
+    def _flush_nodes(self, labels: Tuple[str, ...], rows: List[Row]) -> None:
+        pattern = "".join(f":{_escape(label)}" for label in labels)
+        self._submit(
+            self._create_nodes,
+            f"UNWIND $rows AS row CREATE (n{pattern}) SET n = row.p "
+            f"RETURN row.i AS i, id(n) AS node",
+            rows,
+        )
+
+    def _flush_edges(self, edge_type: str, rows: List[Row]) -> None:
+        self._submit(
+            self._create_edges,
+            f"UNWIND $rows AS row "
+            f"MATCH (a) WHERE id(a) = row.s MATCH (b) WHERE id(b) = row.e "
+            f"CREATE (a)-[r:{_escape(edge_type)}]->(b) SET r = row.p",
+            rows,
+        )
+
+    def _endpoint(self, item: Dict, end: str) -> int:
+        key = int(item[end]["id"])
+        try:
+            return self.ids[key]
+        except KeyError:
+            raise ValueError(
+                f"Relationship {item.get('id')} has an unknown {end} node {key}"
+            ) from None
+
+    def load(self, jsonl_path: Path) -> None:
+        """
+        Stream the export, which lists all nodes before the relationships:
+        the edges are only sent once every node has its engine id
+        """
+        self.total_bytes = jsonl_path.stat().st_size
+        node_rows: Dict[Tuple[str, ...], List[Row]] = {}
+        edge_rows: Dict[str, List[Row]] = {}
+        in_edges = False
+
+        with open(jsonl_path, "rb") as f:
+            for line in f:
+                self.read_bytes += len(line)
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+
+                if item["type"] == "node":
+                    if in_edges:
+                        raise ValueError(f"Node {item['id']} follows relationships")
+                    labels = tuple(item.get("labels", []))
+                    rows = node_rows.setdefault(labels, [])
+                    rows.append({"i": int(item["id"]), "p": item.get("properties", {})})
+                    if len(rows) >= self.batch_size:
+                        self._flush_nodes(labels, node_rows.pop(labels))
+                    continue
+
+                if not in_edges:
+                    for labels, rows in node_rows.items():
+                        self._flush_nodes(labels, rows)
+                    node_rows.clear()
+                    self._wait(ALL_COMPLETED)
+                    in_edges = True
+
+                rows = edge_rows.setdefault(item["label"], [])
+                rows.append(
+                    {
+                        "s": self._endpoint(item, "start"),
+                        "e": self._endpoint(item, "end"),
+                        "p": item.get("properties", {}),
+                    }
+                )
+                if len(rows) >= self.batch_size:
+                    self._flush_edges(item["label"], edge_rows.pop(item["label"]))
+
+        for labels, rows in node_rows.items():
+            self._flush_nodes(labels, rows)
+        for edge_type, rows in edge_rows.items():
+            self._flush_edges(edge_type, rows)
+        self._wait(ALL_COMPLETED)
+        print()
+
+
+def load_dataset(
+    engine: str,
+    jsonl_path: Path,
+    schema: List[str],
+    url: str,
+    auth: Tuple[str, str],
+    sessions: int,
+    batch_size: int,
+    database: Optional[str] = None,
+    analytical: bool = True,
+) -> Tuple[int, int]:
+    """
+    Create the schema then load the export into a running server, returning
+    the counts of nodes and edges. Memgraph is loaded in its analytical
+    storage mode, where concurrent writes to the same nodes do not conflict,
+    and snapshotted once back in transactional mode.
+    """
+    loader = BoltLoader(url, auth, sessions, batch_size, database)
+    try:
+        for statement in schema:
+            if engine == "neo4j":
+                for pattern, replacement in NEO4J_SCHEMA_REWRITES:
+                    statement = pattern.sub(replacement, statement)
+            loader.run(statement)
+        if engine == "memgraph" and analytical:
+            loader.run("STORAGE MODE IN_MEMORY_ANALYTICAL")
+        try:
+            loader.load(jsonl_path)
+        finally:
+            if engine == "memgraph" and analytical:
+                loader.run("STORAGE MODE IN_MEMORY_TRANSACTIONAL")
+        if engine == "memgraph":
+            loader.run("CREATE SNAPSHOT")
+        return loader.nodes, loader.edges
+    finally:
+        loader.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load a dataset's JSONL export into a running Memgraph or "
+        "Neo4j server over parallel Bolt sessions",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s memgraph reactome                   # dumps/reactome.jsonl into Memgraph
+  %(prog)s memgraph synthetic_sf10 --sessions 16 --batch-size 20000
+  %(prog)s neo4j synthetic_sf10 --index "Pathway(stId)"
+        """,
+    )
+    parser.add_argument("engine", choices=ENGINES)
+    parser.add_argument("dataset", help="Dataset of dumps/<dataset>.jsonl")
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="Bolt URL of the server (default: the one of scripts/manage_servers.py)",
+    )
+    parser.add_argument(
+        "--database", "-g", default=None, help="(default: the server's default)"
+    )
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        default=min(8, os.cpu_count() or 1),
+        help="Concurrent sessions (default: the number of CPUs, up to 8)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=10000, help="Rows per UNWIND (default: 10000)"
+    )
+    parser.add_argument(
+        "--schema",
+        type=Path,
+        default=None,
+        help="Cypher dump whose CREATE INDEX and CREATE CONSTRAINT statements "
+        "are run first (default: dumps/<dataset>.cypher, if it exists)",
+    )
+    parser.add_argument(
+        "--index",
+        action="append",
+        default=[],
+        metavar="LABEL(PROPERTY)",
+        help="Additional index to create first, e.g. 'Pathway(stId)' (repeatable)",
+    )
+    parser.add_argument(
+        "--transactional",
+        action="store_true",
+        help="Keep Memgraph in its transactional storage mode while loading",
+    )
+    parser.add_argument("--username", "-n", default="neo4j")
+    parser.add_argument("--password", "-p", default="neo4j")
+
+    args = parser.parse_args()
+
+    jsonl_path = DUMPS_DIR / f"{args.dataset}.jsonl"
+    if not jsonl_path.exists():
+        print(f"{jsonl_path} does not exist")
+        sys.exit(1)
+    if args.sessions < 1 or args.batch_size < 1:
+        print("--sessions and --batch-size must be at least 1")
+        sys.exit(1)
+
+    schema_path = args.schema or DUMPS_DIR / f"{args.dataset}.cypher"
+    schema = schema_statements(schema_path) if schema_path.exists() else []
+    for index in args.index:
+        schema.append(f"CREATE INDEX ON :{index}")
+
+    start = time.perf_counter()
+    try:
+        nodes, edges = load_dataset(
+            args.engine,
+            jsonl_path,
+            schema,
+            args.url or SERVERS[args.engine].ready_url,
+            (args.username, args.password),
+            args.sessions,
+            args.batch_size,
+            args.database,
+            not args.transactional,
+        )
+    except (ValueError, OSError, Neo4jError, DriverError) as e:
+        print(f"\n✗ Load failed: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"✓ {nodes} nodes and {edges} edges loaded in {elapsed:.3f}s "
+        f"({nodes / elapsed:.0f} nodes/s, {edges / elapsed:.0f} edges/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Synthetic graph generator: writes a reactome-shaped graph of a given scale
+factor as the JSONL of apoc.export.json.all (loaded by 5_load_in_turingdb.sh)
+and the batched Cypher script of 2_gen_cypher.sh (loaded by
+4_load_in_memgraph.sh).
+
+Generation is deterministic for a seed and streams both files: nodes are laid
+out in contiguous blocks per class, so a node's labels follow from its id, and
+edges are drawn source by source, so memory does not grow with the scale.
+"""
+
+import argparse
+import bisect
+import json
+import math
+import os
+import random
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, TextIO, Tuple
+
+# Nodes per unit of scale factor
+NODES_PER_SF = 100_000
+# Rows per UNWIND statement, as exported by apoc.export.cypher.all
+UNWIND_BATCH_SIZE = 1000
+# Nodes whose import label is removed per statement
+REMOVE_BATCH_SIZE = 20_000
+MAX_OUT_DEGREE = 10_000
+
+IMPORT_LABEL = "`UNIQUE IMPORT LABEL`"
+IMPORT_ID = "`UNIQUE IMPORT ID`"
+
+COMPARTMENTS = [
+    "cytosol",
+    "nucleoplasm",
+    "plasma membrane",
+    "extracellular region",
+    "mitochondrial matrix",
+    "endoplasmic reticulum lumen",
+    "Golgi membrane",
+]
+PROCESSES = [
+    "Signaling",
+    "Metabolism",
+    "Transport",
+    "Autophagy",
+    "Apoptosis",
+    "DNA Repair",
+    "Immune System",
+    "Hemostasis",
+]
+SPECIES = [
+    "Homo sapiens",
+    "Mus musculus",
+    "Rattus norvegicus",
+    "Gallus gallus",
+    "Danio rerio",
+    "Drosophila melanogaster",
+]
+
+
+@dataclass
+class NodeClass:
+    """Nodes sharing a label set and a share of the graph"""
+
+    name: str
+    labels: List[str]
+    weight: float
+
+
+# Classes of nodes, by class hierarchy as in reactome
+NODE_CLASSES = [
+    NodeClass("Pathway", ["DatabaseObject", "Event", "Pathway"], 0.05),
+    NodeClass(
+        "Reaction", ["DatabaseObject", "Event", "ReactionLikeEvent", "Reaction"], 0.15
+    ),
+    NodeClass("Complex", ["DatabaseObject", "PhysicalEntity", "Complex"], 0.15),
+    NodeClass(
+        "Protein",
+        ["DatabaseObject", "PhysicalEntity", "EntityWithAccessionedSequence"],
+        0.30,
+    ),
+    NodeClass(
+        "SmallMolecule", ["DatabaseObject", "PhysicalEntity", "SimpleEntity"], 0.10
+    ),
+    NodeClass(
+        "ReferenceEntity",
+        ["DatabaseObject", "ReferenceEntity", "ReferenceGeneProduct"],
+        0.2498,
+    ),
+    NodeClass("Species", ["DatabaseObject", "Taxon", "Species"], 0.0002),
+]
+
+# Outgoing edges of each class: (edge type, target class, weight)
+EDGE_RULES: Dict[str, List[Tuple[str, str, float]]] = {
+    "Pathway": [
+        ("hasEvent", "Pathway", 0.3),
+        ("hasEvent", "Reaction", 0.6),
+        ("species", "Species", 0.1),
+    ],
+    "Reaction": [
+        ("input", "Protein", 0.3),
+        ("input", "SmallMolecule", 0.15),
+        ("output", "Complex", 0.25),
+        ("output", "SmallMolecule", 0.1),
+        ("precedingEvent", "Reaction", 0.1),
+        ("species", "Species", 0.1),
+    ],
+    "Complex": [
+        ("hasComponent", "Protein", 0.6),
+        ("hasComponent", "SmallMolecule", 0.15),
+        ("hasComponent", "Complex", 0.15),
+        ("species", "Species", 0.1),
+    ],
+    "Protein": [
+        ("referenceEntity", "ReferenceEntity", 0.9),
+        ("species", "Species", 0.1),
+    ],
+}
+
+
+class GraphLayout:
+    """Id ranges of the node classes of a graph of `nodes` nodes"""
+
+    def __init__(self, nodes: int, seed: int):
+        self.starts: List[int] = []
+        self.sizes: List[int] = []
+        start = 0
+        for node_class in NODE_CLASSES:
+            size = max(1, round(node_class.weight * nodes))
+            self.starts.append(start)
+            self.sizes.append(size)
+            start += size
+        self.nodes = start
+        self.index = {c.name: i for i, c in enumerate(NODE_CLASSES)}
+        # Offsets of the permutations spreading the hot ranks over each block
+        rng = random.Random(seed)
+        self.offsets = [rng.randrange(size) for size in self.sizes]
+
+    def class_of(self, node_id: int) -> NodeClass:
+        return NODE_CLASSES[bisect.bisect_right(self.starts, node_id) - 1]
+
+    def node_in(self, class_name: str, rank: int) -> int:
+        """Node of a class at a popularity rank, by an affine permutation"""
+        i = self.index[class_name]
+        size = self.sizes[i]
+        # 2654435761 is prime, hence coprime with any smaller block size
+        return self.starts[i] + (rank * 2654435761 + self.offsets[i]) % size
+
+
+def dataset_name(scale_factor: float) -> str:
+    """
+    Default dataset name of a scale factor, which must be a valid graph name:
+    synthetic_sf0.5 becomes synthetic_sf0_5
+    """
+    return "synthetic_sf" + re.sub(r"\W", "_", f"{scale_factor:g}")
+
+
+def zipf_rank(rng: random.Random, size: int, exponent: float) -> int:
+    """Rank in [0, size) with probability decreasing as rank^-exponent"""
+    u = rng.random()
+    if abs(exponent - 1.0) < 1e-9:
+        x = math.exp(u * math.log(size + 1))
+    else:
+        top = (size + 1) ** (1 - exponent)
+        x = (1 + u * (top - 1)) ** (1 / (1 - exponent))
+    return min(int(x) - 1, size - 1)
+
+
+def out_degree(rng: random.Random, exponent: float) -> int:
+    """Pareto-distributed degree, at least 1"""
+    return min(int((1 - rng.random()) ** (-1 / (exponent - 1))), MAX_OUT_DEGREE)
+
+
+def gene(rng: random.Random) -> str:
+    letters = "".join(
+        rng.choice("ABCDEFGHIKLMNPRSTVWY") for _ in range(rng.randint(2, 4))
+    )
+    return f"{letters}{rng.randint(1, 20)}"
+
+
+def node_properties(
+    rng: random.Random, node_class: NodeClass, node_id: int
+) -> Dict[str, object]:
+    """Properties shaped like reactome's for a node of a class"""
+    compartment = rng.choice(COMPARTMENTS)
+    if node_class.name == "Pathway":
+        name = f"{rng.choice(PROCESSES)} of {gene(rng)}"
+    elif node_class.name == "Reaction":
+        name = f"{gene(rng)} binds {gene(rng)}"
+    elif node_class.name == "Complex":
+        name = f"{gene(rng)}:{gene(rng)} complex [{compartment}]"
+    elif node_class.name == "Species":
+        name = SPECIES[node_id % len(SPECIES)]
+    elif node_class.name == "ReferenceEntity":
+        name = f"UniProt:P{node_id:06d} {gene(rng)}"
+    else:
+        name = f"{gene(rng)} [{compartment}]"
+
+    properties: Dict[str, object] = {
+        "displayName": name,
+        "stId": f"R-SYN-{node_id}",
+    }
+    if "Event" in node_class.labels:
+        properties["isInDisease"] = rng.random() < 0.1
+    if node_class.name in ("Reaction", "Complex"):
+        properties["isChimeric"] = rng.random() < 0.05
+    return properties
+
+
+def cypher_map(properties: Dict[str, object]) -> str:
+    """Cypher map literal of string and boolean properties"""
+    entries = []
+    for key, value in properties.items():
+        if isinstance(value, bool):
+            literal = "true" if value else "false"
+        else:
+            # JSON string escapes are valid in Cypher strings
+            literal = json.dumps(value)
+        entries.append(f"{key}:{literal}")
+    return "{" + ", ".join(entries) + "}"
+
+
+class CypherWriter:
+    """Batches rows into the UNWIND statements of apoc.export.cypher.all"""
+
+    def __init__(self, out: TextIO):
+        self.out = out
+        self.batches: Dict[Tuple[str, str], List[str]] = {}
+
+    def add(self, kind: str, key: str, row: str) -> None:
+        batch = self.batches.setdefault((kind, key), [])
+        batch.append(row)
+        if len(batch) >= UNWIND_BATCH_SIZE:
+            self._flush(kind, key)
+
+    def flush(self) -> None:
+        for kind, key in list(self.batches):
+            self._flush(kind, key)
+
+    def _flush(self, kind: str, key: str) -> None:
+        rows = self.batches.pop((kind, key))
+        if not rows:
+            return
+        self.out.write(f"UNWIND [{', '.join(rows)}] AS row\n")
+        if kind == "node":
+            self.out.write(
+                f"CREATE (n:{IMPORT_LABEL}{{{IMPORT_ID}: row._id}}) "
+                f"SET n += row.properties SET n:{key};\n"
+            )
+        else:
+            self.out.write(
+                f"MATCH (start:{IMPORT_LABEL}{{{IMPORT_ID}: row.start._id}})\n"
+                f"MATCH (end:{IMPORT_LABEL}{{{IMPORT_ID}: row.end._id}})\n"
+                f"CREATE (start)-[r:{key}]->(end) SET r += row.properties;\n"
+            )
+
+
+def generate(
+    layout: GraphLayout,
+    seed: int,
+    out_exponent: float,
+    in_exponent: float,
+    jsonl: TextIO,
+    cypher: TextIO,
+) -> Tuple[int, int]:
+    """Write the nodes then the edges of the graph, returning their counts"""
+    cypher.write(f"CREATE INDEX ON :{IMPORT_LABEL}({IMPORT_ID});\n")
+    cypher.write("CREATE INDEX ON :DatabaseObject(stId);\n")
+    batches = CypherWriter(cypher)
+
+    rng = random.Random(seed)
+    for node_id in range(layout.nodes):
+        node_class = layout.class_of(node_id)
+        properties = node_properties(rng, node_class, node_id)
+        jsonl.write(
+            json.dumps(
+                {
+                    "type": "node",
+                    "id": str(node_id),
+                    "labels": node_class.labels,
+                    "properties": properties,
+                }
+            )
+            + "\n"
+        )
+        batches.add(
+            "node",
+            ":".join(node_class.labels),
+            f"{{_id:{node_id}, properties:{cypher_map(properties)}}}",
+        )
+    batches.flush()
+
+    rng = random.Random(seed + 1)
+    edge_id = 0
+    for source in range(layout.nodes):
+        source_class = layout.class_of(source)
+        rules = EDGE_RULES.get(source_class.name)
+        if not rules:
+            continue
+        weights = [weight for _, _, weight in rules]
+        for _ in range(out_degree(rng, out_exponent)):
+            edge_type, target_class, _ = rng.choices(rules, weights)[0]
+            i = layout.index[target_class]
+            target = layout.node_in(
+                target_class, zipf_rank(rng, layout.sizes[i], in_exponent)
+            )
+            jsonl.write(
+                json.dumps(
+                    {
+                        "id": str(edge_id),
+                        "type": "relationship",
+                        "label": edge_type,
+                        "start": {"id": str(source), "labels": source_class.labels},
+                        "end": {
+                            "id": str(target),
+                            "labels": NODE_CLASSES[i].labels,
+                        },
+                    }
+                )
+                + "\n"
+            )
+            batches.add(
+                "edge",
+                edge_type,
+                f"{{start: {{_id:{source}}}, end: {{_id:{target}}}, properties:{{}}}}",
+            )
+            edge_id += 1
+    batches.flush()
+
+    for _ in range(-(-layout.nodes // REMOVE_BATCH_SIZE)):
+        cypher.write(
+            f"MATCH (n:{IMPORT_LABEL}) WITH n LIMIT {REMOVE_BATCH_SIZE} "
+            f"REMOVE n:{IMPORT_LABEL} REMOVE n.{IMPORT_ID};\n"
+        )
+    cypher.write(f"DROP INDEX ON :{IMPORT_LABEL}({IMPORT_ID});\n")
+
+    return layout.nodes, edge_id
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a reactome-shaped synthetic graph as JSONL (TuringDB) "
+        "and Cypher (Memgraph) dumps",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Scale factor 1 is {NODES_PER_SF} nodes. Examples:
+  %(prog)s --scale-factor 1                # dumps/synthetic_sf1.{{jsonl,cypher}}
+  %(prog)s --scale-factor 100 --seed 7     # dumps/synthetic_sf100.{{jsonl,cypher}}
+        """,
+    )
+    parser.add_argument(
+        "--scale-factor", "-s", type=float, default=1.0, help="(default: 1)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="(default: 0)")
+    parser.add_argument(
+        "--name",
+        default=None,
+        help="Dataset name of the dumps (default: synthetic_sf<scale factor>)",
+    )
+    parser.add_argument(
+        "--dumps-dir",
+        type=Path,
+        default=Path(os.environ.get("DUMPS", Path(__file__).parent.parent / "dumps")),
+        help="Directory of the dumps (default: $DUMPS or dumps/)",
+    )
+    parser.add_argument(
+        "--out-exponent",
+        type=float,
+        default=2.2,
+        help="Power-law exponent of the out-degree distribution, above 1 "
+        "(default: 2.2, a mean degree of about 5)",
+    )
+    parser.add_argument(
+        "--in-exponent",
+        type=float,
+        default=0.9,
+        help="Zipf exponent of the popularity of edge targets: the k-th most "
+        "linked node of a class gets a share of edges proportional to "
+        "k^-exponent (default: 0.9)",
+    )
+    args = parser.parse_args()
+
+    if args.out_exponent <= 1:
+        print("--out-exponent must be above 1")
+        sys.exit(1)
+
+    name = args.name or dataset_name(args.scale_factor)
+    layout = GraphLayout(round(args.scale_factor * NODES_PER_SF), args.seed)
+    args.dumps_dir.mkdir(parents=True, exist_ok=True)
+    jsonl_path = args.dumps_dir / f"{name}.jsonl"
+    cypher_path = args.dumps_dir / f"{name}.cypher"
+
+    print(f"Generating {name} ({layout.nodes} nodes, seed {args.seed})...")
+    with open(jsonl_path, "w") as jsonl, open(cypher_path, "w") as cypher:
+        nodes, edges = generate(
+            layout, args.seed, args.out_exponent, args.in_exponent, jsonl, cypher
+        )
+    print(
+        f"✓ {nodes} nodes and {edges} edges written to {jsonl_path} and {cypher_path}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -29,5 +29,5 @@ fi
 
 echo "Importing '$dataset'..."
 
-$REPO_ROOT/scripts/neo4j-43-imports/run_all.sh $dataset
+uv run --directory "$REPO_ROOT" "$SCRIPTS/import_pipeline.py" $dataset
 
@@ -0,0 +1,812 @@
+#!/usr/bin/env python3
+"""
+Dataset import pipeline: runs the stages of scripts/neo4j-43-imports/ from
+Python, measuring the wall time, nodes/sec, edges/sec and peak memory of each.
+Stages whose inputs and outputs are unchanged since their last run, according
+to the content hashes of dumps/.import-manifest.json, are skipped.
+
+Like the shell scripts, this must be run after `source env.sh`.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, LiteralString, Optional, Self, cast
+
+from neo4j import GraphDatabase
+from tabulate import tabulate
+
+from bolt_loader import load_dataset, schema_statements
+from manage_servers import (
+    INSTALL_FOLDER,
+    MGCONSOLE_BINARY,
+    REPO_ROOT,
+    SERVERS,
+    ServerManager,
+)
+
+DUMP_URLS = {
+    "poledb": "https://github.com/neo4j-graph-examples/pole/raw/refs/heads/main/data/pole-43.dump",
+    "reactome": "https://reactome.org/download/current/reactome.graphdb.dump",
+}
+
+DUMPS_DIR = Path(os.environ.get("DUMPS", REPO_ROOT / "dumps"))
+MANIFEST_PATH = DUMPS_DIR / ".import-manifest.json"
+NEO4J_HOME = Path(os.environ.get("NEO4J_HOME", INSTALL_FOLDER / "neo4j-build"))
+NEO4J_IMPORT = Path(os.environ.get("NEO4J_IMPORT", NEO4J_HOME / "import"))
+NEO4J_DATA_DIR = Path(os.environ.get("NEO4J_DATA_DIR", NEO4J_HOME / "data"))
+
+STAGES = [
+    "download",
+    "migrate",
+    "export-cypher",
+    "export-jsonl",
+    "load-memgraph",
+    "load-turingdb",
+]
+
+# Stages which only need the dataset's JSONL and Cypher dumps, as written by
+# scripts/generate_synthetic_graph.py for datasets without a Neo4j dump
+LOAD_STAGES = ["load-memgraph", "load-turingdb"]
+
+# How load-memgraph loads the dataset: the Cypher dump replayed by mgconsole,
+# or the JSONL export written by scripts/bolt_loader.py
+MEMGRAPH_LOADERS = ["mgconsole", "bolt"]
+
+# Concurrency of --memgraph-loader bolt
+BOLT_LOADER_SESSIONS = min(8, os.cpu_count() or 1)
+BOLT_LOADER_BATCH_SIZE = 10000
+
+HASH_CHUNK_SIZE = 1 << 20
+MEMORY_POLL_INTERVAL = 0.1
+
+# Kind of a JSONL line, the first "type" key of the line in both the APOC
+# export and scripts/generate_synthetic_graph.py
+JSONL_TYPE = re.compile(rb'"type"\s*:\s*"(node|relationship)"')
+
+# Processes of each engine's server, which are not children of the pipeline
+SERVER_MARKERS = {
+    "neo4j": "org.neo4j",
+    "memgraph": "memgraph",
+    "turingdb": "turingdb",
+}
+
+# Rewrites of the apoc.export.cypher.all script into Memgraph's dialect
+CYPHER_REWRITES = [
+    (
+        re.compile(r"CREATE.*INDEX.*FOR \(.*:(.*)\) ON \(.*\.(.*)\)"),
+        r"CREATE INDEX ON :\1(\2)",
+    ),
+    (
+        re.compile(
+            r"CREATE CONSTRAINT.*FOR \(.*:(.*)\).*REQUIRE.*\(.*\.(.*)\) IS UNIQUE;"
+        ),
+        (
+            "CREATE CONSTRAINT ON (node:\\1) ASSERT node.\\2 IS UNIQUE;\n"
+            "CREATE INDEX ON :\\1(\\2);"
+        ),
+    ),
+    (re.compile(r"DROP CONSTRAINT.*"), ""),
+]
+
+
+def count_jsonl(path: Path) -> Dict[str, int]:
+    """Number of nodes and relationships of a JSONL export"""
+    counts = {b"node": 0, b"relationship": 0}
+    with open(path, "rb") as f:
+        for line in f:
+            match = JSONL_TYPE.search(line)
+            if match:
+                counts[match.group(1)] += 1
+    return {"nodes": counts[b"node"], "edges": counts[b"relationship"]}
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TiB"
+
+
+class MemorySampler:
+    """
+    Polls the peak resident memory of the pipeline's child processes and of
+    an engine's server, which is daemonized out of the pipeline's tree
+    """
+
+    def __init__(self, server: Optional[str] = None):
+        self.marker = SERVER_MARKERS.get(server) if server else None
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+
+    def _pids(self) -> List[int]:
+        parents: Dict[int, int] = {}
+        servers = []
+        for entry in Path("/proc").iterdir():
+            if not entry.name.isdigit():
+                continue
+            try:
+                stat = (entry / "stat").read_text()
+                parents[int(entry.name)] = int(stat[stat.rindex(")") + 2 :].split()[1])
+                if self.marker and self.marker in (entry / "cmdline").read_text():
+                    servers.append(int(entry.name))
+            except (OSError, ValueError):
+                continue
+
+        descendants = {os.getpid()}
+        added = True
+        while added:
+            children = {p for p, ppid in parents.items() if ppid in descendants}
+            added = not children <= descendants
+            descendants |= children
+
+        # The pipeline's own command line (e.g. --stages load-memgraph) and
+        # its launcher's may contain the marker too
+        ancestors = set()
+        pid = os.getpid()
+        while pid in parents and pid not in ancestors:
+            ancestors.add(pid)
+            pid = parents[pid]
+
+        return list((descendants | set(servers)) - ancestors)
+
+    def _rss(self) -> int:
+        total = 0
+        for pid in self._pids():
+            try:
+                statm = Path(f"/proc/{pid}/statm").read_text()
+                total += int(statm.split()[1]) * self._page_size
+            except (OSError, ValueError, IndexError):
+                continue
+        return total
+
+    def _poll(self) -> None:
+        while not self._stop.wait(MEMORY_POLL_INTERVAL):
+            self.peak_bytes = max(self.peak_bytes, self._rss())
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class Manifest:
+    """
+    Content hashes of the pipeline's files, and the inputs of each stage's
+    last run. Files are hashed with BLAKE2b; a file whose size and
+    modification time are unchanged keeps its recorded hash. Engine data
+    directories are rewritten by the servers that open them, so they are
+    identified by the hash of the inputs of the stage that produced them.
+    """
+
+    def __init__(self, path: Path, rehash: bool = False):
+        self.path = path
+        self.data: Dict[str, Dict] = {"files": {}, "datasets": {}}
+        if path.exists():
+            self.data = json.loads(path.read_text())
+        self.rehash = rehash
+        # Files hashed by this process, whose hash --rehash does not redo
+        self.hashed: set = set()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.data, indent=2, sort_keys=True))
+
+    def dataset(self, name: str) -> Dict:
+        return self.data["datasets"].setdefault(name, {"stages": {}, "dirs": {}})
+
+    def file_digest(self, path: Path) -> str:
+        stat = path.stat()
+        cached = self.data["files"].get(str(path))
+        if (
+            (not self.rehash or str(path) in self.hashed)
+            and cached
+            and cached["size"] == stat.st_size
+            and cached["mtime_ns"] == stat.st_mtime_ns
+        ):
+            return cached["digest"]
+
+        digest = hashlib.blake2b()
+        with open(path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        self.hashed.add(str(path))
+        self.data["files"][str(path)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "digest": digest.hexdigest(),
+        }
+        return digest.hexdigest()
+
+    def digest(self, dataset: str, path: Path) -> Optional[str]:
+        """Hash of a file, or the recorded hash of a data directory"""
+        if path.is_dir():
+            return self.dataset(dataset)["dirs"].get(str(path))
+        return self.file_digest(path) if path.exists() else None
+
+
+@dataclass
+class Stage:
+    """A step of the pipeline and the files it reads and writes"""
+
+    name: str
+    inputs: List[Path]
+    outputs: List[Path]
+    run: Callable[[], None]
+    # Untimed server start and stop around the stage
+    setup: Optional[Callable[[], None]] = None
+    teardown: Optional[Callable[[], None]] = None
+    # Engine whose server memory is counted in the stage's peak memory
+    server: Optional[str] = None
+    # Extra inputs which are not files, e.g. the download URL
+    params: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class StageMetrics:
+    """Measurements of the runs of a stage"""
+
+    stage: str
+    skipped: bool = False
+    wall_times_s: List[float] = field(default_factory=list)
+    peak_memory_bytes: int = 0
+
+
+class ImportPipeline:
+    """Imports a dataset into the dumps of all three engines"""
+
+    def __init__(
+        self,
+        dataset: str,
+        manifest: Manifest,
+        username: str,
+        password: str,
+        memgraph_loader: str = "mgconsole",
+    ):
+        self.dataset = dataset
+        self.manifest = manifest
+        self.auth = (username, password)
+        self.memgraph_loader = memgraph_loader
+        self.manager = ServerManager()
+
+        self.dump_path = NEO4J_IMPORT / f"{dataset}.dump"
+        self.neo4j_path = DUMPS_DIR / f"{dataset}.neo4j"
+        self.cypher_path = DUMPS_DIR / f"{dataset}.cypher"
+        self.jsonl_path = DUMPS_DIR / f"{dataset}.jsonl"
+        self.memgraph_path = DUMPS_DIR / f"{dataset}.memgraph"
+        self.turingdb_path = DUMPS_DIR / f"{dataset}.turingdb"
+
+    def stages(self) -> List[Stage]:
+        return [
+            Stage(
+                "download",
+                [],
+                [self.dump_path],
+                self.download,
+                params={"url": DUMP_URLS.get(self.dataset, "")},
+            ),
+            Stage(
+                "migrate",
+                [self.dump_path],
+                [self.neo4j_path],
+                self.migrate,
+                setup=self.stop_neo4j,
+            ),
+            Stage(
+                "export-cypher",
+                [self.neo4j_path],
+                [self.cypher_path],
+                self.export_cypher,
+                setup=self.start_neo4j,
+                teardown=self.stop_neo4j,
+                server="neo4j",
+            ),
+            Stage(
+                "export-jsonl",
+                [self.neo4j_path],
+                [self.jsonl_path],
+                self.export_jsonl,
+                setup=self.start_neo4j,
+                teardown=self.stop_neo4j,
+                server="neo4j",
+            ),
+            Stage(
+                "load-memgraph",
+                # The bolt loader only reads the schema of the Cypher dump
+                [self.cypher_path]
+                + ([self.jsonl_path] if self.memgraph_loader == "bolt" else []),
+                [self.memgraph_path],
+                self.load_memgraph,
+                setup=self.start_memgraph,
+                teardown=self.stop_memgraph,
+                server="memgraph",
+                params=({"loader": "bolt"} if self.memgraph_loader == "bolt" else {}),
+            ),
+            Stage(
+                "load-turingdb",
+                [self.jsonl_path],
+                [self.turingdb_path],
+                self.load_turingdb,
+                setup=self.stop_servers,
+                server="turingdb",
+            ),
+        ]
+
+    # Dataset size, counted in Neo4j by the export stages, or else in the JSONL
+    # export, cached by its hash
+    @property
+    def counts(self) -> Dict[str, int]:
+        dataset = self.manifest.dataset(self.dataset)
+        if "counts" in dataset:
+            return dataset["counts"]
+        digest = self.manifest.digest(self.dataset, self.jsonl_path)
+        if digest is None:
+            return {}
+        cached: Dict = dataset.get("jsonl_counts", {})
+        if cached.get("digest") != digest:
+            cached = {"digest": digest, **count_jsonl(self.jsonl_path)}
+            dataset["jsonl_counts"] = cached
+            self.manifest.save()
+        return {"nodes": cached["nodes"], "edges": cached["edges"]}
+
+    def _input_digests(self, stage: Stage) -> Dict[str, Optional[str]]:
+        digests: Dict[str, Optional[str]] = dict(stage.params)
+        for path in stage.inputs:
+            digests[str(path)] = self.manifest.digest(self.dataset, path)
+        return digests
+
+    def is_up_to_date(self, stage: Stage) -> bool:
+        record = self.manifest.dataset(self.dataset)["stages"].get(stage.name)
+        if record is None or record["inputs"] != self._input_digests(stage):
+            return False
+        return all(
+            path.exists()
+            and self.manifest.digest(self.dataset, path) == record["outputs"][str(path)]
+            for path in stage.outputs
+        )
+
+    def record(self, stage: Stage, metrics: Optional[StageMetrics] = None) -> None:
+        """Record the inputs and outputs of a stage's successful run"""
+        inputs = self._input_digests(stage)
+        key = hashlib.blake2b(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+        dataset = self.manifest.dataset(self.dataset)
+        for path in stage.outputs:
+            if path.is_dir():
+                dataset["dirs"][str(path)] = key
+        record: Dict = {
+            "inputs": inputs,
+            "outputs": {
+                str(path): self.manifest.digest(self.dataset, path)
+                for path in stage.outputs
+            },
+        }
+        if metrics is not None:
+            record["wall_times_s"] = metrics.wall_times_s
+            record["peak_memory_bytes"] = metrics.peak_memory_bytes
+        dataset["stages"][stage.name] = record
+        self.manifest.save()
+
+    def unrecorded_outputs(self, stage: Stage) -> List[Path]:
+        """Existing outputs of a stage which no run of the pipeline recorded"""
+        record = self.manifest.dataset(self.dataset)["stages"].get(stage.name)
+        recorded = record["outputs"] if record else {}
+        return [p for p in stage.outputs if p.exists() and str(p) not in recorded]
+
+    def run_stage(self, stage: Stage, runs: int, force: bool) -> StageMetrics:
+        metrics = StageMetrics(stage.name)
+        if not force and self.is_up_to_date(stage):
+            print(f"- {stage.name}: up to date, skipping")
+            metrics.skipped = True
+            return metrics
+
+        # Outputs made by the shell scripts, or before the manifest existed,
+        # are kept like run_all.sh does, and never deleted to run a stage again
+        unrecorded = self.unrecorded_outputs(stage)
+        if unrecorded and not force and len(unrecorded) == len(stage.outputs):
+            self.record(stage)
+            print(f"- {stage.name}: adopted existing outputs, skipping")
+            metrics.skipped = True
+            return metrics
+        if unrecorded:
+            raise RuntimeError(
+                f"{', '.join(map(str, unrecorded))} not recorded by the pipeline: "
+                f"record it with --adopt or remove it to run {stage.name}"
+            )
+
+        for run in range(runs):
+            for path in stage.outputs:
+                _remove(path)
+            if stage.setup:
+                stage.setup()
+
+            print(f"- {stage.name}" + (f" (run {run + 1}/{runs})" if runs > 1 else ""))
+            try:
+                with MemorySampler(stage.server) as sampler:
+                    start = time.perf_counter()
+                    stage.run()
+                    wall_s = time.perf_counter() - start
+            finally:
+                if stage.teardown:
+                    stage.teardown()
+
+            metrics.wall_times_s.append(wall_s)
+            metrics.peak_memory_bytes = max(
+                metrics.peak_memory_bytes, sampler.peak_bytes
+            )
+            print(f"- {stage.name} took {wall_s:.3f}s")
+
+        self.record(stage, metrics)
+        return metrics
+
+    def run(self, selected: List[str], runs: int = 1, force: bool = False) -> None:
+        results = [
+            self.run_stage(stage, runs, force)
+            for stage in self.stages()
+            if stage.name in selected
+        ]
+        self.present(results)
+
+    def adopt(self, selected: List[str]) -> None:
+        """Record the existing outputs of stages as up to date"""
+        for stage in self.stages():
+            if stage.name not in selected:
+                continue
+            if all(path.exists() for path in stage.outputs):
+                self.record(stage)
+                print(f"- {stage.name}: recorded existing outputs")
+            else:
+                print(f"- {stage.name}: outputs missing, not recorded")
+
+    def present(self, results: List[StageMetrics]) -> None:
+        nodes = self.counts.get("nodes")
+        edges = self.counts.get("edges")
+        table = []
+        for metrics in results:
+            times = metrics.wall_times_s
+            if metrics.skipped:
+                table.append([metrics.stage, "skipped"] + ["-"] * 7)
+                continue
+
+            mean_s = statistics.fmean(times)
+            # Download throughput is network bound, not a function of the graph
+            per_graph = metrics.stage != "download"
+            table.append(
+                [
+                    metrics.stage,
+                    "ran",
+                    len(times),
+                    f"{mean_s:.3f}s",
+                    f"{min(times):.3f}s",
+                    f"{statistics.stdev(times):.3f}s" if len(times) > 1 else "-",
+                    f"{nodes / mean_s:.1f}" if nodes and per_graph else "-",
+                    f"{edges / mean_s:.1f}" if edges and per_graph else "-",
+                    _format_bytes(metrics.peak_memory_bytes),
+                ]
+            )
+
+        print(f"\nImport pipeline: {self.dataset}")
+        if nodes is not None:
+            print(f"Dataset: {nodes} nodes, {edges} edges")
+        headers = [
+            "Stage",
+            "Status",
+            "Runs",
+            "Wall time",
+            "Min",
+            "Stdev",
+            "Nodes/sec",
+            "Edges/sec",
+            "Peak memory",
+        ]
+        print(tabulate(table, headers=headers, tablefmt="grid"))
+
+    # Servers
+
+    def stop_neo4j(self) -> None:
+        self.manager.stop(SERVERS["neo4j"], "")
+        print()
+
+    def start_neo4j(self) -> None:
+        """Serve the dataset's Neo4j dump, as switch-neo4j-dataset.sh does"""
+        self.stop_neo4j()
+        _remove(NEO4J_DATA_DIR)
+        NEO4J_DATA_DIR.symlink_to(self.neo4j_path)
+        if not self.manager.start(SERVERS["neo4j"], ""):
+            raise RuntimeError("Could not start Neo4j")
+        print()
+
+    def start_memgraph(self) -> None:
+        self.manager.stop(SERVERS["memgraph"], "")
+        if not self.manager.start(
+            SERVERS["memgraph"], f"--data-directory={self.memgraph_path}"
+        ):
+            raise RuntimeError("Could not start Memgraph")
+        print()
+
+    def stop_memgraph(self) -> None:
+        self.manager.stop(SERVERS["memgraph"], "")
+        print()
+
+    def stop_servers(self) -> None:
+        """Stop all engines, as run_all.sh did before loading TuringDB"""
+        for config in SERVERS.values():
+            self.manager.stop(config, "")
+        print()
+
+    def _neo4j_query(self, url: str, query: str) -> List[Dict]:
+        """Run a query in an auto-commit transaction over Bolt"""
+        with (
+            GraphDatabase.driver(url, auth=self.auth) as driver,
+            driver.session() as session,
+        ):
+            result = session.run(cast(LiteralString, query))
+            return [record.data() for record in result]
+
+    def _count_graph(self, url: str) -> Dict[str, int]:
+        nodes = self._neo4j_query(url, "MATCH (n) RETURN count(n) AS c")
+        edges = self._neo4j_query(url, "MATCH ()-[r]->() RETURN count(r) AS c")
+        return {"nodes": nodes[0]["c"], "edges": edges[0]["c"]}
+
+    # Stages
+
+    def download(self) -> None:
+        NEO4J_IMPORT.mkdir(parents=True, exist_ok=True)
+        subprocess.run(
+            ["wget", "-O", str(self.dump_path), DUMP_URLS[self.dataset]], check=True
+        )
+
+    def migrate(self) -> None:
+        """Load the Neo4j 4.3 dump and migrate it to Neo4j 5"""
+        _remove(NEO4J_DATA_DIR)
+        with open(self.dump_path, "rb") as dump:
+            subprocess.run(
+                [
+                    "neo4j-admin",
+                    "database",
+                    "load",
+                    "--from-stdin",
+                    "neo4j",
+                    "--overwrite-destination=true",
+                ],
+                stdin=dump,
+                check=True,
+            )
+        subprocess.run(
+            [
+                "neo4j-admin",
+                "database",
+                "migrate",
+                "neo4j",
+                "--verbose",
+                "--force-btree-indexes-to-range",
+            ],
+            check=True,
+        )
+        DUMPS_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copytree(NEO4J_DATA_DIR, self.neo4j_path, symlinks=True)
+
+    def export_cypher(self) -> None:
+        """Export the schema and the graph as a Cypher script for Memgraph"""
+        url = SERVERS["neo4j"].ready_url
+        self.manifest.dataset(self.dataset)["counts"] = self._count_graph(url)
+
+        constraints = self._neo4j_query(
+            url,
+            "SHOW CONSTRAINTS "
+            "YIELD type, entityType, labelsOrTypes AS l, properties AS p "
+            "WHERE type = 'UNIQUENESS' AND entityType = 'NODE' AND size(p) = 1 "
+            "RETURN l[0] AS label, p[0] AS property",
+        )
+        indexes = self._neo4j_query(
+            url,
+            "SHOW INDEXES "
+            "YIELD type, entityType, labelsOrTypes AS l, properties AS p "
+            "WHERE entityType = 'NODE' AND size(p) = 1 "
+            "RETURN l[0] AS label, p[0] AS property",
+        )
+        self._neo4j_query(
+            url,
+            'CALL apoc.export.cypher.all("script.cypher", {'
+            '  format: "plain",'
+            '  cypherFormat: "create",'
+            '  useOptimizations: { type: "UNWIND_BATCH", unwindBatchSize: 1000 }'
+            "})",
+        )
+
+        script_path = NEO4J_IMPORT / "script.cypher"
+        with open(self.cypher_path, "w") as out:
+            for c in constraints:
+                if c["label"] and c["property"]:
+                    out.write(
+                        f"CREATE CONSTRAINT ON (node:{c['label']}) "
+                        f"ASSERT node.{c['property']} IS UNIQUE;\n"
+                    )
+            for i in indexes:
+                if i["label"] and i["property"]:
+                    out.write(f"CREATE INDEX ON :{i['label']}({i['property']});\n")
+            with open(script_path) as script:
+                for line in script:
+                    for pattern, replacement in CYPHER_REWRITES:
+                        line = pattern.sub(replacement, line)
+                    out.write(line)
+        script_path.unlink()
+
+    def export_jsonl(self) -> None:
+        """Export the graph as JSON Lines for TuringDB"""
+        url = SERVERS["neo4j"].ready_url
+        self.manifest.dataset(self.dataset)["counts"] = self._count_graph(url)
+        self._neo4j_query(
+            url, 'CALL apoc.export.json.all("output.json", {useTypes: true})'
+        )
+        shutil.move(NEO4J_IMPORT / "output.json", self.jsonl_path)
+
+    def load_memgraph(self) -> None:
+        """
+        Run the Cypher script in Memgraph, or with --memgraph-loader bolt, load the JSONL export over Bolt
+        """
+        url = SERVERS["memgraph"].ready_url
+        if self.memgraph_loader == "bolt":
+            load_dataset(
+                "memgraph",
+                self.jsonl_path,
+                schema_statements(self.cypher_path),
+                url,
+                self.auth,
+                BOLT_LOADER_SESSIONS,
+                BOLT_LOADER_BATCH_SIZE,
+            )
+            return
+
+        with open(self.cypher_path, "rb") as script:
+            # mgconsole waits for each statement to commit, so the dataset is
+            # loaded once it exits. Progress is not polled: queries would
+            # slow down the import being timed.
+            console = subprocess.run(
+                [MGCONSOLE_BINARY, "--port", "7688"],
+                stdin=script,
+                stdout=subprocess.DEVNULL,
+                check=False,
+            )
+        if console.returncode != 0:
+            raise RuntimeError(f"mgconsole failed ({console.returncode})")
+        self._neo4j_query(url, "CREATE SNAPSHOT")
+
+    def load_turingdb(self) -> None:
+        """Load the JSON Lines export into a new TuringDB directory"""
+        data_dir = self.turingdb_path / "data"
+        data_dir.mkdir(parents=True)
+        shutil.copy(self.jsonl_path, data_dir / "output.json")
+        try:
+            subprocess.run(
+                [
+                    "uv",
+                    "run",
+                    "turingdb",
+                    "-turing-dir",
+                    str(self.turingdb_path),
+                    "-p",
+                    "6667",
+                ],
+                input=f"LOAD JSONL 'output.json' AS {self.dataset};\n",
+                text=True,
+                check=True,
+            )
+        finally:
+            (data_dir / "output.json").unlink(missing_ok=True)
+
+
+def _remove(path: Path) -> None:
+    """Remove a file, directory or symbolic link if it exists"""
+    if path.is_symlink() or path.is_file():
+        path.unlink()
+    elif path.is_dir():
+        shutil.rmtree(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import a dataset into the dumps of TuringDB, Neo4j and "
+        "Memgraph, measuring each stage",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s reactome                              # Run the stages which are out of date
+  %(prog)s poledb --stages load-memgraph --runs 3  # Time a stage three times
+  %(prog)s reactome --adopt                      # Record dumps made by the shell scripts
+        """,
+    )
+    parser.add_argument(
+        "dataset",
+        help=f"Dataset to import: {', '.join(sorted(DUMP_URLS))}, or a generated "
+        f"dataset with dumps/<dataset>.{{jsonl,cypher}} for --stages "
+        f"{' '.join(LOAD_STAGES)}",
+    )
+    parser.add_argument(
+        "--stages",
+        choices=STAGES,
+        nargs="+",
+        default=STAGES,
+        help="Stages to run, in pipeline order (default: all)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run the stages even if their outputs are up to date",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=1,
+        help="Run each stage this many times to measure the spread of its wall "
+        "time; implies --force (default: 1)",
+    )
+    parser.add_argument(
+        "--adopt",
+        action="store_true",
+        help="Record the existing outputs of the stages as up to date without "
+        "running them, e.g. dumps made by scripts/neo4j-43-imports/",
+    )
+    parser.add_argument(
+        "--rehash",
+        action="store_true",
+        help="Hash every file again, even if its size and modification time "
+        "are unchanged",
+    )
+    parser.add_argument(
+        "--memgraph-loader",
+        choices=MEMGRAPH_LOADERS,
+        default="mgconsole",
+        help="Load Memgraph by replaying the Cypher dump through mgconsole, or "
+        "from the JSONL export over parallel Bolt sessions (default: mgconsole)",
+    )
+    parser.add_argument("--username", "-n", default="neo4j")
+    parser.add_argument("--password", "-p", default="neo4j")
+
+    args = parser.parse_args()
+
+    if args.dataset not in DUMP_URLS and not set(args.stages) <= set(LOAD_STAGES):
+        print(
+            f"{args.dataset} has no Neo4j dump: only --stages "
+            f"{' '.join(LOAD_STAGES)} can import it"
+        )
+        sys.exit(1)
+
+    pipeline = ImportPipeline(
+        args.dataset,
+        Manifest(MANIFEST_PATH, args.rehash),
+        args.username,
+        args.password,
+        args.memgraph_loader,
+    )
+    if args.adopt:
+        pipeline.adopt(args.stages)
+        sys.exit(0)
+
+    try:
+        pipeline.run(args.stages, args.runs, args.force or args.runs > 1)
+    except (subprocess.CalledProcessError, RuntimeError) as e:
+        print(f"\n✗ Import failed: {e}")
+        sys.exit(1)
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
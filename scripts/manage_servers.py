@@ -4,11 +4,15 @@ Server orchestration tool for managing database servers (TuringDB, Neo4j, Memgra
 Handles starting and graceful shutdown.
 """
 
+import json
 import subprocess
 import sys
 import os
+import re
 import time
 import argparse
+import urllib.error
+import urllib.request
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional
@@ -28,6 +32,11 @@ MEMGRAPH_BINARY = f"{INSTALL_FOLDER}/memgraph/usr/lib/memgraph/memgraph"
 MEMGRAPH_LOG_FILE = f"{INSTALL_FOLDER}/memgraph/log"
 MGCONSOLE_BINARY = f"{INSTALL_FOLDER}/memgraph/usr/bin/mgconsole"
 
+# Readiness probes run in-process every READY_POLL_INTERVAL seconds, each
+# giving up after READY_PROBE_TIMEOUT seconds
+READY_POLL_INTERVAL = 0.05
+READY_PROBE_TIMEOUT = 0.5
+
 
 @dataclass
 class ServerConfig:
@@ -41,6 +50,8 @@ class ServerConfig:
     stop_command: Optional[str] = None
     stop_input: Optional[str] = None
     log_file: Optional[str] = None
+    # Endpoint probed for readiness: bolt:// (RETURN 1) or http:// (LIST GRAPH)
+    ready_url: str = ""
 
 
 class ServerManager:
@@ -48,6 +59,10 @@ class ServerManager:
 
     def __init__(self):
         self.process: Optional[subprocess.Popen] = None
+        # Time from launching the last started server to its readiness, and
+        # to its graph being loaded (TuringDB -load), in seconds
+        self.ready_time: Optional[float] = None
+        self.graph_load_time: Optional[float] = None
         self.pid_dir = Path(__file__).parent / ".cache"
         self.pid_dir.mkdir(exist_ok=True)
 
@@ -117,6 +132,8 @@ class ServerManager:
                 self._remove_pid_file(config.name)
 
         print(f"{CLEARLINE}○ Starting {config.name}...", end="")
+        self.ready_time = None
+        self.graph_load_time = None
 
         try:
             env = os.environ.copy()
@@ -138,6 +155,7 @@ class ServerManager:
                     f"{prefix}/lib/python3.10:{prefix}/lib/python3.10/lib-dynload"
                 )
 
+            launch_time = time.perf_counter()
             self.process = subprocess.Popen(
                 f"{config.start_command} {additional_args}",
                 shell=True,
@@ -151,37 +169,53 @@ class ServerManager:
 
             self._save_pid(config.name, self.process.pid)
 
-            if config.name == "Memgraph":
-                if not self._wait_for_memgraph_ready(config):
-                    out, err = self.process.communicate()
-                    print(out)
-                    print(err)
-                    return False
-            elif config.name == "TuringDB":
-                if not self._wait_for_turingdb_ready(config):
-                    out, err = self.process.communicate()
-                    print("Could not wait for TuringDB to be ready")
-                    print(out)
-                    print(err)
-                    return False
-            elif config.name == "Neo4j":
-                if not self._wait_for_pattern(
-                    config.start_ready_pattern, config.start_timeout, config.log_file
-                ):
-                    out, err = self.process.communicate()
-                    print(out)
-                    print(err)
+            # The Neo4j launcher returns once the JVM is started, long before
+            # Bolt is served
+            if config.start_ready_pattern and not self._wait_for_pattern(
+                config.start_ready_pattern, config.start_timeout, config.log_file
+            ):
+                out, err = self.process.communicate()
+                print(out)
+                print(err)
+                return False
+
+            if not self._wait_for_ready(config, launch_time):
+                print(f"{CLEARLINE}✗ {config.name} was not ready in time", end="")
+                return False
+            self.ready_time = time.perf_counter() - launch_time
+
+            message = f"{config.name} started, ready in {self.ready_time:.3f}s"
+
+            # The graphs given to TuringDB's -load may still be loading once it
+            # answers queries
+            load = re.search(r"-load\s+(\S+)", additional_args)
+            if config.name == "TuringDB" and load:
+                graph = load.group(1)
+                if not self._wait_for_graph(config, graph, launch_time):
+                    print(f"{CLEARLINE}✗ Graph {graph} was not loaded", end="")
                     return False
-            else:
-                raise Exception(f"Unknown server type: {config.name}")
+                self.graph_load_time = (
+                    time.perf_counter() - launch_time - self.ready_time
+                )
+                message += f" (graph {graph} loaded in {self.graph_load_time:.3f}s)"
 
-            print(f"{CLEARLINE}✓ {config.name} started", end="")
+            print(f"{CLEARLINE}✓ {message}", end="")
             return True
 
         except Exception as e:
             print(f"{CLEARLINE}✗ Failed to start {config.name}: {e}", end="")
             return False
 
+    def record_startup(self, config: ServerConfig, metrics_file: str) -> None:
+        """Append the startup times of the last started server to a JSONL file"""
+        with open(metrics_file, "a") as f:
+            record = {
+                "engine": config.name,
+                "ready_s": self.ready_time,
+                "graph_load_s": self.graph_load_time,
+            }
+            f.write(json.dumps(record) + "\n")
+
     def stop(self, config: ServerConfig, additional_args: str) -> bool:
         """Stop a server gracefully"""
         saved_pid = self._load_pid(config.name)
@@ -243,44 +277,81 @@ class ServerManager:
         # Timeout reached and server is still running
         return False
 
-    def _wait_for_memgraph_ready(self, config: ServerConfig) -> bool:
-        """Wait for Memgraph to be ready"""
-        start_time = time.time()
+    def _probe_bolt(self, driver) -> bool:
+        """Whether the Bolt server answers a query"""
+        from neo4j.exceptions import AuthError
 
-        while time.time() - start_time < config.stop_timeout:
-            if self.process and self.process.poll() is not None:
-                return False
+        try:
+            with driver.session() as session:
+                session.run("RETURN 1").consume()
+            return True
+        except AuthError:
+            # The server is up, only our credentials are refused
+            return True
+        except Exception:
+            return False
 
-            try:
-                res = subprocess.run(
-                    f"echo 'RETURN 1;' | {MGCONSOLE_BINARY} --port 7688",
-                    shell=True,
-                    capture_output=True,
-                )
-                if res.returncode == 0:
+    def _query_http(self, url: str, query: str) -> Optional[str]:
+        """POST a query to a TuringDB /query endpoint, None if unanswered"""
+        request = urllib.request.Request(
+            f"{url}/query", data=query.encode(), method="POST"
+        )
+        try:
+            with urllib.request.urlopen(
+                request, timeout=READY_PROBE_TIMEOUT
+            ) as response:
+                return response.read().decode(errors="replace")
+        except (urllib.error.URLError, OSError):
+            return None
+
+    def _wait_for_ready(self, config: ServerConfig, launch_time: float) -> bool:
+        """
+        Probe the server every READY_POLL_INTERVAL until it answers queries,
+        at most start_timeout seconds after its launch
+        """
+        deadline = launch_time + config.start_timeout
+
+        if config.ready_url.startswith("http"):
+            while time.perf_counter() < deadline:
+                if self.process and self.process.poll() not in (None, 0):
+                    return False
+                if self._query_http(config.ready_url, "LIST GRAPH") is not None:
                     return True
+                time.sleep(READY_POLL_INTERVAL)
+            return False
 
-                time.sleep(1.0)
-            except Exception:
-                pass
-
-        return False
-
-    def _wait_for_turingdb_ready(self, config: ServerConfig) -> bool:
-        """Wait for TuringDB to be ready"""
-        start_time = time.time()
+        from neo4j import GraphDatabase
 
-        while time.time() - start_time < config.start_timeout:
-            try:
-                cmd = "uv run python3 -c 'import turingdb; c = turingdb.TuringDB(host=\"http://localhost:6667\"); c.warmup()'"
-                res = subprocess.run(cmd, shell=True, capture_output=True)
-                if res.returncode == 0:
+        driver = GraphDatabase.driver(
+            config.ready_url,
+            auth=("neo4j", "neo4j"),
+            connection_timeout=READY_PROBE_TIMEOUT,
+            connection_acquisition_timeout=READY_PROBE_TIMEOUT,
+        )
+        try:
+            while time.perf_counter() < deadline:
+                if self.process and self.process.poll() not in (None, 0):
+                    return False
+                if self._probe_bolt(driver):
                     return True
+                time.sleep(READY_POLL_INTERVAL)
+            return False
+        finally:
+            driver.close()
 
-                time.sleep(1.0)
-            except Exception:
-                pass
+    def _wait_for_graph(
+        self, config: ServerConfig, graph: str, launch_time: float
+    ) -> bool:
+        """Wait for a graph to be listed as loaded by TuringDB"""
+        deadline = launch_time + config.start_timeout
 
+        while time.perf_counter() < deadline:
+            if self.process and self.process.poll() not in (None, 0):
+                return False
+            graphs = self._query_http(config.ready_url, "LIST GRAPH")
+            if graphs is not None and f'"{graph}"' in graphs:
+                return True
+            time.sleep(READY_POLL_INTERVAL)
         return False
 
     def _wait_for_pattern(
@@ -331,12 +402,16 @@ SERVERS = {
         name="TuringDB",
         start_command="uv run turingdb -demon -p 6667",
         stop_command="pkill -9 turingdb",
+        start_timeout=300,
+        ready_url="http://localhost:6667",
     ),
     "neo4j": ServerConfig(
         name="Neo4j",
         start_command="neo4j start",
         start_ready_pattern="Started neo4j",
         stop_command="neo4j stop",
+        start_timeout=120,
+        ready_url="bolt://localhost:7687",
     ),
     "memgraph": ServerConfig(
         name="Memgraph",
@@ -348,6 +423,7 @@ SERVERS = {
         stop_command="pkill -15 memgraph",
         start_timeout=120,
         stop_timeout=120,
+        ready_url="bolt://localhost:7688",
     ),
 }
 
@@ -362,8 +438,15 @@ Examples:
   %(prog)s turingdb start          # Start TuringDB
   %(prog)s neo4j stop              # Stop Neo4j
   %(prog)s all start               # Start all servers
+  %(prog)s --metrics startup.jsonl memgraph start  # Record its startup times
         """,
     )
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="Append the time to ready and graph load time of started servers "
+        "to this JSON Lines file (must come before the server)",
+    )
 
     parser.add_argument(
         "server",
@@ -391,6 +474,8 @@ Examples:
         if args.action == "start":
             if not manager.start(config, " ".join(args.additional)):
                 failed = True
+            elif args.metrics:
+                manager.record_startup(config, args.metrics)
         else:
             if not manager.stop(config, " ".join(args.additional)):
                 failed = True
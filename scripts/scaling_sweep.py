@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Scaling sweep: runs the same query suite against synthetic datasets of
+increasing scale factors, generated by scripts/generate_synthetic_graph.py and
+imported by scripts/import_pipeline.py, then fits how the latency of every
+query grows with the size of the graph (report_summary/scaling_report.py).
+
+Like the shell scripts, this must be run after `source env.sh`.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+from generate_synthetic_graph import NODES_PER_SF, GraphLayout, dataset_name
+from manage_servers import REPO_ROOT, SERVERS, ServerManager
+
+DUMPS_DIR = Path(os.environ.get("DUMPS", REPO_ROOT / "dumps"))
+SCRIPTS_DIR = Path(__file__).parent
+
+# Synthetic datasets only have JSONL and Cypher dumps, hence no Neo4j
+ENGINES = ["turingdb", "memgraph"]
+IMPORT_STAGES = {"turingdb": "load-turingdb", "memgraph": "load-memgraph"}
+
+
+class ScalingSweep:
+    """Generates, imports and benchmarks the datasets of a sweep"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.output_dir: Path = args.output_dir
+        self.manager = ServerManager()
+
+    def dataset(self, scale_factor: float) -> str:
+        return dataset_name(scale_factor)
+
+    def samples_path(self, dataset: str) -> Path:
+        return self.output_dir / f"{dataset}_samples.csv.gz"
+
+    def generate(self, scale_factor: float) -> None:
+        dataset = self.dataset(scale_factor)
+        if all(
+            (DUMPS_DIR / f"{dataset}.{ext}").exists() for ext in ("jsonl", "cypher")
+        ):
+            print(f"- {dataset} already generated")
+            return
+        subprocess.run(
+            [
+                sys.executable,
+                str(SCRIPTS_DIR / "generate_synthetic_graph.py"),
+                "--scale-factor",
+                str(scale_factor),
+                "--seed",
+                str(self.args.seed),
+                "--dumps-dir",
+                str(DUMPS_DIR),
+            ],
+            check=True,
+        )
+
+    def load(self, scale_factor: float) -> None:
+        """Import the dataset; the pipeline skips the dumps that are up to date"""
+        subprocess.run(
+            [
+                sys.executable,
+                str(SCRIPTS_DIR / "import_pipeline.py"),
+                self.dataset(scale_factor),
+                "--stages",
+            ]
+            + [IMPORT_STAGES[engine] for engine in self.args.engines],
+            check=True,
+        )
+
+    def benchmark(self, engine: str, dataset: str) -> None:
+        """Run the query suite on one engine, as run.sh does"""
+        config = SERVERS[engine]
+        if engine == "turingdb":
+            server_args = (
+                f'-turing-dir "{DUMPS_DIR / dataset}.turingdb" -load "{dataset}"'
+            )
+            bench_args = [f"--database={dataset}"]
+        else:
+            server_args = f"--data-directory={DUMPS_DIR / dataset}.memgraph"
+            bench_args = ["--database=memgraph", "--url=bolt://localhost:7688"]
+
+        print(f"- Running benchmark for '{engine}' on {dataset}")
+        self.manager.stop(config, "")
+        if not self.manager.start(config, server_args):
+            raise RuntimeError(f"Could not start {config.name}")
+        try:
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "turingbench",
+                    engine,
+                    "--query-file",
+                    str(self.args.query_file),
+                    "--samples",
+                    str(self.samples_path(dataset)),
+                    "--runs",
+                    str(self.args.runs),
+                    "--warmup",
+                    str(self.args.warmup),
+                ]
+                + bench_args,
+                cwd=REPO_ROOT,
+                check=True,
+            )
+        finally:
+            self.manager.stop(config, "")
+
+    def run(self) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        sizes_path = self.output_dir / "sizes.json"
+        sizes = json.loads(sizes_path.read_text()) if sizes_path.exists() else {}
+
+        for scale_factor in self.args.scale_factors:
+            dataset = self.dataset(scale_factor)
+            self.generate(scale_factor)
+            self.load(scale_factor)
+
+            self.samples_path(dataset).unlink(missing_ok=True)
+            for engine in self.args.engines:
+                self.benchmark(engine, dataset)
+
+            sizes[dataset] = GraphLayout(
+                round(scale_factor * NODES_PER_SF), self.args.seed
+            ).nodes
+            sizes_path.write_text(json.dumps(sizes, indent=2) + "\n")
+
+    def report(self, datasets: List[str]) -> None:
+        subprocess.run(
+            [
+                sys.executable,
+                str(REPO_ROOT / "report_summary" / "scaling_report.py"),
+                "--sweep-dir",
+                str(self.output_dir),
+                "--datasets",
+            ]
+            + datasets,
+            check=True,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark a query suite over synthetic datasets of growing "
+        "scale factors and report the latency growth of every query",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s --scale-factors 1 2 4 8                    # Sweep TuringDB and Memgraph
+  %(prog)s --scale-factors 1 2 4 8 --engines turingdb --runs 10
+  %(prog)s --scale-factors 1 2 4 8 --report-only      # Report on the existing samples
+        """,
+    )
+    parser.add_argument(
+        "--scale-factors",
+        "-s",
+        type=float,
+        nargs="+",
+        required=True,
+        help="Scale factors of the datasets; doubling them doubles the graph",
+    )
+    parser.add_argument(
+        "--engines",
+        choices=ENGINES,
+        nargs="+",
+        default=ENGINES,
+        help="Engines to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--query-file",
+        type=Path,
+        default=REPO_ROOT / "sample_queries" / "synthetic" / "queries_synthetic.cypher",
+        help="Query suite (default: sample_queries/synthetic/queries_synthetic.cypher)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="(default: 0)")
+    parser.add_argument("--runs", type=int, default=5, help="(default: 5)")
+    parser.add_argument("--warmup", type=int, default=1, help="(default: 1)")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=REPO_ROOT / "reports" / "scaling",
+        help="Directory of the samples and of the report (default: reports/scaling)",
+    )
+    parser.add_argument(
+        "--report-only",
+        action="store_true",
+        help="Only report on the samples of a previous sweep",
+    )
+
+    args = parser.parse_args()
+
+    if len(set(args.scale_factors)) < 2:
+        print("--scale-factors needs at least two distinct scale factors")
+        sys.exit(1)
+
+    sweep = ScalingSweep(args)
+    datasets = [sweep.dataset(sf) for sf in sorted(set(args.scale_factors))]
+    try:
+        if not args.report_only:
+            sweep.run()
+        sweep.report(datasets)
+    except (subprocess.CalledProcessError, RuntimeError) as e:
+        print(f"\n✗ Scaling sweep failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import pytest
+
+from turingbench.fingerprint import (
+    ENTITY,
+    ENTITY_LIST,
+    VALUE,
+    ResultFingerprint,
+    column_kinds,
+)
+
+
+def fingerprint(rows, query="RETURN 1 AS x", columns=("x",), entity_types=()):
+    result = ResultFingerprint(query, columns, entity_types)
+    for row in rows:
+        result.add(row)
+    return result
+
+
+def test_order_insensitive():
+    rows = [[1, "a"], [2, "b"], [3, None]]
+    columns = ("x", "y")
+    assert (
+        fingerprint(rows, columns=columns).hexdigest()
+        == fingerprint(rows[::-1], columns=columns).hexdigest()
+    )
+
+
+def test_duplicate_rows_do_not_cancel_out():
+    once = fingerprint([[1]])
+    twice = fingerprint([[1], [1]])
+    assert twice.rows == 2
+    assert twice.hexdigest() != fingerprint([]).hexdigest()
+    assert twice.hexdigest() != once.hexdigest()
+
+
+def test_digest_format():
+    assert fingerprint([]).hexdigest() == "0" * 32
+    assert len(fingerprint([["x"]]).hexdigest()) == 32
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        (3, 3.0),
+        (0.1 + 0.2, 0.3),
+        ({"b": 1, "a": [2]}, {"a": [2], "b": 1}),
+    ],
+)
+def test_equivalent_values(first, second):
+    assert fingerprint([[first]]).hexdigest() == fingerprint([[second]]).hexdigest()
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        (1, "1"),
+        (True, 1),
+        (None, ""),
+        (["ab"], ["a", "b"]),
+        (1.5, 1.6),
+    ],
+)
+def test_distinct_values(first, second):
+    assert fingerprint([[first]]).hexdigest() != fingerprint([[second]]).hexdigest()
+
+
+def test_column_kinds():
+    query = (
+        "MATCH p = (n:Drug)-[r:TARGETS]->(m) "
+        "WITH n AS drug, collect(DISTINCT m) AS targets, count(r) AS degree "
+        "RETURN drug, targets, degree, p, collect(n), m.name"
+    )
+    columns = ["drug", "targets", "degree", "p", "collect(n)", "m.name"]
+    assert column_kinds(query, columns) == [
+        ENTITY,
+        ENTITY_LIST,
+        VALUE,
+        ENTITY,
+        ENTITY_LIST,
+        VALUE,
+    ]
+
+
+def test_entity_ids_are_ignored():
+    query = "MATCH (n)-->(m) RETURN n, collect(m) AS ms, n.name"
+    columns = ("n", "ms", "n.name")
+    first = fingerprint([[10, [1, 2], "a"]], query, columns)
+    second = fingerprint([[{"id": 99}, [7, 8], "a"]], query, columns)
+    assert first.hexdigest() == second.hexdigest()
+
+    other_name = fingerprint([[10, [1, 2], "b"]], query, columns)
+    shorter = fingerprint([[10, [1], "a"]], query, columns)
+    assert other_name.hexdigest() != first.hexdigest()
+    assert shorter.hexdigest() != first.hexdigest()
+
+
+def test_entity_types_are_ignored_anywhere():
+    class Node:
+        def __init__(self, element_id):
+            self.element_id = element_id
+
+    first = fingerprint([[[Node("a"), 1]]], entity_types=(Node,))
+    second = fingerprint([[[Node("b"), 1]]], entity_types=(Node,))
+    assert first.hexdigest() == second.hexdigest()
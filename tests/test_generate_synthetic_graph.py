@@ -0,0 +1,70 @@
+import io
+import json
+import random
+
+import pytest
+
+from generate_synthetic_graph import (
+    NODE_CLASSES,
+    GraphLayout,
+    dataset_name,
+    generate,
+    zipf_rank,
+)
+
+
+def generated(nodes, seed):
+    jsonl, cypher = io.StringIO(), io.StringIO()
+    counts = generate(GraphLayout(nodes, seed), seed, 2.0, 0.9, jsonl, cypher)
+    return counts, jsonl.getvalue(), cypher.getvalue()
+
+
+def test_same_seed_same_graph():
+    assert generated(2000, 7) == generated(2000, 7)
+
+
+def test_different_seeds_different_graphs():
+    assert generated(2000, 7)[1] != generated(2000, 8)[1]
+
+
+def test_edges_connect_nodes_of_the_graph():
+    (nodes, edges), jsonl, cypher = generated(3000, 0)
+    records = [json.loads(line) for line in jsonl.splitlines()]
+    node_ids = {r["id"] for r in records if r["type"] == "node"}
+    relationships = [r for r in records if r["type"] == "relationship"]
+
+    assert len(node_ids) == nodes
+    assert len(relationships) == edges > 0
+    for relationship in relationships:
+        assert relationship["start"]["id"] in node_ids
+        assert relationship["end"]["id"] in node_ids
+    assert cypher.count("{start: {_id:") == edges
+
+
+def test_layout_covers_every_class():
+    layout = GraphLayout(1000, 0)
+    assert layout.nodes == sum(layout.sizes)
+    for i, node_class in enumerate(NODE_CLASSES):
+        start, size = layout.starts[i], layout.sizes[i]
+        assert layout.class_of(start) is node_class
+        assert layout.class_of(start + size - 1) is node_class
+        ranks = {layout.node_in(node_class.name, rank) for rank in range(size)}
+        # The popularity ranks are a permutation of the class's block
+        assert ranks == set(range(start, start + size))
+
+
+@pytest.mark.parametrize("exponent", [0.5, 1.0, 1.5])
+def test_zipf_rank_in_range(exponent):
+    rng = random.Random(0)
+    ranks = [zipf_rank(rng, 50, exponent) for _ in range(5000)]
+    assert min(ranks) == 0
+    assert max(ranks) < 50
+    assert ranks.count(0) > ranks.count(49)
+
+
+@pytest.mark.parametrize(
+    "scale_factor, name",
+    [(1, "synthetic_sf1"), (0.5, "synthetic_sf0_5"), (100.0, "synthetic_sf100")],
+)
+def test_dataset_name(scale_factor, name):
+    assert dataset_name(scale_factor) == name
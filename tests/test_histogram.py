@@ -0,0 +1,93 @@
+import random
+import statistics
+
+import pytest
+
+from turingbench.histogram import HIGHEST_US, LatencyHistogram
+
+
+def histogram_of(values, significant_digits=2):
+    histogram = LatencyHistogram(significant_digits)
+    for value in values:
+        histogram.record(value)
+    return histogram
+
+
+def test_small_values_are_exact():
+    histogram = histogram_of(range(256))
+    assert histogram.percentile(0) == 0
+    assert histogram.median() == 127
+    assert histogram.percentile(100) == 255
+    assert histogram.weighted() == (list(range(256)), [1] * 256)
+
+
+@pytest.mark.parametrize("significant_digits", [1, 2, 3])
+def test_bucket_precision(significant_digits):
+    rng = random.Random(0)
+    for _ in range(1000):
+        value = rng.randrange(1, HIGHEST_US)
+        # A larger maximum so that the percentile is the bucket's bound
+        histogram = histogram_of([value, HIGHEST_US], significant_digits)
+        upper = histogram.percentile(50)
+        assert value <= upper <= value * (1 + 10**-significant_digits)
+
+
+def test_values_in_the_same_bucket_share_a_percentile():
+    histogram = histogram_of([1000, 1001, 100_000])
+    assert histogram.percentile(33) == histogram.percentile(66)
+
+
+def test_exact_summary_statistics():
+    values = [random.Random(1).randrange(10**7) for _ in range(500)]
+    histogram = histogram_of(values)
+    assert histogram.count == len(values)
+    assert histogram.min == min(values)
+    assert histogram.max == max(values)
+    assert histogram.mean() == pytest.approx(statistics.mean(values))
+    assert histogram.stdev() == pytest.approx(statistics.stdev(values))
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0
+    assert histogram.mean() == 0.0
+    assert histogram.stdev() == 0.0
+    assert histogram.weighted() == ([], [])
+
+
+def test_out_of_range_values():
+    histogram = histogram_of([-5, 2 * HIGHEST_US])
+    assert histogram.min == 0
+    assert histogram.max == 2 * HIGHEST_US
+    # Counted in the last bucket, percentiles are capped to its bound
+    assert HIGHEST_US <= histogram.percentile(100) <= HIGHEST_US * 1.01
+
+
+def test_merge_equals_recording_everything():
+    rng = random.Random(2)
+    first = [rng.randrange(10**6) for _ in range(300)]
+    second = [rng.randrange(10**9) for _ in range(300)]
+    merged = histogram_of(first)
+    merged.merge(histogram_of(second))
+    expected = histogram_of(first + second)
+
+    assert merged.weighted() == expected.weighted()
+    for attribute in ("count", "total", "total_squares", "min", "max"):
+        assert getattr(merged, attribute) == getattr(expected, attribute)
+
+
+def test_merge_into_empty_histogram():
+    merged = LatencyHistogram()
+    merged.merge(histogram_of([50, 70]))
+    assert (merged.min, merged.max, merged.count) == (50, 70, 2)
+
+
+def test_merge_rejects_other_precisions():
+    with pytest.raises(ValueError):
+        LatencyHistogram(2).merge(histogram_of([1], significant_digits=3))
+
+
+@pytest.mark.parametrize("significant_digits", [0, 6])
+def test_invalid_precision(significant_digits):
+    with pytest.raises(ValueError):
+        LatencyHistogram(significant_digits)
@@ -0,0 +1,80 @@
+import random
+from collections import Counter
+
+import pytest
+
+from turingbench.params import (
+    ParamGenerator,
+    cypher_literal,
+    draw_params,
+    inline_params,
+    template_params,
+)
+
+
+def test_sequential_cycles_in_order():
+    generator = ParamGenerator(["a", "b", "c"], "sequential")
+    assert [generator.next() for _ in range(7)] == list("abcabca")
+
+
+def test_strided_copies_draw_disjoint_values():
+    values = list(range(12))
+    copies = [ParamGenerator(values, "sequential") for _ in range(3)]
+    for offset, copy in enumerate(copies):
+        copy.stride(offset, len(copies))
+
+    drawn = [[copy.next() for _ in range(4)] for copy in copies]
+    assert drawn == [[0, 3, 6, 9], [1, 4, 7, 10], [2, 5, 8, 11]]
+
+
+def test_strides_wrap_around():
+    generator = ParamGenerator(list(range(5)), "sequential")
+    generator.stride(1, 2)
+    assert [generator.next() for _ in range(5)] == [1, 3, 0, 2, 4]
+
+
+def test_zipf_favours_the_first_values():
+    random.seed(0)
+    generator = ParamGenerator(list(range(10)), "zipf", exponent=1.0)
+    counts = Counter(generator.next() for _ in range(20_000))
+
+    harmonic = sum(1 / k for k in range(1, 11))
+    assert counts[0] / 20_000 == pytest.approx(1 / harmonic, rel=0.05)
+    assert counts[0] > counts[1] > counts[4] > counts[9]
+    assert set(counts) == set(range(10))
+
+
+def test_uniform_draws_every_value():
+    random.seed(0)
+    generator = ParamGenerator(["x", "y"])
+    assert {generator.next() for _ in range(100)} == {"x", "y"}
+
+
+@pytest.mark.parametrize("values, distribution", [([], "uniform"), ([1], "gaussian")])
+def test_invalid_generators(values, distribution):
+    with pytest.raises(ValueError):
+        ParamGenerator(values, distribution)
+
+
+def test_draw_params():
+    query = "MATCH (n {id: $id}) WHERE n.name = $name RETURN n"
+    generators = {
+        "id": ParamGenerator([1, 2], "sequential"),
+        "name": ParamGenerator(["a"]),
+    }
+    assert template_params(query) == {"id", "name"}
+    assert draw_params(query, generators) == {"id": 1, "name": "a"}
+    assert draw_params(query, generators) == {"id": 2, "name": "a"}
+    assert draw_params("MATCH (n) RETURN n", generators) is None
+
+    with pytest.raises(KeyError):
+        draw_params("MATCH (n {x: $x}) RETURN n", generators)
+
+
+def test_inline_params():
+    query = "MATCH (n {id: $id}) WHERE n.name IN $names RETURN n"
+    params = {"id": 3, "names": ['say "hi"', None, True]}
+    assert inline_params(query, params) == (
+        'MATCH (n {id: 3}) WHERE n.name IN ["say \\"hi\\"", null, true] RETURN n'
+    )
+    assert cypher_literal({"a b": 1.5}) == "{`a b`: 1.5}"
@@ -0,0 +1,76 @@
+import json
+from collections import Counter
+
+import pytest
+
+from turingbench.scenario import _apportion, load_scenario
+
+
+@pytest.mark.parametrize(
+    "weights, total, expected",
+    [
+        ([70, 20, 10], 1000, [700, 200, 100]),
+        ([1, 1, 1], 10, [4, 3, 3]),
+        ([0.5, 0.3, 0.2], 7, [4, 2, 1]),
+        ([1, 2], 0, [0, 0]),
+        ([5], 3, [3]),
+    ],
+)
+def test_apportion(weights, total, expected):
+    assert _apportion(weights, total) == expected
+
+
+def test_apportion_always_fills_the_total():
+    for total in range(50):
+        assert sum(_apportion([3, 1, 1, 7, 2], total)) == total
+
+
+def write_scenario(directory, spec):
+    path = directory / "scenario.json"
+    path.write_text(json.dumps(spec))
+    return str(path)
+
+
+def test_mix_follows_the_weights(tmp_path):
+    (tmp_path / "traversals.cypher").write_text(
+        "MATCH (a)-->(b)-->(c) RETURN c;\nMATCH (a) RETURN a;\n"
+    )
+    path = write_scenario(
+        tmp_path,
+        {
+            "length": 100,
+            "classes": {
+                "lookup": {"weight": 3, "queries": ["Q1", "Q2"]},
+                "traversal": {
+                    "weight": 1,
+                    "query_file": "traversals.cypher",
+                    "match": "\\)-->\\(.*\\)-->\\(",
+                },
+            },
+        },
+    )
+    scenario = load_scenario(path)
+
+    assert len(scenario.mix) == 100
+    assert Counter(scenario.mix) == {
+        "Q1": 38,
+        "Q2": 37,
+        "MATCH (a)-->(b)-->(c) RETURN c": 25,
+    }
+    assert scenario.queries() == ["Q1", "Q2", "MATCH (a)-->(b)-->(c) RETURN c"]
+
+
+def test_mix_is_reproducible(tmp_path):
+    spec = {"seed": 3, "classes": {"a": {"weight": 1, "queries": ["A", "B", "C"]}}}
+    first = load_scenario(write_scenario(tmp_path, spec)).mix
+    assert first == load_scenario(write_scenario(tmp_path, spec)).mix
+    assert len(first) == 1000
+
+    spec["seed"] = 4
+    assert first != load_scenario(write_scenario(tmp_path, spec)).mix
+
+
+def test_class_without_queries(tmp_path):
+    spec = {"classes": {"a": {"weight": 1, "queries": ["A"], "match": "B"}}}
+    with pytest.raises(ValueError):
+        load_scenario(write_scenario(tmp_path, spec))
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from turingbench.stats import bootstrap_intervals
+
+
+def test_constant_distribution():
+    mean, median = bootstrap_intervals(np.array([42.0]), np.array([100]))
+    assert mean == pytest.approx((42.0, 42.0))
+    assert median == (42.0, 42.0)
+
+
+def test_intervals_contain_the_estimates():
+    rng = np.random.default_rng(1)
+    samples = rng.lognormal(6, 1, 2000).round()
+    values, counts = np.unique(samples, return_counts=True)
+
+    (mean_low, mean_high), (median_low, median_high) = bootstrap_intervals(
+        values, counts
+    )
+    assert mean_low < samples.mean() < mean_high
+    assert median_low <= np.median(samples) <= median_high
+    assert mean_high - mean_low < 0.2 * samples.mean()
+
+
+def test_wider_at_higher_confidence():
+    values = np.arange(1.0, 101.0)
+    counts = np.full(100, 5)
+    (low_90, high_90), _ = bootstrap_intervals(values, counts, confidence=0.9)
+    (low_99, high_99), _ = bootstrap_intervals(values, counts, confidence=0.99)
+    assert low_99 < low_90 < high_90 < high_99
+
+
+def test_lower_median():
+    # The lower median of two samples is the larger value only when both
+    # resampled draws are, one time out of four
+    _, (median_low, median_high) = bootstrap_intervals(
+        np.array([1.0, 2.0]), np.array([1, 1])
+    )
+    assert (median_low, median_high) == (1.0, 2.0)
+
+
+def test_reproducible_by_default():
+    values = np.array([1.0, 5.0, 9.0])
+    counts = np.array([10, 3, 1])
+    assert bootstrap_intervals(values, counts) == bootstrap_intervals(values, counts)
+
+
+def test_batches_match_a_single_batch(monkeypatch):
+    values = np.array([1.0, 2.0, 3.0, 10.0])
+    counts = np.array([7, 5, 2, 1])
+    single = bootstrap_intervals(values, counts, resamples=100)
+    monkeypatch.setattr("turingbench.stats._MAX_BATCH_CELLS", 4 * 7)
+    assert bootstrap_intervals(values, counts, resamples=100) == single
@@ -1,32 +1,585 @@
 #!/usr/bin/env python3
 
 import argparse
+import csv
+import gzip
+import math
+import multiprocessing
+import os
+import random
+import sys
+import threading
 import time
 from abc import ABC, abstractmethod
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import (
+    List,
+    Dict,
+    Any,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+import numpy as np
 from tabulate import tabulate
 
+from .cold_start import PROFILES, ColdStarter
+from .fingerprint import ResultFingerprint
+from .histogram import LatencyHistogram
+from .params import (
+    PARAM_PATTERN,
+    ParamGenerator,
+    draw_params,
+    load_param_generators,
+)
+from .scenario import Scenario, load_scenario
+from .resources import (
+    CLOCK_TICKS,
+    RESOURCE_COLUMNS,
+    ResourceSampler,
+    ResourceUsage,
+    find_server_pid,
+)
+from .stats import bootstrap_intervals
+from .writes import (
+    CREATE_NODE,
+    MERGE_NODE,
+    SETUP_BATCH_SIZE,
+    UNWIND_EDGES,
+    WRITE_RESETS,
+    WRITE_WORKLOADS,
+    Statement,
+    WriteResult,
+    batches,
+    edge_rows,
+)
+
+
+PHASES = ["first_row", "fetch", "materialize"]
+
+# How query results are consumed by the client:
+# - materialize: build the list of Python dicts (what an application does)
+# - stream: iterate over the records and count them, without storing them
+# - discard: let the driver drop the records without reading them
+CONSUME_MODES = ["materialize", "stream", "discard"]
+
+# Whether queries may reuse a cached plan (warm), or are planned anew on every
+# run (cold), see AbstractDriver.cold_plan_query()
+PLAN_MODES = ["warm", "cold"]
+
+
+class QueryTimer:
+    """
+    Client-side phases of a single query run, timed from its creation:
+    send -> first record (first_row), first -> last record received (fetch),
+    and conversion of the records to Python objects (materialize).
+    Drivers call first_row() and last_row() as records arrive; the caller
+    calls stop() once the results are materialized.
+    """
+
+    def __init__(self):
+        self.start_ns = time.perf_counter_ns()
+        self.first_row_ns = 0
+        self.last_row_ns = 0
+        self.end_ns = 0
+
+    def first_row(self) -> None:
+        if not self.first_row_ns:
+            self.first_row_ns = time.perf_counter_ns()
+
+    def last_row(self) -> None:
+        self.last_row_ns = time.perf_counter_ns()
+        if not self.first_row_ns:
+            # Empty result: the (absent) first row arrives with the end of stream
+            self.first_row_ns = self.last_row_ns
+
+    def stop(self) -> int:
+        """Stop the timer and return the total elapsed time in microseconds"""
+        if not self.last_row_ns:
+            # The driver did not report its phases
+            self.last_row()
+        self.end_ns = time.perf_counter_ns()
+        return (self.end_ns - self.start_ns) // 1_000
+
+    def phases(self) -> Dict[str, int]:
+        """Duration of each phase in microseconds"""
+        return {
+            "first_row": (self.first_row_ns - self.start_ns) // 1_000,
+            "fetch": (self.last_row_ns - self.first_row_ns) // 1_000,
+            "materialize": (self.end_ns - self.last_row_ns) // 1_000,
+        }
+
+
+# Columns of the raw sample files written by --samples
+SAMPLE_COLUMNS = [
+    "engine",
+    "variant",
+    "level",
+    "query",
+    "run",
+    "timestamp_us",
+    "latency_us",
+    *(f"{phase}_us" for phase in PHASES),
+    *RESOURCE_COLUMNS,
+]
+
+
+LATENCY_STORES = ["samples", "histogram"]
+
+
+class SampleDistribution:
+    """Exact statistics of latency samples, see LatencyHistogram"""
+
+    def __init__(self, samples: Sequence[array]):
+        self.values = np.sort(
+            np.concatenate(
+                [np.frombuffer(a, dtype=np.int64) for a in samples]
+                or [np.empty(0, dtype=np.int64)]
+            )
+        )
+        self.count = len(self.values)
+        self.total = int(self.values.sum())
+        self.min = int(self.values[0]) if self.count else 0
+        self.max = int(self.values[-1]) if self.count else 0
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def stdev(self) -> float:
+        """Sample standard deviation"""
+        return float(np.std(self.values, ddof=1)) if self.count > 1 else 0.0
+
+    def median(self) -> float:
+        return float(np.median(self.values)) if self.count else 0.0
+
+    def percentile(self, p: float) -> int:
+        """Nearest-rank percentile"""
+        return _percentile(self.values, p) if self.count else 0
+
+    def weighted(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Distinct values and their counts"""
+        return np.unique(self.values, return_counts=True)
+
+
+Distribution = Union[SampleDistribution, LatencyHistogram]
+
 
 @dataclass
 class BenchmarkResult:
-    query_times: Dict[str, List[int]] = field(default_factory=dict)
+    # Samples are kept in arrays of signed 64-bit ints ("q") rather than lists
+    # of Python ints, so that long runs with millions of samples stay compact.
+    # With histogram_digits set, they are only counted in fixed-memory
+    # histograms (see LatencyHistogram) of that precision instead.
+    histogram_digits: int = 0
+    # query -> latency samples in microseconds
+    query_times: Dict[str, array] = field(default_factory=dict)
+    # query -> completion time of each sample, in microseconds since the epoch
+    timestamps: Dict[str, array] = field(default_factory=dict)
     query_sizes: Dict[str, int] = field(default_factory=dict)
+    # query -> row count and fingerprint of its result (--validate)
+    query_fingerprints: Dict[str, Tuple[int, str]] = field(default_factory=dict)
+    # query -> phase (see PHASES) -> samples in microseconds
+    phase_times: Dict[str, Dict[str, array]] = field(default_factory=dict)
+    # query -> latency histogram, and query -> phase -> histogram
+    histograms: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    phase_histograms: Dict[str, Dict[str, LatencyHistogram]] = field(
+        default_factory=dict
+    )
+    concurrency: int = 1
+    wall_time_us: int = 0
+    # Open-loop runs only: requested arrival rate and worst delay between the
+    # intended and the actual send time (large values mean the client saturated)
+    target_rate: float = 0.0
+    max_send_lag_us: int = 0
+    # query -> server resources used by each run (--resources)
+    resources: Dict[str, List[ResourceUsage]] = field(default_factory=dict)
+
+    def merge(self, other: "BenchmarkResult") -> None:
+        """Merge the samples of another result (e.g. from another worker) into this one"""
+        for query, times in other.query_times.items():
+            self.query_times.setdefault(query, array("q")).extend(times)
+        for query, stamps in other.timestamps.items():
+            self.timestamps.setdefault(query, array("q")).extend(stamps)
+        for query, size in other.query_sizes.items():
+            self.query_sizes.setdefault(query, size)
+        for query, fingerprint in other.query_fingerprints.items():
+            self.query_fingerprints.setdefault(query, fingerprint)
+        for query, phases in other.phase_times.items():
+            for phase, times in phases.items():
+                self.phase_times.setdefault(query, {}).setdefault(
+                    phase, array("q")
+                ).extend(times)
+        for query, histogram in other.histograms.items():
+            self._histogram(self.histograms, query).merge(histogram)
+        for query, phases in other.phase_histograms.items():
+            for phase, histogram in phases.items():
+                self._histogram(
+                    self.phase_histograms.setdefault(query, {}), phase
+                ).merge(histogram)
+        for query, usages in other.resources.items():
+            self.resources.setdefault(query, []).extend(usages)
+        self.max_send_lag_us = max(self.max_send_lag_us, other.max_send_lag_us)
+
+    def record(
+        self,
+        query: str,
+        elapsed_us: int,
+        row_count: Optional[int],
+        timer: Optional[QueryTimer] = None,
+    ) -> None:
+        """
+        Record one run of a query, with its phase breakdown if timed.
+        The row count is None when the records were discarded unread.
+        """
+        if row_count is not None and query not in self.query_sizes:
+            self.query_sizes[query] = row_count
+
+        if self.histogram_digits:
+            self._histogram(self.histograms, query).record(elapsed_us)
+            if timer is not None:
+                phase_histograms = self.phase_histograms.setdefault(query, {})
+                for phase, us in timer.phases().items():
+                    self._histogram(phase_histograms, phase).record(us)
+            return
+
+        self.query_times.setdefault(query, array("q")).append(elapsed_us)
+        self.timestamps.setdefault(query, array("q")).append(time.time_ns() // 1_000)
+
+        if timer is not None:
+            phases = self.phase_times.setdefault(query, {})
+            for phase, us in timer.phases().items():
+                phases.setdefault(phase, array("q")).append(us)
+
+    def _histogram(
+        self, histograms: Dict[str, LatencyHistogram], key: str
+    ) -> LatencyHistogram:
+        if key not in histograms:
+            histograms[key] = LatencyHistogram(self.histogram_digits)
+        return histograms[key]
+
+    def queries(self) -> List[str]:
+        """Queries with recorded runs, in order of first run"""
+        return list(self.histograms if self.histogram_digits else self.query_times)
+
+    def distribution(
+        self,
+        query: Optional[str] = None,
+        phase: Optional[str] = None,
+        queries: Optional[Sequence[str]] = None,
+    ) -> Distribution:
+        """
+        Latency distribution of a query (or of `queries`, or of all queries if
+        both are None), or of one of its phases
+        """
+        if query is not None:
+            queries = [query]
+        elif queries is None:
+            queries = self.queries()
+
+        if self.histogram_digits:
+            merged = LatencyHistogram(self.histogram_digits)
+            for q in queries:
+                histogram = (
+                    self.histograms.get(q)
+                    if phase is None
+                    else self.phase_histograms.get(q, {}).get(phase)
+                )
+                if histogram is not None:
+                    merged.merge(histogram)
+            return merged
+
+        return SampleDistribution(
+            [
+                a
+                for q in queries
+                if (
+                    a := self.query_times.get(q)
+                    if phase is None
+                    else self.phase_times.get(q, {}).get(phase)
+                )
+            ]
+        )
+
+    def write_samples(
+        self, writer: Any, engine: str, variant: str = "", level: Any = ""
+    ) -> None:
+        """Write every raw sample as a row of SAMPLE_COLUMNS to a csv writer"""
+        for query, times in self.query_times.items():
+            stamps = self.timestamps.get(query, array("q"))
+            phases = self.phase_times.get(query, {})
+            usages = self.resources.get(query, [])
+            for run, latency_us in enumerate(times):
+                writer.writerow(
+                    [
+                        engine,
+                        variant,
+                        level,
+                        query,
+                        run,
+                        stamps[run] if run < len(stamps) else "",
+                        latency_us,
+                        *(
+                            phases[phase][run]
+                            if run < len(phases.get(phase, ()))
+                            else ""
+                            for phase in PHASES
+                        ),
+                        *(
+                            ("" if value is None else value)
+                            for value in (
+                                vars(usages[run]).values()
+                                if run < len(usages)
+                                else [None] * len(RESOURCE_COLUMNS)
+                            )
+                        ),
+                    ]
+                )
+
+
+def _format_us(us: float) -> str:
+    """
+    Format a duration given in microseconds with a unit adapted to its
+    magnitude, keeping microsecond precision below one second:
+    950µs, 12.345ms, 3.210s
+    """
+    if us < 1_000:
+        return f"{us:.0f}µs"
+    if us < 1_000_000:
+        return f"{us / 1_000:.3f}ms"
+    return f"{us / 1_000_000:.3f}s"
+
+
+def _format_bytes(size: float) -> str:
+    """Format a size in bytes with a binary unit: 512B, 1.5KiB, 12.0MiB"""
+    if size < 1024:
+        return f"{size:.0f}B"
+    for unit in ["KiB", "MiB"]:
+        size /= 1024
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+    return f"{size / 1024:.1f}GiB"
+
+
+def _percentile(times_sorted: Union[Sequence[int], np.ndarray], p: float) -> int:
+    """Nearest-rank percentile of an already sorted list or array of samples"""
+    rank = max(round(p / 100 * len(times_sorted)) - 1, 0)
+    return int(times_sorted[min(rank, len(times_sorted) - 1)])
+
+
+# Two-sided 95% Student t quantiles for 1 to 30 degrees of freedom
+_T95 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+]  # fmt: skip
+
+
+def _relative_ci(dist: Distribution) -> float:
+    """Half-width of the 95% confidence interval of the mean, relative to the mean"""
+    n = dist.count
+    mean = dist.mean()
+    if n < 2 or mean == 0:
+        return float("inf")
+    t = _T95[n - 2] if n - 1 <= len(_T95) else 1.96
+    return t * dist.stdev() / math.sqrt(n) / mean
+
+
+# Set in every load-generation process, so that all of them start together
+_start_barrier: Any = None
+
+
+def _init_load_process(barrier: Any) -> None:
+    global _start_barrier
+    _start_barrier = barrier
+
+
+def _run_load_process(
+    driver_cls: type,
+    connect_args: Dict[str, Any],
+    settings: Dict[str, Any],
+    queries: List[str],
+    shard: Tuple[int, int],
+    **kwargs,
+) -> BenchmarkResult:
+    """
+    Entry point of a load-generation process: connect a driver of its own and
+    run its share of the closed-loop (concurrency=...) or open-loop (rate=...)
+    load once every process is connected. `shard` is the index of the process
+    and the number of processes.
+    """
+    driver = driver_cls()
+    for name, value in settings.items():
+        setattr(driver, name, value)
+    # Every process unpickles the same parameter generators: sequential ones
+    # are strided so that processes do not send the same values in lockstep.
+    # Random ones draw from the random module, seeded anew in each process.
+    index, count = shard
+    for generator in driver.param_generators.values():
+        generator.stride(index, count)
+    driver.connect(**connect_args)
+
+    try:
+        _start_barrier.wait(timeout=300)
+        if "rate" in kwargs:
+            return driver.run_open_loop(queries, **kwargs)
+        return driver.run_concurrent(queries, **kwargs)
+    finally:
+        driver.close()
 
 
 class AbstractDriver(ABC):
     """Abstract base class for database benchmarking"""
 
+    # Errors raised by a failed query, which fail a --writes workload without
+    # stopping the benchmark
+    query_errors: Tuple[Type[Exception], ...] = (RuntimeError, OSError)
+
     def __init__(self):
         self.connection = None
+        # Arguments given to connect(), replayed by spawn() for extra workers
+        self.connect_args: Dict[str, Any] = {}
+        self.consume_mode = "materialize"
+        # Significant digits of the latency histograms, 0 to keep every sample
+        self.histogram_digits = 0
+        # Bootstrap resamples of the confidence intervals, 0 to skip them
+        self.bootstrap = 1000
+        # Value generators of the $placeholders of query templates, by name
+        self.param_generators: Dict[str, ParamGenerator] = {}
+        self.plan_mode = "warm"
+        self.profile = "warm"
+        # Sampler of the server's resources in sequential runs (--resources)
+        self.resource_sampler: Optional[ResourceSampler] = None
+        self.scenario: Optional[Scenario] = None
+        # Fingerprint every query's result in an untimed run (--validate)
+        self.validate = False
+        # --writes workloads the driver runs: merge-indexed needs an index,
+        # see create_write_index()
+        self.write_workloads = [w for w in WRITE_WORKLOADS if w != "merge-indexed"]
+
+    @abstractmethod
+    def connect(self, *args, **kwargs) -> None:
+        """
+        Establish the connection to the database.
+        Implementations must store their arguments in `self.connect_args`.
+        """
 
     @abstractmethod
-    def execute_query(self, query: str) -> List[Dict[str, Any]]:
+    def execute_query(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Execute a single query and return results as a list of dictionaries.
-        Implement this to handle database-specific query execution.
+        Implement this to handle database-specific query execution, calling
+        timer.first_row() and timer.last_row() as the records arrive.
+        """
+
+    def stream_query(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Execute a single query, iterating over its records without storing or
+        converting them, and return the number of records. Falls back to
+        execute_query unless overridden.
+        """
+        return len(self.execute_query(query, timer, params))
+
+    def discard_query(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """
+        Execute a single query and let the driver discard its records unread.
+        Returns the number of records if known without reading them, else None.
+        Falls back to execute_query unless overridden.
+        """
+        return len(self.execute_query(query, timer, params))
+
+    def fingerprint_query(self, query: str) -> ResultFingerprint:
+        """
+        Execute a single query, folding its records into a ResultFingerprint
+        as they are read, without storing them. By default the records of
+        execute_query are folded once read, and only the variables of the
+        query are recognized as entities.
+        """
+        records = self.execute_query(query)
+        fingerprint = ResultFingerprint(query, list(records[0]) if records else [])
+        for record in records:
+            fingerprint.add(list(record.values()))
+        return fingerprint
+
+    def run_query(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """
+        Execute a query in the configured consume mode and return its row count.
+        Values of the query's $placeholders are drawn from the --params
+        generators unless given.
+        """
+        if params is None:
+            params = draw_params(query, self.param_generators)
+        if self.plan_mode == "cold":
+            query = self.cold_plan_query(query)
+        if self.consume_mode == "stream":
+            return self.stream_query(query, timer, params)
+        if self.consume_mode == "discard":
+            return self.discard_query(query, timer, params)
+        return len(self.execute_query(query, timer, params))
+
+    def cold_plan_query(self, query: str) -> str:
+        """
+        Variant of a query that misses the engine's plan cache, so that it is
+        parsed and planned again. By default the first space of the query is
+        replaced by a random 64-bit salt spelled in spaces and tabs, which
+        changes the cache key without changing the query, across workers,
+        processes and benchmark runs alike; a query without spaces gets it
+        appended. Override this where the engine has an explicit way to bypass
+        its plan cache, or normalizes whitespace before looking it up.
         """
-        pass
+        salt = f" {random.getrandbits(64):b}".replace("0", " ").replace("1", "\t")
+        if " " not in query:
+            return query + salt
+        return query.replace(" ", salt, 1)
+
+    def begin_writes(self) -> None:
+        """Prepare the connection for a write benchmark run"""
+
+    def write_batch(self, statements: List[Statement]) -> None:
+        """
+        Run write statements as one transaction and commit it. By default
+        each statement runs through execute_query in its own transaction:
+        override this where the engine has explicit transactions.
+        """
+        for query, params in statements:
+            self.execute_query(query, params=params)
+
+    def edge_statements(self, rows: List[Dict[str, int]]) -> List[Statement]:
+        """Statements creating a batch of edges between existing nodes"""
+        return [(UNWIND_EDGES, {"rows": rows})]
+
+    def create_write_index(self) -> None:
+        """
+        Index the id property of the written nodes, where the engine has
+        indexes (merge-indexed in `self.write_workloads`)
+        """
+
+    def reset_writes(self) -> None:
+        """Remove what a write benchmark run wrote"""
 
     @abstractmethod
     def close(self) -> None:
@@ -35,28 +588,532 @@ class AbstractDriver(ABC):
         Close the database connection.
         Implement this to handle database-specific cleanup.
         """
-        pass
 
-    def run_queries(self, queries: List[str], runs: int = 1) -> BenchmarkResult:
+    def configure(self, args: argparse.Namespace) -> None:
+        """
+        Apply the client-side settings given on the command line.
+        Override this to read database-specific settings, and settings() to
+        pass them on to spawned workers.
+        """
+        self.consume_mode = args.consume_mode
+        self.histogram_digits = (
+            args.significant_digits if args.latency_store == "histogram" else 0
+        )
+        self.bootstrap = args.bootstrap
+        if args.params and not self.param_generators:
+            self.param_generators = load_param_generators(
+                args.params, self.execute_query
+            )
+
+        self.profile = args.profile
+        if self.profile == "cold":
+            if args.concurrency or args.rate or args.processes > 1:
+                print("--profile cold only measures sequential runs")
+                sys.exit(1)
+            if not getattr(args, "benchmark", None) or not args.dataset:
+                print(
+                    "--profile cold needs --dataset and an engine selected "
+                    "through python -m turingbench"
+                )
+                sys.exit(1)
+
+        if args.scenario and self.scenario is None:
+            self.scenario = load_scenario(args.scenario)
+        elif not args.scenario and not args.query and not args.writes:
+            print("--query-file, --scenario or --writes is required")
+            sys.exit(1)
+
+        if args.writes:
+            if args.concurrency or args.rate or args.processes > 1 or args.use_async:
+                print("--writes only runs sequentially, without --async")
+                sys.exit(1)
+            if args.write_count < 1:
+                print("--write-count must be at least 1")
+                sys.exit(1)
+            unsupported = [w for w in args.writes if w not in self.write_workloads]
+            if unsupported:
+                print(
+                    f"{type(self).__name__} does not support --writes "
+                    f"{' '.join(unsupported)}"
+                )
+                sys.exit(1)
+            if args.write_reset == "restart" and (
+                not getattr(args, "benchmark", None) or not args.dataset
+            ):
+                print(
+                    "--write-reset restart needs --dataset and an engine selected "
+                    "through python -m turingbench"
+                )
+                sys.exit(1)
+
+        if args.resources and self.resource_sampler is None:
+            self.resource_sampler = self._resource_sampler(args)
+
+        self.validate = args.validate
+        if self.validate and (
+            args.concurrency
+            or args.rate
+            or args.processes > 1
+            or args.use_async
+            or self.profile == "cold"
+        ):
+            print("--validate only runs with sequential warm runs, without --async")
+            sys.exit(1)
+
+    def _resource_sampler(self, args: argparse.Namespace) -> ResourceSampler:
+        """Sampler of the resources of the benchmarked server (--resources)"""
+        if args.concurrency or args.rate or args.processes > 1:
+            print("--resources only measures sequential runs")
+            sys.exit(1)
+        if self.profile == "cold":
+            print("--resources is not supported with --profile cold")
+            sys.exit(1)
+
+        engine = getattr(args, "benchmark", None)
+        pid = args.server_pid or (find_server_pid(engine) if engine else None)
+        if pid is None:
+            print("Could not find the server process, use --server-pid")
+            sys.exit(1)
+
+        print(f"Sampling the resources of server process {pid}")
+        return ResourceSampler(pid, args.resource_interval / 1_000)
+
+    def settings(self) -> Dict[str, Any]:
+        """Client-side settings (see configure()) inherited by spawned workers"""
+        return {
+            "consume_mode": self.consume_mode,
+            "histogram_digits": self.histogram_digits,
+            "param_generators": self.param_generators,
+            "plan_mode": self.plan_mode,
+        }
+
+    def new_result(self, **kwargs) -> BenchmarkResult:
+        """Create an empty result recording latencies as configured"""
+        return BenchmarkResult(histogram_digits=self.histogram_digits, **kwargs)
+
+    def variant(self) -> str:
+        """Label of the client-side settings a run is made with, for --samples"""
+        variant = self.consume_mode
+        if self.plan_mode == "cold":
+            variant += "/cold-plan"
+        if self.profile == "cold":
+            variant += "/cold-start"
+        return variant
+
+    def spawn(self, share: bool = True) -> "AbstractDriver":
+        """
+        Create a new driver of the same type for a concurrent worker. With
+        `share`, the worker uses this driver's connection pool if it has one
+        (see share_connection()), otherwise it opens its own connection.
+        """
+        driver = type(self)()
+        for name, value in self.settings().items():
+            setattr(driver, name, value)
+        if not (share and self.share_connection(driver)):
+            driver.connect(**self.connect_args)
+        return driver
+
+    def share_connection(self, worker: "AbstractDriver") -> bool:
+        """
+        Give a worker created by spawn() this driver's connection pool.
+        Returns False when there is no pool to share and the worker must
+        connect on its own, which is the default.
+        """
+        return False
+
+    def run_queries(
+        self,
+        queries: List[str],
+        runs: int = 1,
+        warmup: int = 0,
+        ci_width: Optional[float] = None,
+        time_budget: float = 60.0,
+    ) -> BenchmarkResult:
         """
         Run benchmark queries multiple times and collect timing data.
+        Each query is first run `warmup` times without being recorded.
+        With `ci_width`, a query is run until the 95% confidence interval of its
+        mean is within +/- ci_width of the mean (at least `runs` times), or
+        until `time_budget` seconds are spent on it.
         This method is generic and doesn't need to be overridden.
         """
-        res = BenchmarkResult()
+        res = self.new_result()
 
         for query in queries:
             print(f"Running benchmarks for: {query}")
-            for _ in range(1, runs + 1):
-                query_timer = time.perf_counter_ns()
-                result = self.execute_query(query)
-                elapsed_us = (
-                    time.perf_counter_ns() - query_timer
-                ) // 1_000  # microseconds
+            for _ in range(warmup):
+                self.run_query(query)
+
+            deadline = time.perf_counter() + time_budget
+            done = 0
+            while True:
+                if self.resource_sampler is not None:
+                    self.resource_sampler.start()
+                timer = QueryTimer()
+                row_count = self.run_query(query, timer)
+                elapsed_us = timer.stop()  # microseconds
+
+                res.record(query, elapsed_us, row_count, timer)
+                if self.resource_sampler is not None:
+                    res.resources.setdefault(query, []).append(
+                        self.resource_sampler.stop()
+                    )
+                done += 1
+
+                if ci_width is None:
+                    if done >= runs:
+                        break
+                elif done >= max(runs, 2):
+                    width = _relative_ci(res.distribution(query))
+                    if width <= ci_width:
+                        print(f"Steady state after {done} runs (+/-{width:.1%})")
+                        break
+                    if time.perf_counter() >= deadline:
+                        print(
+                            f"Time budget exhausted after {done} runs (+/-{width:.1%})"
+                        )
+                        break
+
+            # Out of the timed runs, so that hashing the rows costs them nothing
+            if self.validate:
+                if PARAM_PATTERN.search(query):
+                    print("Not validated: parameters are drawn at random")
+                else:
+                    fingerprint = self.fingerprint_query(query)
+                    res.query_fingerprints[query] = (
+                        fingerprint.rows,
+                        fingerprint.hexdigest(),
+                    )
+
+        return res
+
+    def run_cold_start(
+        self, queries: List[str], runs: int, starter: ColdStarter
+    ) -> BenchmarkResult:
+        """
+        Measure the first execution of each query after a server restart:
+        before every run, the server is restarted with its dataset evicted
+        from the page cache, and the query is sent on a new connection.
+        """
+        res = self.new_result()
+
+        for query in queries:
+            print(f"Running cold-start benchmarks for: {query}")
+            for _ in range(runs):
+                starter.restart()
+                worker = self.spawn(share=False)
+                try:
+                    timer = QueryTimer()
+                    row_count = worker.run_query(query, timer)
+                    elapsed_us = timer.stop()
+                finally:
+                    worker.close()
+
+                res.record(query, elapsed_us, row_count, timer)
+                print(f"First query in {_format_us(elapsed_us)}")
+
+        return res
+
+    def run_writes(self, workload: str, batch_size: int, count: int) -> WriteResult:
+        """
+        Write `count` nodes (create, merge, merge-indexed) or edges
+        (unwind-edges) in transactions of `batch_size` writes, timing each
+        batch. The nodes linked by unwind-edges and the index of merge-indexed
+        are created before timing starts; edges are looked up through the
+        index where the engine has one.
+        """
+        result = WriteResult(workload, batch_size)
+        self.begin_writes()
+
+        if workload in ("merge-indexed", "unwind-edges"):
+            self.create_write_index()
+        if workload == "unwind-edges":
+            for ids in batches(count, SETUP_BATCH_SIZE):
+                self.write_batch([(CREATE_NODE, {"id": i}) for i in ids])
+            rows = edge_rows(count, count)
+
+        start_ns = time.perf_counter_ns()
+        for ids in batches(count, batch_size):
+            if workload == "unwind-edges":
+                statements = self.edge_statements(rows[ids.start : ids.stop])
+            else:
+                query = CREATE_NODE if workload == "create" else MERGE_NODE
+                statements = [(query, {"id": i}) for i in ids]
+
+            batch_start_ns = time.perf_counter_ns()
+            self.write_batch(statements)
+            result.batch_times_us.append(
+                (time.perf_counter_ns() - batch_start_ns) // 1_000
+            )
+        result.wall_time_us = (time.perf_counter_ns() - start_ns) // 1_000
+
+        if workload == "unwind-edges":
+            result.edges = count
+        else:
+            result.nodes = count
+        return result
+
+    def warmup_queries(self, queries: List[str], runs: int) -> None:
+        """Run every distinct query `runs` times without recording them"""
+        if runs > 0:
+            print(f"Warming up with {runs} run(s) per query")
+        for query in dict.fromkeys(queries):
+            for _ in range(runs):
+                self.run_query(query)
+
+    @staticmethod
+    def _worker_loop(
+        driver: "AbstractDriver",
+        queries: List[str],
+        offset: int,
+        passes: int,
+        deadline: Optional[float],
+    ) -> BenchmarkResult:
+        """
+        Closed-loop worker: loop over the queries (starting at `offset` so that
+        workers do not all hit the same query at once) until the deadline is
+        reached or `passes` passes over the query file are done.
+        """
+        res = driver.new_result()
+        done = 0
+
+        if not queries:
+            return res
+
+        while deadline is not None or done < passes:
+            for i in range(len(queries)):
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return res
+
+                query = queries[(offset + i) % len(queries)]
+                timer = QueryTimer()
+                row_count = driver.run_query(query, timer)
+                res.record(query, timer.stop(), row_count, timer)
+            done += 1
+
+        return res
+
+    def run_concurrent(
+        self,
+        queries: List[str],
+        concurrency: int,
+        runs: int = 1,
+        duration: Optional[float] = None,
+    ) -> BenchmarkResult:
+        """
+        Run the queries from `concurrency` worker threads at once, each with its
+        own connection. Workers loop over the query file for `duration` seconds,
+        or `runs` times if no duration is given.
+        """
+        workers = [self.spawn() for _ in range(concurrency)]
+        res = self.new_result(concurrency=concurrency)
+
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                start = time.perf_counter_ns()
+                deadline = (
+                    time.perf_counter() + duration if duration is not None else None
+                )
+                futures = [
+                    pool.submit(
+                        self._worker_loop,
+                        worker,
+                        queries,
+                        i * len(queries) // concurrency,
+                        runs,
+                        deadline,
+                    )
+                    for i, worker in enumerate(workers)
+                ]
+                for future in futures:
+                    res.merge(future.result())
+                res.wall_time_us = (time.perf_counter_ns() - start) // 1_000
+        finally:
+            for worker in workers:
+                worker.close()
+
+        return res
+
+    @staticmethod
+    def _arrival_schedule(
+        queries: List[str],
+        rate: float,
+        arrival: str,
+        start_ns: int,
+        count: Optional[int],
+        end_ns: Optional[int],
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (intended send time, query) pairs at `rate` queries/sec, with
+        either evenly spaced ("uniform") or exponential ("poisson") gaps.
+        Stops after `count` queries or once the end time is reached.
+        """
+        rng = random.Random()
+        intended_ns = start_ns
+        i = 0
+
+        while count is None or i < count:
+            if arrival == "poisson":
+                intended_ns += int(rng.expovariate(rate) * 1_000_000_000)
+            else:
+                intended_ns += int(1_000_000_000 / rate)
+
+            if end_ns is not None and intended_ns >= end_ns:
+                return
+
+            yield intended_ns, queries[i % len(queries)]
+            i += 1
+
+    @staticmethod
+    def _open_loop_worker(
+        driver: "AbstractDriver",
+        schedule: Iterator[Tuple[int, str]],
+        lock: threading.Lock,
+    ) -> BenchmarkResult:
+        """
+        Open-loop worker: take the next slot of the shared schedule, wait for
+        its intended send time and run it. Latency is measured from the
+        intended send time, so time spent waiting for a free worker behind a
+        slow query is counted instead of silently omitted.
+        """
+        res = driver.new_result()
+
+        while True:
+            with lock:
+                slot = next(schedule, None)
+            if slot is None:
+                return res
+
+            intended_ns, query = slot
+            delay_ns = intended_ns - time.perf_counter_ns()
+            if delay_ns > 0:
+                time.sleep(delay_ns / 1_000_000_000)
+
+            timer = QueryTimer()
+            send_lag_us = (timer.start_ns - intended_ns) // 1_000
+            res.max_send_lag_us = max(res.max_send_lag_us, send_lag_us)
+
+            row_count = driver.run_query(query, timer)
+            timer.stop()
+            elapsed_us = (timer.end_ns - intended_ns) // 1_000
+            res.record(query, elapsed_us, row_count, timer)
+
+    def run_open_loop(
+        self,
+        queries: List[str],
+        rate: float,
+        arrival: str = "poisson",
+        max_inflight: int = 32,
+        runs: int = 1,
+        duration: Optional[float] = None,
+    ) -> BenchmarkResult:
+        """
+        Issue the queries on a fixed schedule of `rate` queries/sec, regardless
+        of how long earlier queries take, using up to `max_inflight` worker
+        connections. Runs for `duration` seconds, or `runs` passes over the
+        query file if no duration is given.
+        """
+        workers = [self.spawn() for _ in range(max_inflight)]
+        res = self.new_result(concurrency=max_inflight, target_rate=rate)
+        lock = threading.Lock()
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_inflight) as pool:
+                start = time.perf_counter_ns()
+                schedule = self._arrival_schedule(
+                    queries,
+                    rate,
+                    arrival,
+                    start,
+                    runs * len(queries) if duration is None else None,
+                    start + int(duration * 1_000_000_000)
+                    if duration is not None
+                    else None,
+                )
+                futures = [
+                    pool.submit(self._open_loop_worker, worker, schedule, lock)
+                    for worker in workers
+                ]
+                for future in futures:
+                    res.merge(future.result())
+                res.wall_time_us = (time.perf_counter_ns() - start) // 1_000
+        finally:
+            for worker in workers:
+                worker.close()
+
+        return res
+
+    def run_multiprocess(
+        self,
+        queries: List[str],
+        processes: int,
+        concurrency: int = 1,
+        rate: Optional[float] = None,
+        arrival: str = "poisson",
+        max_inflight: int = 32,
+        runs: int = 1,
+        duration: Optional[float] = None,
+    ) -> BenchmarkResult:
+        """
+        Shard the load over several processes, each with its own drivers, so
+        that result decoding is not serialized by the GIL of a single
+        interpreter. The worker count (or the arrival rate and in-flight limit)
+        is split evenly between processes, and their latency samples are
+        merged into one result.
+        """
+
+        def share(total: int, i: int) -> int:
+            return total // processes + (1 if i < total % processes else 0)
 
-                res.query_times.setdefault(query, []).append(elapsed_us)
+        shards: List[Dict[str, Any]] = []
+        for i in range(processes):
+            if rate is not None:
+                shards.append(
+                    {
+                        "rate": rate / processes,
+                        "arrival": arrival,
+                        "max_inflight": max(share(max_inflight, i), 1),
+                        "runs": runs,
+                        "duration": duration,
+                    }
+                )
+            elif share(concurrency, i) > 0:
+                shards.append(
+                    {
+                        "concurrency": share(concurrency, i),
+                        "runs": runs,
+                        "duration": duration,
+                    }
+                )
 
-                if query not in res.query_sizes:
-                    res.query_sizes[query] = len(result)
+        # Spawn fresh interpreters rather than forking a process holding open
+        # connections; every process connects its own drivers
+        context = multiprocessing.get_context("spawn")
+        res = self.new_result(concurrency=0, target_rate=rate or 0.0)
+
+        with ProcessPoolExecutor(
+            max_workers=len(shards),
+            mp_context=context,
+            initializer=_init_load_process,
+            initargs=(context.Barrier(len(shards)),),
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _run_load_process,
+                    type(self),
+                    self.connect_args,
+                    self.settings(),
+                    queries,
+                    (i, len(shards)),
+                    **shard,
+                )
+                for i, shard in enumerate(shards)
+            ]
+            for future in futures:
+                shard_res = future.result()
+                res.merge(shard_res)
+                res.concurrency += shard_res.concurrency
+                res.wall_time_us = max(res.wall_time_us, shard_res.wall_time_us)
 
         return res
 
@@ -66,39 +1123,342 @@ class AbstractDriver(ABC):
         This method is generic and doesn't need to be overridden.
         """
         table = []
-        headers = ["Query", "Mean", "Min", "Max", "Median", "Query/sec", "Row count"]
-
-        for query, times in results.query_times.items():
-            times_sorted = sorted(times)
-            n = runs
-            sum_ = sum(times_sorted)
-            mean = sum_ // n
-            min_ = times_sorted[0]
-            max_ = times_sorted[-1]
-            median = (
-                (times_sorted[n // 2 - 1] + times_sorted[n // 2]) // 2
-                if (n % 2 == 0)
-                else times_sorted[n // 2]
+        headers = [
+            "Query",
+            "Mean",
+            "Min",
+            "Max",
+            "Median",
+            "p90",
+            "p99",
+            "p99.9",
+            "Std",
+            "CV",
+            "Mean CI",
+            "Median CI",
+            "Query/sec",
+            "Row count",
+            "First row",
+            "Fetch",
+            "Materialize",
+        ]
+
+        for query in results.queries():
+            dist = results.distribution(query)
+
+            table.append(
+                [
+                    query,
+                    _format_us(dist.mean()),
+                    _format_us(dist.min),
+                    _format_us(dist.max),
+                    _format_us(dist.median()),
+                    _format_us(dist.percentile(90)),
+                    _format_us(dist.percentile(99)),
+                    _format_us(dist.percentile(99.9)),
+                    _format_us(dist.stdev()),
+                    f"{dist.stdev() / dist.mean():.1%}" if dist.mean() else "-",
+                    *self._confidence_intervals(dist),
+                    # n / total_seconds, none for runs all faster than 1µs
+                    f"{dist.count / (dist.total / 1_000_000):.6f}"
+                    if dist.total
+                    else "-",
+                    f"{results.query_sizes.get(query, '?')}",
+                    *self._phase_means(results, query),
+                ]
+            )
+
+        print(tabulate(table, headers=headers, tablefmt="grid"))
+
+        if results.resources:
+            print("Server resources (average per run)")
+            self.present_resources(results)
+        if results.query_fingerprints:
+            print("Result fingerprints")
+            self.present_fingerprints(results)
+        if self.scenario is not None:
+            self.present_scenario_results(results, self.scenario)
+
+    def present_scenario_results(
+        self, results: BenchmarkResult, scenario: Scenario
+    ) -> None:
+        """
+        Present the latency of each query class of a scenario, and their
+        throughput under load
+        """
+        wall_s = results.wall_time_us / 1_000_000
+        total = results.distribution().count
+        total_weight = sum(c.weight for c in scenario.classes)
+
+        headers = ["Class", "Weight", "Count", "Share", "Mean", "p50", "p90", "p99"]
+        headers += ["Max", "Queries/sec"]
+        table = []
+        for query_class in scenario.classes:
+            dist = results.distribution(queries=query_class.queries)
+            if not dist.count:
+                continue
+            table.append(
+                [
+                    query_class.name,
+                    f"{query_class.weight / total_weight:.1%}",
+                    dist.count,
+                    f"{dist.count / total:.1%}",
+                    _format_us(dist.mean()),
+                    _format_us(dist.percentile(50)),
+                    _format_us(dist.percentile(90)),
+                    _format_us(dist.percentile(99)),
+                    _format_us(dist.max),
+                    f"{dist.count / wall_s:.3f}" if wall_s > 0 else "-",
+                ]
+            )
+
+        print("Scenario classes")
+        print(tabulate(table, headers=headers, tablefmt="grid"))
+
+    def present_fingerprints(self, results: BenchmarkResult) -> None:
+        """
+        Present the fingerprint of each query's result (--validate), which
+        report_summary/parse_raw_benchmark.py compares across engines
+        """
+        table = [
+            [query, rows, fingerprint]
+            for query, (rows, fingerprint) in results.query_fingerprints.items()
+        ]
+        headers = ["Query", "Rows", "Fingerprint"]
+        print(tabulate(table, headers=headers, tablefmt="grid"))
+
+    def present_resources(self, results: BenchmarkResult) -> None:
+        """Present the server resources used by each query, averaged over its runs"""
+        headers = [
+            "Query",
+            "Peak RSS delta",
+            "CPU",
+            f"User CPU ({1000 // CLOCK_TICKS}ms ticks)",
+            f"System CPU ({1000 // CLOCK_TICKS}ms ticks)",
+            "Read",
+            "Written",
+            "Active threads",
+        ]
+        table = []
+
+        for query, usages in results.resources.items():
+            average: Dict[str, Optional[float]] = {}
+            for name in RESOURCE_COLUMNS:
+                values = [getattr(usage, name) for usage in usages]
+                average[name] = None if None in values else sum(values) / len(values)
+
+            cpu_us = average["cpu_us"]
+            read_bytes = average["read_bytes"]
+            write_bytes = average["write_bytes"]
+            table.append(
+                [
+                    query,
+                    _format_bytes(average["rss_peak_delta_bytes"] or 0),
+                    "-" if cpu_us is None else _format_us(cpu_us),
+                    _format_us(average["user_cpu_us"] or 0),
+                    _format_us(average["system_cpu_us"] or 0),
+                    "-" if read_bytes is None else _format_bytes(read_bytes),
+                    "-" if write_bytes is None else _format_bytes(write_bytes),
+                    f"{average['active_threads'] or 0:.1f}",
+                ]
             )
-            throughput = n / (sum_ / 1_000_000)  # n / total_seconds
 
-            def ms(us):
-                return f"{us // 1_000}ms"
+        print(tabulate(table, headers=headers, tablefmt="grid"))
+
+    def _confidence_intervals(self, dist: Distribution) -> List[str]:
+        """Bootstrap 95% confidence intervals of the mean and the median"""
+        if not self.bootstrap or dist.count < 2:
+            return ["-", "-"]
+
+        values, counts = dist.weighted()
+        intervals = bootstrap_intervals(
+            np.asarray(values, dtype=np.float64),
+            np.asarray(counts),
+            resamples=self.bootstrap,
+        )
+        return [f"[{_format_us(low)}, {_format_us(high)}]" for low, high in intervals]
+
+    @staticmethod
+    def _phase_means(results: BenchmarkResult, query: str) -> List[str]:
+        """Mean duration of each client-side phase of a query"""
+        dists = [results.distribution(query, phase) for phase in PHASES]
+        return [_format_us(dist.mean()) if dist.count else "-" for dist in dists]
+
+    def present_comparison(
+        self,
+        comparison: Dict[str, List[BenchmarkResult]],
+        levels: Optional[List[float]] = None,
+        level_name: str = "Workers",
+    ) -> None:
+        """
+        Present the results of several variants of the same benchmark side by
+        side: the mean latency of each query for sequential runs, or the
+        throughput and p99 latency of each load level.
+        """
+        labels = list(comparison)
+
+        if levels is None:
+            headers = ["Query", *(f"Mean ({label})" for label in labels)]
+            queries = comparison[labels[0]][0].queries()
+            table = [
+                [
+                    query,
+                    *(
+                        _format_us(dist.mean())
+                        if (dist := comparison[label][0].distribution(query)).count
+                        else "-"
+                        for label in labels
+                    ),
+                ]
+                for query in queries
+            ]
+        else:
+            headers = [level_name]
+            for label in labels:
+                headers += [f"Queries/sec ({label})", f"p99 ({label})"]
+            table = []
+            for i, level in enumerate(levels):
+                row: List[Any] = [level]
+                for label in labels:
+                    results = comparison[label][i]
+                    dist = results.distribution()
+                    wall_s = results.wall_time_us / 1_000_000
+                    row += [
+                        f"{dist.count / wall_s if wall_s > 0 else 0.0:.3f}",
+                        _format_us(dist.percentile(99)) if dist.count else "-",
+                    ]
+                table.append(row)
+
+        print(tabulate(table, headers=headers, tablefmt="grid"))
+
+    def present_plan_split(
+        self,
+        cold: List[BenchmarkResult],
+        warm: List[BenchmarkResult],
+        levels: Optional[List[float]] = None,
+        level_name: str = "Workers",
+    ) -> None:
+        """
+        Present the mean latency of each query with its plan cached (warm) or
+        compiled on every run (cold), and their difference: the time spent
+        parsing and planning the query
+        """
+        headers = ["Query", "Cold plan", "Warm plan", "Planning", "Share"]
+        if levels is not None:
+            headers.insert(0, level_name)
+
+        table = []
+        for i, (cold_results, warm_results) in enumerate(zip(cold, warm)):
+            for query in warm_results.queries():
+                cold_dist = cold_results.distribution(query)
+                warm_dist = warm_results.distribution(query)
+                if not (cold_dist.count and warm_dist.count):
+                    continue
+                planning = cold_dist.mean() - warm_dist.mean()
+                row = [
+                    query,
+                    _format_us(cold_dist.mean()),
+                    _format_us(warm_dist.mean()),
+                    f"{'-' if planning < 0 else ''}{_format_us(abs(planning))}",
+                    f"{planning / cold_dist.mean():.1%}" if cold_dist.mean() else "-",
+                ]
+                if levels is not None:
+                    row.insert(0, levels[i])
+                table.append(row)
+
+        print(tabulate(table, headers=headers, tablefmt="grid"))
+
+    def present_load_results(self, results: BenchmarkResult) -> None:
+        """
+        Present the results of a concurrent run: per-query latency under load
+        and the aggregate throughput of all workers.
+        """
+        table = []
+        headers = [
+            "Query",
+            "Count",
+            "Mean",
+            "p50",
+            "p90",
+            "p99",
+            "p99.9",
+            "Max",
+            "Row count",
+        ]
 
+        for query in results.queries():
+            dist = results.distribution(query)
             table.append(
                 [
                     query,
-                    ms(mean),
-                    ms(min_),
-                    ms(max_),
-                    ms(median),
-                    f"{throughput:.6f}",
+                    dist.count,
+                    _format_us(dist.mean()),
+                    *(_format_us(dist.percentile(p)) for p in (50, 90, 99, 99.9)),
+                    _format_us(dist.max),
                     f"{results.query_sizes.get(query, '?')}",
                 ]
             )
 
         print(tabulate(table, headers=headers, tablefmt="grid"))
 
+        total = results.distribution().count
+        wall_s = results.wall_time_us / 1_000_000
+        throughput = total / wall_s if wall_s > 0 else 0.0
+        print(
+            f"Workers: {results.concurrency} | Queries: {total} | "
+            f"Wall time: {wall_s:.3f}s | Throughput: {throughput:.3f} queries/sec"
+        )
+        if results.target_rate:
+            print(
+                f"Target rate: {results.target_rate:.3f} queries/sec | "
+                f"Max send lag: {_format_us(results.max_send_lag_us)}"
+            )
+        if self.scenario is not None:
+            self.present_scenario_results(results, self.scenario)
+
+    def present_write_results(self, results: List[WriteResult]) -> None:
+        """Present the throughput of each write workload and batch size"""
+        table = []
+        headers = [
+            "Workload",
+            "Batch size",
+            "Batches",
+            "Nodes",
+            "Edges",
+            "Wall time",
+            "Nodes/sec",
+            "Edges/sec",
+            "Batch mean",
+            "Batch p99",
+        ]
+
+        for result in results:
+            if result.error is not None:
+                table.append(
+                    [result.workload, result.batch_size, "failed"]
+                    + ["-"] * (len(headers) - 3)
+                )
+                continue
+
+            wall_s = result.wall_time_us / 1_000_000
+            times = sorted(result.batch_times_us)
+            table.append(
+                [
+                    result.workload,
+                    result.batch_size,
+                    len(times),
+                    result.nodes,
+                    result.edges,
+                    f"{wall_s:.3f}s",
+                    f"{result.nodes / wall_s:.1f}" if result.nodes else "-",
+                    f"{result.edges / wall_s:.1f}" if result.edges else "-",
+                    _format_us(sum(times) / len(times)),
+                    _format_us(_percentile(times, 99)),
+                ]
+            )
+
+        print(tabulate(table, headers=headers, tablefmt="grid"))
+
     # DB-specific arguments (e.g. Neo4j password, etc.)
     @classmethod
     def add_db_arguments(cls, parser: argparse.ArgumentParser) -> None:
@@ -106,7 +1466,6 @@ class AbstractDriver(ABC):
         Add database-specific arguments to the argument parser.
         Override this to add custom arguments for your database.
         """
-        pass
 
     # No matter which database we are testing, all the drivers need these args
     @staticmethod
@@ -115,10 +1474,18 @@ class AbstractDriver(ABC):
         parser.add_argument(
             "--query-file",
             "-q",
-            required=True,
+            default=None,
             dest="query",
             help="The query file to run against the database",
         )
+        parser.add_argument(
+            "--scenario",
+            default=None,
+            metavar="FILE",
+            help="JSON file of weighted query classes to run instead of "
+            "--query-file: load modes loop over a mix of the classes in "
+            "proportion to their weights, and report each class's latency",
+        )
         parser.add_argument(
             "--debug",
             "-d",
@@ -128,6 +1495,228 @@ class AbstractDriver(ABC):
         parser.add_argument(
             "--runs", "-r", type=int, default=1, help="The number of runs per benchmark"
         )
+        parser.add_argument(
+            "--params",
+            default=None,
+            metavar="FILE",
+            help="JSON file of value generators for the $placeholders of the "
+            "queries, which are then run as parameterized query templates",
+        )
+        parser.add_argument(
+            "--samples",
+            default=None,
+            metavar="FILE",
+            help="Append every raw sample (query, run, timestamp, latency and "
+            "phases) to this gzip-compressed CSV file, e.g. samples.csv.gz",
+        )
+        parser.add_argument(
+            "--latency-store",
+            choices=LATENCY_STORES,
+            default="samples",
+            help="Keep every latency sample, or count them in fixed-memory "
+            "histograms for long or highly concurrent runs (default: samples)",
+        )
+        parser.add_argument(
+            "--significant-digits",
+            type=int,
+            choices=range(1, 6),
+            default=2,
+            metavar="{1..5}",
+            help="Precision of --latency-store histogram, in significant decimal "
+            "digits (default: 2, i.e. within 1%%)",
+        )
+        parser.add_argument(
+            "--bootstrap",
+            type=int,
+            default=1000,
+            metavar="N",
+            help="Number of bootstrap resamples of the 95%% confidence intervals "
+            "of each query's mean and median, 0 to skip them (default: 1000)",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=0,
+            help="Number of unrecorded runs of each query before measuring, to "
+            "warm up JIT compilation, caches and query plans (default: 0)",
+        )
+        parser.add_argument(
+            "--ci-width",
+            type=float,
+            default=None,
+            help="Adaptive mode: run each query until the 95%% confidence interval "
+            "of its mean is within +/- this fraction of the mean (e.g. 0.05), "
+            "with --runs as the minimum number of runs",
+        )
+        parser.add_argument(
+            "--time-budget",
+            type=float,
+            default=60.0,
+            help="Maximum number of seconds spent on each query in --ci-width mode "
+            "(default: 60)",
+        )
+        parser.add_argument(
+            "--consume-mode",
+            choices=CONSUME_MODES,
+            default="materialize",
+            help="How results are consumed: build Python dicts (materialize), "
+            "iterate and count records without storing them (stream), or let the "
+            "driver drop them unread (discard) (default: materialize)",
+        )
+        parser.add_argument(
+            "--profile",
+            choices=PROFILES,
+            default="warm",
+            help="Measure queries on the running server (warm), or restart the "
+            "server through scripts/manage_servers.py and evict the dataset from "
+            "the page cache before every run, timing the first query (cold) "
+            "(default: warm)",
+        )
+        parser.add_argument(
+            "--dataset",
+            default=None,
+            help="Dataset of --profile cold, whose dumps/<dataset>.* files are "
+            "evicted from the page cache and loaded by the restarted server",
+        )
+        parser.add_argument(
+            "--server-args",
+            default=None,
+            help="Arguments of the server restarted by --profile cold (default: "
+            "load --dataset as run.sh does)",
+        )
+        parser.add_argument(
+            "--resources",
+            action="store_true",
+            help="Sample the server process in /proc while each query runs, and "
+            "report its peak memory growth, user and system CPU time, storage "
+            "I/O and active threads per query (sequential runs only, Linux)",
+        )
+        parser.add_argument(
+            "--resource-interval",
+            type=float,
+            default=5.0,
+            help="Memory polling interval of --resources, in milliseconds (default: 5)",
+        )
+        parser.add_argument(
+            "--server-pid",
+            type=int,
+            default=None,
+            help="PID of the server process sampled by --resources (default: "
+            "found from scripts/.cache or the running processes)",
+        )
+        parser.add_argument(
+            "--validate",
+            action="store_true",
+            help="Run each query once more after its timed runs, hashing its rows "
+            "into an order-insensitive fingerprint compared across engines by "
+            "the report (sequential runs only)",
+        )
+        parser.add_argument(
+            "--plan-mode",
+            choices=PLAN_MODES,
+            nargs="+",
+            default=["warm"],
+            help="Let queries reuse their cached plan (warm), or make every run "
+            "miss the plan cache so that it is parsed and planned again (cold). "
+            "Giving both reports the planning time of each query (default: warm)",
+        )
+        parser.add_argument(
+            "--writes",
+            choices=WRITE_WORKLOADS,
+            nargs="+",
+            default=None,
+            metavar="WORKLOAD",
+            help="Run write workloads instead of queries: single-node CREATE "
+            "(create), MERGE without and with an index on the merged property "
+            "(merge, merge-indexed) and batched UNWIND edge creation "
+            f"(unwind-edges). Choices: {', '.join(WRITE_WORKLOADS)}",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            nargs="+",
+            default=[1, 10, 100, 1000],
+            metavar="N",
+            help="Writes per transaction of --writes, several sizes being swept "
+            "(default: 1 10 100 1000)",
+        )
+        parser.add_argument(
+            "--write-count",
+            type=int,
+            default=10000,
+            help="Nodes or edges written by each --writes run (default: 10000)",
+        )
+        parser.add_argument(
+            "--write-reset",
+            choices=WRITE_RESETS,
+            default="delete",
+            help="Reset state after each --writes run by deleting what it wrote "
+            "(delete), or by also restarting the server through "
+            "scripts/manage_servers.py with --dataset (restart) (default: delete)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            "-c",
+            type=int,
+            nargs="+",
+            default=None,
+            metavar="N",
+            help="Run the queries from N concurrent workers, each with its own "
+            "connection. Several worker counts can be given to compare them",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=None,
+            help="With --concurrency or --rate, run each load level for this many "
+            "seconds instead of --runs passes over the query file",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            nargs="+",
+            default=None,
+            metavar="QPS",
+            help="Open-loop mode: issue queries at a fixed rate of QPS queries/sec "
+            "whatever the response times, and measure latency from the intended "
+            "send time. Several rates can be given to compare them",
+        )
+        parser.add_argument(
+            "--arrival",
+            choices=["poisson", "uniform"],
+            default="poisson",
+            help="Inter-arrival distribution for --rate (default: poisson)",
+        )
+        parser.add_argument(
+            "--max-inflight",
+            type=int,
+            default=32,
+            help="Number of worker connections available to --rate, i.e. the "
+            "maximum number of queries in flight (default: 32)",
+        )
+        parser.add_argument(
+            "--processes",
+            "-P",
+            type=int,
+            default=1,
+            help="Shard the --concurrency workers or --rate load over this many "
+            "processes, so that decoding results is not bound to one Python core. "
+            "With --rate and no --duration, each process runs --runs passes "
+            "(default: 1)",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="use_async",
+            help="Use the asyncio driver: --concurrency and --rate workers become "
+            "tasks sharing one connection pool instead of one thread each",
+        )
+        parser.add_argument(
+            "--pool-size",
+            type=int,
+            default=100,
+            help="Connection pool size of the database driver (default: 100)",
+        )
 
     # Combines derived db-specific and common arguments into a single argparser
     @classmethod
@@ -143,11 +1732,216 @@ class AbstractDriver(ABC):
         cls.add_db_arguments(parser)
         return parser
 
-    def run_benchmark(self, queries: List[str], runs: int) -> None:
+    def run_load_benchmark(
+        self, queries: List[str], args: argparse.Namespace
+    ) -> List[BenchmarkResult]:
+        """
+        Run the queries once per requested load level (worker count for
+        --concurrency, arrival rate for --rate) and compare them
+        """
+        summary = []
+        all_results = []
+        self.warmup_queries(queries, args.warmup)
+        levels = args.rate if args.rate else args.concurrency
+
+        for level in levels:
+            if args.processes > 1:
+                print(
+                    f"Running {'open-loop' if args.rate else 'load'} benchmark at "
+                    f"{level} {'queries/sec' if args.rate else 'worker(s)'} "
+                    f"over {args.processes} processes"
+                )
+                results = self.run_multiprocess(
+                    queries,
+                    args.processes,
+                    concurrency=1 if args.rate else level,
+                    rate=level if args.rate else None,
+                    arrival=args.arrival,
+                    max_inflight=args.max_inflight,
+                    runs=args.runs,
+                    duration=args.duration,
+                )
+            elif args.rate:
+                print(f"Running open-loop benchmark at {level} queries/sec")
+                results = self.run_open_loop(
+                    queries,
+                    level,
+                    args.arrival,
+                    args.max_inflight,
+                    args.runs,
+                    args.duration,
+                )
+            else:
+                print(f"Running load benchmark with {level} worker(s)")
+                results = self.run_concurrent(queries, level, args.runs, args.duration)
+            self.present_load_results(results)
+            all_results.append(results)
+
+            dist = results.distribution()
+            wall_s = results.wall_time_us / 1_000_000
+            summary.append(
+                [
+                    level,
+                    dist.count,
+                    f"{wall_s:.3f}s",
+                    f"{dist.count / wall_s if wall_s > 0 else 0.0:.3f}",
+                    _format_us(dist.mean()) if dist.count else "-",
+                    _format_us(dist.percentile(99)) if dist.count else "-",
+                ]
+            )
+
+        print("Load benchmark completed")
+        headers = [
+            "Target rate" if args.rate else "Workers",
+            "Queries",
+            "Wall time",
+            "Queries/sec",
+            "Mean latency",
+            "p99 latency",
+        ]
+        print(tabulate(summary, headers=headers, tablefmt="grid"))
+        return all_results
+
+    def run_write_benchmark(self, args: argparse.Namespace) -> List[WriteResult]:
+        """
+        Run every --writes workload at every --batch-size, resetting the
+        database after each run, and report nodes/sec and edges/sec
         """
-        Main benchmark orchestration method.
+        self.configure(args)
+        starter = (
+            ColdStarter(args.benchmark, args.dataset, args.server_args)
+            if args.write_reset == "restart"
+            else None
+        )
+
+        results = []
+        for workload in args.writes:
+            for batch_size in args.batch_size:
+                print(
+                    f"Running write benchmark {workload}: {args.write_count} "
+                    f"writes in batches of {batch_size}"
+                )
+                worker: AbstractDriver = self
+                if starter is not None:
+                    starter.restart(drop_cache=False)
+                    worker = self.spawn(share=False)
+
+                try:
+                    result = worker.run_writes(workload, batch_size, args.write_count)
+                except worker.query_errors as e:
+                    print(f"{workload} failed: {e}")
+                    result = WriteResult(workload, batch_size, error=str(e))
+                finally:
+                    worker.reset_writes()
+                    if worker is not self:
+                        worker.close()
+                results.append(result)
+
+        print("Write benchmark completed")
+        self.present_write_results(results)
+        return results
+
+    def run_benchmark(
+        self, queries: List[str], args: argparse.Namespace
+    ) -> List[BenchmarkResult]:
+        """
+        Main benchmark orchestration method, run once per --plan-mode.
         This method is generic and doesn't need to be overridden.
+        Returns the results of each load level, or of the sequential run, in
+        the last plan mode.
         """
-        results = self.run_queries(queries, runs)
-        print("Benchmark completed")
-        self.present_results(results, runs)
+        self.configure(args)
+        return self.run_plan_modes(queries, args)
+
+    def run_plan_modes(
+        self, queries: List[str], args: argparse.Namespace
+    ) -> List[BenchmarkResult]:
+        """Run and compare the benchmark in every --plan-mode, once configured"""
+        if args.processes > 1 and not (args.concurrency or args.rate):
+            args.concurrency = [args.processes]
+
+        # Load workers loop over the weighted mix of the scenario, sequential
+        # runs measure each of its queries in isolation
+        if self.scenario is not None:
+            if args.concurrency or args.rate:
+                queries = self.scenario.mix
+            else:
+                queries = self.scenario.queries()
+
+        # Load workers loop over the queries, so they need at least one
+        if (args.concurrency or args.rate) and not queries:
+            print("--concurrency, --rate and --processes need at least one query")
+            sys.exit(1)
+
+        by_plan_mode = {}
+        for plan_mode in args.plan_mode:
+            if len(args.plan_mode) > 1:
+                print(f"Plan mode: {plan_mode}")
+            self.plan_mode = plan_mode
+            by_plan_mode[plan_mode] = self.run_plan_mode(queries, args)
+
+        if "cold" in by_plan_mode and "warm" in by_plan_mode:
+            print("Plan compilation (cold - warm plan mean latency)")
+            self.present_plan_split(
+                by_plan_mode["cold"],
+                by_plan_mode["warm"],
+                args.rate or args.concurrency or None,
+                "Target rate" if args.rate else "Workers",
+            )
+
+        return by_plan_mode[args.plan_mode[-1]]
+
+    def run_plan_mode(
+        self, queries: List[str], args: argparse.Namespace
+    ) -> List[BenchmarkResult]:
+        """Run and present the benchmark in the current plan mode"""
+        if args.concurrency or args.rate:
+            all_results = self.run_load_benchmark(queries, args)
+        elif self.profile == "cold":
+            starter = ColdStarter(args.benchmark, args.dataset, args.server_args)
+            results = self.run_cold_start(queries, args.runs, starter)
+            print("Benchmark completed")
+            self.present_results(results, args.runs)
+            all_results = [results]
+        else:
+            results = self.run_queries(
+                queries, args.runs, args.warmup, args.ci_width, args.time_budget
+            )
+            print("Benchmark completed")
+            self.present_results(results, args.runs)
+            all_results = [results]
+
+        if args.samples and self.histogram_digits:
+            print("Raw samples are not kept with --latency-store histogram")
+        elif args.samples:
+            self.save_samples(
+                args.samples,
+                getattr(args, "benchmark", None) or type(self).__name__,
+                all_results,
+                args.rate or args.concurrency or [""],
+            )
+
+        return all_results
+
+    def save_samples(
+        self,
+        path: str,
+        engine: str,
+        all_results: List[BenchmarkResult],
+        levels: Sequence[Any],
+    ) -> None:
+        """
+        Append the raw samples of each load level to a gzip-compressed CSV
+        file, writing the header if the file is new. Appending makes a
+        multi-member gzip file, which gzip readers decompress as one stream.
+        """
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+
+        with gzip.open(path, "at", newline="") as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(SAMPLE_COLUMNS)
+            for level, results in zip(levels, all_results):
+                results.write_samples(writer, engine, self.variant(), level)
+
+        print(f"Raw samples written to {path}")
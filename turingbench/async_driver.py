@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+
+import asyncio
+import time
+from abc import abstractmethod
+from typing import Any, Dict, List, Optional, Set
+
+from .abstract_driver import AbstractDriver, BenchmarkResult, QueryTimer
+from .params import draw_params
+
+
+class AbstractAsyncDriver(AbstractDriver):
+    """
+    Base class for asyncio drivers.
+
+    Concurrent and open-loop runs are served by tasks on a single event loop
+    sharing the driver's connection pool, instead of one thread and one
+    connection per worker, so thousands of queries can be in flight from a
+    single client process. Sequential runs go through the synchronous
+    wrappers and behave like the other drivers.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.loop = asyncio.new_event_loop()
+
+    @abstractmethod
+    async def connect_async(self, *args, **kwargs) -> None:
+        """Establish the connection pool to the database"""
+
+    @abstractmethod
+    async def execute_query_async(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a single query and return results as a list of dictionaries,
+        calling timer.first_row() and timer.last_row() as the records arrive
+        """
+
+    async def stream_query_async(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """See AbstractDriver.stream_query"""
+        return len(await self.execute_query_async(query, timer, params))
+
+    async def discard_query_async(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """See AbstractDriver.discard_query"""
+        return len(await self.execute_query_async(query, timer, params))
+
+    async def run_query_async(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """See AbstractDriver.run_query"""
+        if params is None:
+            params = draw_params(query, self.param_generators)
+        if self.plan_mode == "cold":
+            query = self.cold_plan_query(query)
+        if self.consume_mode == "stream":
+            return await self.stream_query_async(query, timer, params)
+        if self.consume_mode == "discard":
+            return await self.discard_query_async(query, timer, params)
+        return len(await self.execute_query_async(query, timer, params))
+
+    @abstractmethod
+    async def close_async(self) -> None:
+        """Close the connection pool"""
+
+    def connect(self, **kwargs) -> None:
+        self.connect_args = kwargs
+        self.loop.run_until_complete(self.connect_async(**kwargs))
+
+    def execute_query(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        return self.loop.run_until_complete(
+            self.execute_query_async(query, timer, params)
+        )
+
+    def run_query(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        return self.loop.run_until_complete(self.run_query_async(query, timer, params))
+
+    def close(self) -> None:
+        if self.loop.is_closed():
+            return
+        self.loop.run_until_complete(self.close_async())
+        self.loop.close()
+
+    async def _timed_query(
+        self, query: str, start_ns: int, res: BenchmarkResult
+    ) -> None:
+        """Run a query and record its latency measured from `start_ns`"""
+        timer = QueryTimer()
+        row_count = await self.run_query_async(query, timer)
+        timer.stop()
+        elapsed_us = (timer.end_ns - start_ns) // 1_000
+        res.record(query, elapsed_us, row_count, timer)
+
+    async def _worker_loop_async(
+        self,
+        queries: List[str],
+        offset: int,
+        passes: int,
+        deadline: Optional[float],
+        res: BenchmarkResult,
+    ) -> None:
+        """Closed-loop worker task, see AbstractDriver._worker_loop"""
+        done = 0
+
+        if not queries:
+            return
+
+        while deadline is not None or done < passes:
+            for i in range(len(queries)):
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+
+                query = queries[(offset + i) % len(queries)]
+                await self._timed_query(query, time.perf_counter_ns(), res)
+            done += 1
+
+    async def _run_concurrent_async(
+        self,
+        queries: List[str],
+        concurrency: int,
+        runs: int,
+        duration: Optional[float],
+    ) -> BenchmarkResult:
+        res = self.new_result(concurrency=concurrency)
+        start = time.perf_counter_ns()
+        deadline = time.perf_counter() + duration if duration is not None else None
+
+        await asyncio.gather(
+            *(
+                self._worker_loop_async(
+                    queries, i * len(queries) // concurrency, runs, deadline, res
+                )
+                for i in range(concurrency)
+            )
+        )
+
+        res.wall_time_us = (time.perf_counter_ns() - start) // 1_000
+        return res
+
+    def run_concurrent(
+        self,
+        queries: List[str],
+        concurrency: int,
+        runs: int = 1,
+        duration: Optional[float] = None,
+    ) -> BenchmarkResult:
+        """Closed-loop load with `concurrency` tasks sharing the connection pool"""
+        return self.loop.run_until_complete(
+            self._run_concurrent_async(queries, concurrency, runs, duration)
+        )
+
+    async def _bounded_query(
+        self,
+        query: str,
+        intended_ns: int,
+        semaphore: asyncio.Semaphore,
+        res: BenchmarkResult,
+    ) -> None:
+        async with semaphore:
+            send_lag_us = (time.perf_counter_ns() - intended_ns) // 1_000
+            res.max_send_lag_us = max(res.max_send_lag_us, send_lag_us)
+            await self._timed_query(query, intended_ns, res)
+
+    async def _run_open_loop_async(
+        self,
+        queries: List[str],
+        rate: float,
+        arrival: str,
+        max_inflight: int,
+        runs: int,
+        duration: Optional[float],
+    ) -> BenchmarkResult:
+        res = self.new_result(concurrency=max_inflight, target_rate=rate)
+        semaphore = asyncio.Semaphore(max_inflight)
+        # Only the pending tasks are kept, not one per request of the run,
+        # along with the errors of the finished ones
+        tasks: Set[asyncio.Task] = set()
+        errors: List[BaseException] = []
+
+        def finished(task: asyncio.Task) -> None:
+            tasks.discard(task)
+            error = None if task.cancelled() else task.exception()
+            if error is not None:
+                errors.append(error)
+
+        start = time.perf_counter_ns()
+        schedule = self._arrival_schedule(
+            queries,
+            rate,
+            arrival,
+            start,
+            runs * len(queries) if duration is None else None,
+            start + int(duration * 1_000_000_000) if duration is not None else None,
+        )
+
+        # The dispatcher never waits for responses: each slot becomes a task at
+        # its intended send time, and latency is measured from that time
+        for intended_ns, query in schedule:
+            delay_ns = intended_ns - time.perf_counter_ns()
+            if delay_ns > 0:
+                await asyncio.sleep(delay_ns / 1_000_000_000)
+            task = asyncio.create_task(
+                self._bounded_query(query, intended_ns, semaphore, res)
+            )
+            tasks.add(task)
+            task.add_done_callback(finished)
+
+        await asyncio.gather(*tasks)
+        if errors:
+            raise errors[0]
+        res.wall_time_us = (time.perf_counter_ns() - start) // 1_000
+        return res
+
+    def run_open_loop(
+        self,
+        queries: List[str],
+        rate: float,
+        arrival: str = "poisson",
+        max_inflight: int = 32,
+        runs: int = 1,
+        duration: Optional[float] = None,
+    ) -> BenchmarkResult:
+        """Open-loop load with up to `max_inflight` queries in flight at once"""
+        return self.loop.run_until_complete(
+            self._run_open_loop_async(
+                queries, rate, arrival, max_inflight, runs, duration
+            )
+        )
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+import argparse
+import sys
+from typing import Any, Dict, List, LiteralString, Optional, cast
+
+from neo4j import AsyncGraphDatabase, AsyncSession
+from neo4j.exceptions import DriverError, Neo4jError
+
+from .abstract_driver import QueryTimer
+from .async_driver import AbstractAsyncDriver
+from .neo4j_driver import REPLAN_PREFIX, memgraph_cold_plan_query
+
+
+class AsyncNeo4jDriver(AbstractAsyncDriver):
+    """asyncio Bolt driver for Neo4j and Memgraph"""
+
+    def __init__(self):
+        super().__init__()
+        self.fetch_size: Optional[int] = None
+        self.replan = True
+
+    def configure(self, args: argparse.Namespace) -> None:
+        super().configure(args)
+        self.fetch_size = args.fetch_size
+        self.replan = getattr(args, "benchmark", None) != "memgraph"
+
+        # Tasks share the driver's pool: sessions can't be kept per worker
+        if args.session_strategy != ["per-query"]:
+            print("--session-strategy is not supported with --async")
+            sys.exit(1)
+
+    def cold_plan_query(self, query: str) -> str:
+        if self.replan:
+            return REPLAN_PREFIX + query
+        return memgraph_cold_plan_query(query)
+
+    def _new_session(self) -> AsyncSession:
+        if self.fetch_size is None:
+            return self.driver.session(database=self.database)
+        return self.driver.session(database=self.database, fetch_size=self.fetch_size)
+
+    async def connect_async(
+        self,
+        url: str,
+        username: str,
+        password: str,
+        database: str = "neo4j",
+        pool_size: int = 100,
+    ) -> None:
+        """Establish connection to Neo4j"""
+        try:
+            self.driver = AsyncGraphDatabase.driver(
+                url, auth=(username, password), max_connection_pool_size=pool_size
+            )
+            await self.driver.verify_connectivity()
+            self.database = database
+            print(f"Connected to {url} (async)")
+        except (Neo4jError, DriverError, ValueError, OSError) as e:
+            print(f"Failed to connect: {e}")
+            sys.exit(1)
+
+    async def execute_query_async(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Execute a Neo4j query and return results"""
+        timer = timer or QueryTimer()
+        records = []
+
+        async with self._new_session() as session:
+            result = await session.run(cast(LiteralString, query), params)
+            async for record in result:
+                if not records:
+                    timer.first_row()
+                records.append(record)
+            timer.last_row()
+
+        return [dict(r) for r in records]
+
+    async def stream_query_async(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Execute a Neo4j query, counting the records as they are received"""
+        timer = timer or QueryTimer()
+        row_count = 0
+
+        async with self._new_session() as session:
+            result = await session.run(cast(LiteralString, query), params)
+            async for _ in result:
+                if not row_count:
+                    timer.first_row()
+                row_count += 1
+            timer.last_row()
+
+        return row_count
+
+    async def discard_query_async(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """Execute a Neo4j query and discard its records in the driver"""
+        timer = timer or QueryTimer()
+
+        async with self._new_session() as session:
+            await (await session.run(cast(LiteralString, query), params)).consume()
+            timer.last_row()
+
+        return None
+
+    async def close_async(self) -> None:
+        """Close the Neo4j driver"""
+        if hasattr(self, "driver") and self.driver:
+            await self.driver.close()
+            print("Closed Neo4j connection")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from .abstract_driver import QueryTimer
+from .async_driver import AbstractAsyncDriver
+from .params import inline_params
+from .turingdb_driver import (
+    HEADERS,
+    RowCounter,
+    checked_response,
+    records_from_response,
+)
+
+
+class AsyncTuringDBDriver(AbstractAsyncDriver):
+    """asyncio driver speaking to the TuringDB HTTP endpoint directly"""
+
+    async def _iter_response(
+        self,
+        query: str,
+        graph: bool = True,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        POST a query to the /query endpoint and yield its response as it
+        arrives, with its parameters inlined (see turingdb_driver)
+        """
+        if params:
+            query = inline_params(query, params)
+
+        async with self.client.stream(
+            "POST",
+            "/query",
+            content=query,
+            params=self.params if graph else None,
+            headers=HEADERS,
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                yield chunk
+
+    async def _send(
+        self,
+        query: str,
+        graph: bool = True,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> bytes:
+        """POST a query and return the whole raw response (see turingdb_driver)"""
+        timer = timer or QueryTimer()
+        chunks = []
+        async for chunk in self._iter_response(query, graph, params):
+            if not chunks:
+                timer.first_row()
+            chunks.append(chunk)
+        timer.last_row()
+
+        return b"".join(chunks)
+
+    async def connect_async(
+        self, url: str, database: str = "default", pool_size: int = 100
+    ) -> None:
+        self.client = httpx.AsyncClient(
+            base_url=url,
+            timeout=None,
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+        )
+        self.params = {"graph": database}
+
+        try:
+            loaded_graphs = records_from_response(
+                checked_response(await self._send("LIST GRAPH", graph=False))
+            )
+        except (httpx.HTTPError, RuntimeError, ValueError, KeyError) as e:
+            print(f"Failed to connect to TuringDB: {e}")
+            sys.exit(-1)
+
+        try:
+            if database not in [g["graphName"] for g in loaded_graphs]:
+                start = time.perf_counter()
+                checked_response(
+                    await self._send(f"LOAD GRAPH {database}", graph=False)
+                )
+                print(f"Graph {database} loaded in {time.perf_counter() - start:.3f}s")
+        except (httpx.HTTPError, RuntimeError, ValueError, KeyError) as e:
+            print(f"Failed to load graph: {e}")
+            sys.exit(-1)
+
+    async def execute_query_async(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        return records_from_response(
+            checked_response(await self._send(query, timer=timer, params=params))
+        )
+
+    async def stream_query_async(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Count the rows of the JSON response as it arrives, without keeping it"""
+        timer = timer or QueryTimer()
+        counter = RowCounter()
+        async for chunk in self._iter_response(query, params=params):
+            counter.feed(chunk)
+            if counter.rows:
+                timer.first_row()
+        timer.last_row()
+
+        return counter.finish()
+
+    async def discard_query_async(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """Read the whole response and drop it undecoded"""
+        await self._send(query, timer=timer, params=params)
+        return None
+
+    async def close_async(self) -> None:
+        if hasattr(self, "client"):
+            await self.client.aclose()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+import importlib.util
+import os
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Optional, Tuple
+
+REPO_ROOT = Path(__file__).parent.parent
+DUMPS_DIR = REPO_ROOT / "dumps"
+
+# Benchmark profiles: measure queries on a running server (warm), or measure
+# the first query after a server restart with a dropped page cache (cold)
+PROFILES = ["warm", "cold"]
+
+
+def load_server_manager() -> ModuleType:
+    """Import scripts/manage_servers.py, which is not part of the package"""
+    path = REPO_ROOT / "scripts" / "manage_servers.py"
+    spec = importlib.util.spec_from_file_location("manage_servers", path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def default_server_args(engine: str, dataset: str) -> str:
+    """Server arguments loading `dataset`, as run.sh starts each engine"""
+    if engine == "turingdb":
+        return f"-turing-dir {DUMPS_DIR / dataset}.turingdb -load {dataset}"
+    if engine == "memgraph":
+        return f"--data-directory={DUMPS_DIR / dataset}.memgraph"
+    # Neo4j's data directory is a link to the dataset's dump, see
+    # switch-neo4j-dataset.sh
+    return ""
+
+
+def drop_page_cache(dataset: str) -> Tuple[int, int]:
+    """
+    Evict the files of dumps/<dataset>.* from the OS page cache with
+    posix_fadvise(DONTNEED), so that the engine reads them from disk again.
+    Only clean pages of files this process can open are evicted: no root
+    privileges are needed. Returns the number of files evicted and skipped.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return 0, 0
+
+    evicted = skipped = 0
+    for root in DUMPS_DIR.glob(f"{dataset}.*"):
+        paths = [root] if root.is_file() else root.rglob("*")
+        for path in paths:
+            if not path.is_file():
+                continue
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                skipped += 1
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                evicted += 1
+            except OSError:
+                skipped += 1
+            finally:
+                os.close(fd)
+
+    return evicted, skipped
+
+
+class ColdStarter:
+    """Restarts an engine through ServerManager with its dataset out of cache"""
+
+    def __init__(self, engine: str, dataset: str, server_args: Optional[str] = None):
+        manage_servers = load_server_manager()
+        self.config = manage_servers.SERVERS[engine]
+        self.manager = manage_servers.ServerManager()
+        self.dataset = dataset
+        self.server_args = (
+            server_args
+            if server_args is not None
+            else default_server_args(engine, dataset)
+        )
+
+    def restart(self, drop_cache: bool = True) -> float:
+        """
+        Stop the server, drop the dataset from the page cache (unless
+        `drop_cache` is False) and start the server again. Returns the time
+        the server took to start and be ready, in seconds.
+        """
+        self.manager.stop(self.config, "")
+        evicted, skipped = drop_page_cache(self.dataset) if drop_cache else (0, 0)
+
+        start = time.perf_counter()
+        if not self.manager.start(self.config, self.server_args):
+            print()
+            raise RuntimeError(f"Could not restart {self.config.name}")
+        startup_s = time.perf_counter() - start
+
+        if not drop_cache:
+            print(f"\n{self.config.name} restarted in {startup_s:.3f}s")
+        else:
+            print(
+                f"\n{self.config.name} restarted in {startup_s:.3f}s "
+                f"({evicted} dataset file(s) evicted from the page cache"
+                f"{f', {skipped} skipped' if skipped else ''})"
+            )
+        return startup_s
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+import re
+from hashlib import blake2b
+from typing import Any, List, Sequence, Set, Tuple
+
+# Variables bound by the patterns of a query: (n:Label), (n), -[r:TYPE]->,
+# [r*1..3], and path variables p = (...)
+PATTERN_VARIABLE = re.compile(r"[(\[]\s*([A-Za-z_]\w*)\s*(?=[:{)\]*\s])")
+PATH_VARIABLE = re.compile(r"\b([A-Za-z_]\w*)\s*=\s*\(")
+# Variables renamed or collected into a list by WITH and RETURN items:
+# n AS node, collect(DISTINCT n) AS nodes
+ALIAS = re.compile(
+    r"(?<![\w.(])(?:(collect)\s*\(\s*(?:DISTINCT\s+)?([A-Za-z_]\w*)\s*\)"
+    r"|([A-Za-z_]\w*))\s+AS\s+([A-Za-z_]\w*)",
+    re.IGNORECASE,
+)
+# Column of a variable collected without an alias: collect(n)
+COLLECTED = re.compile(
+    r"collect\s*\(\s*(?:DISTINCT\s+)?([A-Za-z_]\w*)\s*\)", re.IGNORECASE
+)
+
+# Kinds of result columns
+VALUE = 0
+ENTITY = 1
+ENTITY_LIST = 2
+
+DIGEST_SIZE = 16
+_MODULUS = 1 << (8 * DIGEST_SIZE)
+
+# Floats are compared to this many significant digits, as engines may sum
+# or average them in different orders
+FLOAT_DIGITS = 12
+
+
+def entity_variables(query: str) -> Set[str]:
+    """Variables of a query bound to nodes, relationships or paths"""
+    return set(PATTERN_VARIABLE.findall(query)) | set(PATH_VARIABLE.findall(query))
+
+
+def column_kinds(query: str, columns: Sequence[str]) -> List[int]:
+    """
+    Kind of each result column of a query: an entity variable, possibly
+    renamed, a list of collected entities, or any other value
+    """
+    entities = entity_variables(query)
+    lists: Set[str] = set()
+    for collect, collected, variable, alias in ALIAS.findall(query):
+        if collect and collected in entities:
+            lists.add(alias)
+        elif variable in entities:
+            entities.add(alias)
+        elif variable in lists:
+            lists.add(alias)
+
+    kinds = []
+    for column in columns:
+        collected = COLLECTED.fullmatch(column.strip())
+        if column in entities:
+            kinds.append(ENTITY)
+        elif column in lists or (collected and collected.group(1) in entities):
+            kinds.append(ENTITY_LIST)
+        else:
+            kinds.append(VALUE)
+    return kinds
+
+
+def _encode(
+    value: Any, entity_types: Tuple[type, ...], out: bytearray, ids: bool = False
+) -> None:
+    """
+    Append a canonical encoding of a value to `out`. Nodes, relationships and
+    paths are all encoded alike: their ids are specific to each engine. With
+    `ids`, integers are entity ids, as engines like TuringDB return them.
+    """
+    if value is None:
+        out += b"N"
+    elif isinstance(value, bool):
+        out += b"T" if value else b"F"
+    elif ids and isinstance(value, int):
+        out += b"e"
+    elif isinstance(value, int):
+        out += b"i%d;" % value
+    elif isinstance(value, float):
+        if value.is_integer():
+            out += b"i%d;" % value
+        else:
+            out += b"f" + f"{value:.{FLOAT_DIGITS}g}".encode() + b";"
+    elif isinstance(value, str):
+        encoded = value.encode()
+        out += b"s%d:" % len(encoded) + encoded
+    elif entity_types and isinstance(value, entity_types):
+        out += b"e"
+    elif isinstance(value, (list, tuple)):
+        out += b"l%d:" % len(value)
+        for item in value:
+            _encode(item, entity_types, out, ids)
+    elif isinstance(value, dict):
+        out += b"m%d:" % len(value)
+        for key in sorted(value, key=str):
+            _encode(str(key), entity_types, out)
+            _encode(value[key], entity_types, out, ids)
+    else:
+        # Temporal and spatial values, by their string representation
+        _encode(str(value), entity_types, out)
+
+
+class ResultFingerprint:
+    """
+    Order-insensitive digest of the rows of a query result, folded in as they
+    are read: the number of rows and the sum (modulo 2^128) of the BLAKE2b
+    hashes of their normalized values. A sum rather than a XOR, so that
+    duplicate rows do not cancel out.
+
+    Columns returning a variable bound to a node, relationship or path, under
+    its name or an alias, only count as such, as do the ids of the entities
+    collected into list columns and values of `entity_types` wherever they
+    appear, since engines do not agree on their ids or on whether to return
+    entities or ids. Return their properties to compare them across engines.
+    """
+
+    def __init__(
+        self, query: str, columns: Sequence[str], entity_types: Tuple[type, ...] = ()
+    ):
+        self.column_kinds = column_kinds(query, columns)
+        self.entity_types = entity_types
+        self.rows = 0
+        self.total = 0
+
+    def add(self, row: Sequence[Any]) -> None:
+        out = bytearray()
+        for value, kind in zip(row, self.column_kinds):
+            if kind == ENTITY:
+                out += b"e"
+            else:
+                _encode(value, self.entity_types, out, kind == ENTITY_LIST)
+        digest = blake2b(out, digest_size=DIGEST_SIZE).digest()
+        self.total = (self.total + int.from_bytes(digest, "big")) % _MODULUS
+        self.rows += 1
+
+    def hexdigest(self) -> str:
+        return f"{self.total:0{2 * DIGEST_SIZE}x}"
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import math
+from array import array
+from typing import List, Tuple
+
+# Largest latency a histogram can record precisely: one hour, in microseconds.
+# Larger values are counted in the last bucket (the exact maximum is kept).
+HIGHEST_US = 3_600_000_000
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory latency histogram in the style of HdrHistogram.
+
+    Values (in microseconds) are counted in log-scaled buckets, each split in
+    linear sub-buckets so that any recorded value is known to within
+    `significant_digits` decimal digits, from 1µs up to HIGHEST_US. Memory
+    depends on the range of values seen, never on their number, and two
+    histograms with the same precision can be merged exactly, e.g. across
+    worker threads or processes.
+
+    Count, mean, standard deviation, min and max are exact; percentiles are
+    the highest value equivalent to the bucket the percentile falls into.
+    """
+
+    def __init__(self, significant_digits: int = 2):
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits must be between 1 and 5")
+
+        self.significant_digits = significant_digits
+
+        # Sub-buckets per bucket: enough to tell values 10^-digits apart
+        largest_single_unit = 2 * 10**significant_digits
+        self._half_magnitude = math.ceil(math.log2(largest_single_unit)) - 1
+        self._half_count = 1 << self._half_magnitude
+        self._sub_bucket_mask = (1 << (self._half_magnitude + 1)) - 1
+
+        # Counts grow up to the index of the largest value seen, at most
+        # _index(HIGHEST_US) + 1 entries
+        self.counts = array("q")
+        self.count = 0
+        self.total = 0
+        self.total_squares = 0
+        self.min = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        bucket = (value | self._sub_bucket_mask).bit_length() - (
+            self._half_magnitude + 1
+        )
+        sub_bucket = value >> bucket
+        return ((bucket + 1) << self._half_magnitude) + sub_bucket - self._half_count
+
+    def _highest_equivalent(self, index: int) -> int:
+        """Largest value counted at `index`"""
+        bucket = (index >> self._half_magnitude) - 1
+        sub_bucket = (index & (self._half_count - 1)) + self._half_count
+        if bucket < 0:
+            sub_bucket -= self._half_count
+            bucket = 0
+        return ((sub_bucket + 1) << bucket) - 1
+
+    def _grow(self, size: int) -> None:
+        if size > len(self.counts):
+            missing = size - len(self.counts)
+            self.counts.frombytes(bytes(self.counts.itemsize * missing))
+
+    def record(self, value_us: int) -> None:
+        """Count one latency sample"""
+        value_us = max(value_us, 0)
+        index = self._index(min(value_us, HIGHEST_US))
+        self._grow(index + 1)
+        self.counts[index] += 1
+
+        self.min = value_us if not self.count else min(self.min, value_us)
+        self.max = max(self.max, value_us)
+        self.count += 1
+        self.total += value_us
+        self.total_squares += value_us * value_us
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the counts of a histogram of the same precision to this one"""
+        if other.significant_digits != self.significant_digits:
+            raise ValueError("Cannot merge histograms of different precisions")
+        if not other.count:
+            return
+
+        self._grow(len(other.counts))
+        for index, n in enumerate(other.counts):
+            if n:
+                self.counts[index] += n
+
+        self.min = other.min if not self.count else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def stdev(self) -> float:
+        """Sample standard deviation"""
+        if self.count < 2:
+            return 0.0
+        n = self.count
+        return math.sqrt((n * self.total_squares - self.total**2) / (n * (n - 1)))
+
+    def median(self) -> int:
+        return self.percentile(50)
+
+    def weighted(self) -> Tuple[List[int], List[int]]:
+        """Value (see percentile()) and count of every non-empty bucket"""
+        indexes = [index for index, n in enumerate(self.counts) if n]
+        return (
+            [min(self._highest_equivalent(index), self.max) for index in indexes],
+            [self.counts[index] for index in indexes],
+        )
+
+    def percentile(self, p: float) -> int:
+        """Value below which p% of the samples fall, to the histogram's precision"""
+        if not self.count:
+            return 0
+
+        target = max(math.ceil(p / 100 * self.count), 1)
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
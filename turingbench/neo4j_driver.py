@@ -1,37 +1,311 @@
 #!/usr/bin/env python3
 
+import random
+import re
 import sys
 import argparse
-from typing import List, Dict, Any, LiteralString, cast
+from typing import (
+    List,
+    Dict,
+    Any,
+    Callable,
+    LiteralString,
+    Optional,
+    TypeVar,
+    cast,
+)
 
-from .abstract_driver import AbstractDriver
+from .abstract_driver import AbstractDriver, BenchmarkResult, QueryTimer
+from .fingerprint import ResultFingerprint
+from .scenario import read_query_file
+from .writes import WRITE_LABEL, WRITE_WORKLOADS, Statement
 
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Record, Result, Session
+from neo4j.exceptions import DriverError, Neo4jError
+from neo4j.graph import Node, Path, Relationship
+
+SESSION_STRATEGIES = ["per-query", "per-worker", "managed-tx"]
+
+# Queries sent through execute_write rather than execute_read in managed-tx
+WRITE_CLAUSE = re.compile(r"\b(CREATE|MERGE|DELETE|SET|REMOVE)\b", re.IGNORECASE)
+
+# Query option making Neo4j plan a query again instead of using its plan cache.
+REPLAN_PREFIX = "CYPHER replan=force "
+
+
+def memgraph_cold_plan_query(query: str) -> str:
+    """
+    Memgraph has no such option, and keys its plan cache on the query stripped
+    of its literals and whitespace: the query is prefixed with a clause binding
+    a variable of random name instead, which the stripper keeps.
+    """
+    return f"WITH 0 AS _plan_{random.getrandbits(64):016x} {query}"
+
+
+# Index on the id property of the nodes written by --writes, whose DDL differs
+# between Neo4j and Memgraph
+NEO4J_WRITE_INDEX = (
+    f"CREATE INDEX turingbench_write_id IF NOT EXISTS FOR (n:{WRITE_LABEL}) ON (n.id)"
+)
+NEO4J_DROP_WRITE_INDEX = "DROP INDEX turingbench_write_id IF EXISTS"
+MEMGRAPH_WRITE_INDEX = f"CREATE INDEX ON :{WRITE_LABEL}(id)"
+MEMGRAPH_DROP_WRITE_INDEX = f"DROP INDEX ON :{WRITE_LABEL}(id)"
+
+T = TypeVar("T")
 
 
 class Neo4jDriver(AbstractDriver):
     """Neo4j-specific implementation of DatabaseBenchmark"""
 
+    query_errors = (Neo4jError, DriverError, OSError)
+
+    def __init__(self):
+        super().__init__()
+        self.session_strategy = "per-query"
+        self.fetch_size: Optional[int] = None
+        self.session: Optional[Session] = None
+        self.replan = True
+        self.memgraph = False
+        self.write_index = False
+        self.write_workloads = list(WRITE_WORKLOADS)
+        # False for workers sharing the driver of the one that spawned them
+        self.owns_driver = True
+
     def connect(
-        self, url: str, username: str, password: str, database: str = "neo4j"
+        self,
+        url: str,
+        username: str,
+        password: str,
+        database: str = "neo4j",
+        pool_size: int = 100,
     ) -> None:
         """Establish connection to Neo4j"""
+        self.connect_args = {
+            "url": url,
+            "username": username,
+            "password": password,
+            "database": database,
+            "pool_size": pool_size,
+        }
         try:
-            self.driver = GraphDatabase.driver(url, auth=(username, password))
+            self.driver = GraphDatabase.driver(
+                url, auth=(username, password), max_connection_pool_size=pool_size
+            )
             self.database = database
             print(f"Connected to {url}")
         except Exception as e:
             print(f"Failed to connect: {e}")
             sys.exit(1)
 
-    def execute_query(self, query: str) -> List[Dict[str, Any]]:
+    def share_connection(self, worker: AbstractDriver) -> bool:
+        """Workers share the driver and its pool, each with its own sessions"""
+        if not isinstance(worker, Neo4jDriver):
+            return False
+        worker.connect_args = self.connect_args
+        worker.driver = self.driver
+        worker.database = self.database
+        worker.owns_driver = False
+        return True
+
+    def configure(self, args: argparse.Namespace) -> None:
+        super().configure(args)
+        self.fetch_size = args.fetch_size
+        self.memgraph = getattr(args, "benchmark", None) == "memgraph"
+        self.replan = not self.memgraph
+
+    def settings(self) -> Dict[str, Any]:
+        return {
+            **super().settings(),
+            "session_strategy": self.session_strategy,
+            "fetch_size": self.fetch_size,
+            "replan": self.replan,
+            "memgraph": self.memgraph,
+        }
+
+    def cold_plan_query(self, query: str) -> str:
+        if self.replan:
+            return REPLAN_PREFIX + query
+        return memgraph_cold_plan_query(query)
+
+    def variant(self) -> str:
+        return f"{super().variant()}/{self.session_strategy}"
+
+    def _new_session(self) -> Session:
+        if self.fetch_size is None:
+            return self.driver.session(database=self.database)
+        return self.driver.session(database=self.database, fetch_size=self.fetch_size)
+
+    def _close_session(self) -> None:
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    def _run(
+        self,
+        query: str,
+        consume: Callable[[Result], T],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> T:
+        """
+        Run a query with its Bolt parameters according to the session strategy
+        and return what `consume` reads from its result:
+        - per-query: a new session for every query
+        - per-worker: one session kept open by each worker
+        - managed-tx: execute_read/execute_write transaction functions on the
+          worker's session
+        """
+        if self.session_strategy == "per-query":
+            with self._new_session() as session:
+                return consume(session.run(cast(LiteralString, query), params))
+
+        if self.session is None:
+            self.session = self._new_session()
+
+        if self.session_strategy == "managed-tx":
+            execute = (
+                self.session.execute_write
+                if WRITE_CLAUSE.search(query)
+                else self.session.execute_read
+            )
+            return execute(
+                lambda tx: consume(tx.run(cast(LiteralString, query), params))
+            )
+
+        return consume(self.session.run(cast(LiteralString, query), params))
+
+    def execute_query(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
         """Execute a Neo4j query and return results"""
-        with self.driver.session(database=self.database) as session:
-            return [dict(r) for r in session.run(cast(LiteralString, query))]
+        timer = timer or QueryTimer()
+
+        def fetch(result: Result) -> List[Record]:
+            records = []
+            for record in result:
+                if not records:
+                    timer.first_row()
+                records.append(record)
+            # Inside the transaction: its teardown is not part of the fetch
+            timer.last_row()
+            return records
+
+        records = self._run(query, fetch, params)
+
+        return [dict(r) for r in records]
+
+    def stream_query(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Execute a Neo4j query, counting the records as they are received"""
+        timer = timer or QueryTimer()
+
+        def count(result: Result) -> int:
+            row_count = 0
+            for _ in result:
+                if not row_count:
+                    timer.first_row()
+                row_count += 1
+            # Receive the summary too, so the run ends with the server's last message
+            result.consume()
+            timer.last_row()
+            return row_count
+
+        row_count = self._run(query, count, params)
+
+        return row_count
+
+    def discard_query(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """Execute a Neo4j query and discard its records in the driver"""
+        timer = timer or QueryTimer()
+
+        def discard(result: Result) -> None:
+            result.consume()
+            timer.last_row()
+
+        self._run(query, discard, params)
+
+        return None
+
+    def fingerprint_query(self, query: str) -> ResultFingerprint:
+        """Fold the records of a Neo4j query into a fingerprint as they are received"""
+
+        def fold(result: Result) -> ResultFingerprint:
+            fingerprint = ResultFingerprint(
+                query, result.keys(), (Node, Relationship, Path)
+            )
+            for record in result:
+                fingerprint.add(record.values())
+            return fingerprint
+
+        return self._run(query, fold)
+
+    def _run_autocommit(self, query: str) -> None:
+        """Run a statement in its own auto-commit transaction"""
+        with self._new_session() as session:
+            session.run(cast(LiteralString, query)).consume()
+
+    def write_batch(self, statements: List[Statement]) -> None:
+        """Run write statements in one explicit transaction"""
+        with self._new_session() as session, session.begin_transaction() as tx:
+            for query, params in statements:
+                tx.run(cast(LiteralString, query), params).consume()
+            tx.commit()
+
+    def create_write_index(self) -> None:
+        if self.memgraph:
+            self._run_autocommit(MEMGRAPH_WRITE_INDEX)
+        else:
+            self._run_autocommit(NEO4J_WRITE_INDEX)
+            self._run_autocommit("CALL db.awaitIndexes(300)")
+        self.write_index = True
+
+    def reset_writes(self) -> None:
+        self._run_autocommit(f"MATCH (n:{WRITE_LABEL}) DETACH DELETE n")
+        if self.write_index:
+            self._run_autocommit(
+                MEMGRAPH_DROP_WRITE_INDEX if self.memgraph else NEO4J_DROP_WRITE_INDEX
+            )
+            self.write_index = False
+
+    def run_benchmark(
+        self, queries: List[str], args: argparse.Namespace
+    ) -> List[BenchmarkResult]:
+        """Run the benchmark once per session strategy and compare them"""
+        self.configure(args)
+        comparison = {}
+
+        for strategy in args.session_strategy:
+            if len(args.session_strategy) > 1:
+                print(f"Session strategy: {strategy}")
+            self._close_session()
+            self.session_strategy = strategy
+            comparison[strategy] = self.run_plan_modes(queries, args)
+
+        if len(comparison) > 1:
+            print("Session strategies compared")
+            self.present_comparison(
+                comparison,
+                args.rate or args.concurrency or None,
+                "Target rate" if args.rate else "Workers",
+            )
+
+        return comparison[args.session_strategy[-1]]
 
     def close(self) -> None:
         """Close the Neo4j driver"""
-        if hasattr(self, "driver") and self.driver:
+        self._close_session()
+        if self.owns_driver and hasattr(self, "driver") and self.driver:
             self.driver.close()
             print("Closed Neo4j connection")
 
@@ -53,25 +327,53 @@ class Neo4jDriver(AbstractDriver):
         parser.add_argument(
             "--database", "-g", default="neo4j", help="Database name (default: neo4j)"
         )
+        parser.add_argument(
+            "--session-strategy",
+            choices=SESSION_STRATEGIES,
+            nargs="+",
+            default=["per-query"],
+            help="Open a new session for every query (per-query), keep one session "
+            "per worker (per-worker), or run managed transactions with "
+            "execute_read/execute_write on a session per worker (managed-tx). "
+            "Several strategies can be given to compare them (default: per-query)",
+        )
+        parser.add_argument(
+            "--fetch-size",
+            type=int,
+            default=None,
+            help="Number of records fetched per batch, -1 to fetch all at once "
+            "(default: driver default, 1000)",
+        )
 
 
 def main(args: argparse.Namespace) -> None:
-    driver = Neo4jDriver()
+    connect_args: Dict[str, Any] = {
+        "url": args.url,
+        "username": args.username,
+        "password": args.password,
+        "database": args.database,
+        "pool_size": args.pool_size,
+    }
+
+    if args.use_async:
+        from .async_neo4j_driver import AsyncNeo4jDriver
+
+        driver: AbstractDriver = AsyncNeo4jDriver()
+    else:
+        driver = Neo4jDriver()
 
     try:
-        driver.connect(
-            url=args.url,
-            username=args.username,
-            password=args.password,
-            database=args.database,
-        )
+        driver.connect(**connect_args)
+
+        if args.writes:
+            driver.run_write_benchmark(args)
+            return
 
-        # Load queries from file
-        with open(args.query, "r") as f:
-            queries = [line.strip().split(";")[0] for line in f if line.strip()]
+        # Load queries from file, or from the --scenario
+        queries = read_query_file(args.query) if args.query else []
 
         # Run benchmark
-        driver.run_benchmark(queries, args.runs)
+        driver.run_benchmark(queries, args)
 
     finally:
         driver.close()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+import bisect
+import csv
+import json
+import random
+import re
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# $name placeholders of a query template
+PARAM_PATTERN = re.compile(r"\$([A-Za-z_]\w*)")
+
+DISTRIBUTIONS = ["uniform", "zipf", "sequential"]
+
+
+class ParamGenerator:
+    """
+    Draws the values of one query parameter from a list of candidates:
+    - uniform: every value equally likely
+    - zipf: the k-th value has a weight of 1/k^exponent, so the first values
+      are hot keys (order the source accordingly)
+    - sequential: cycle through the values in order
+    """
+
+    def __init__(
+        self, values: List[Any], distribution: str = "uniform", exponent: float = 1.0
+    ):
+        if not values:
+            raise ValueError("A parameter needs at least one value")
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution '{distribution}'")
+
+        self.values = values
+        self.distribution = distribution
+        self.position = 0
+        self.step = 1
+        self.cum_weights: List[float] = []
+        if distribution == "zipf":
+            self.cum_weights = list(
+                accumulate(1 / k**exponent for k in range(1, len(values) + 1))
+            )
+
+    def next(self) -> Any:
+        if self.distribution == "sequential":
+            value = self.values[self.position % len(self.values)]
+            self.position += self.step
+            return value
+        if self.distribution == "zipf":
+            target = random.random() * self.cum_weights[-1]
+            return self.values[bisect.bisect_right(self.cum_weights, target)]
+        return random.choice(self.values)
+
+    def stride(self, offset: int, step: int) -> None:
+        """
+        Cycle through every `step`-th value from `offset` onwards, so that
+        `step` copies of a sequential generator draw disjoint values
+        """
+        self.position += offset
+        self.step = step
+
+
+def template_params(query: str) -> Set[str]:
+    """Names of the $placeholders of a query"""
+    return set(PARAM_PATTERN.findall(query))
+
+
+def draw_params(
+    query: str, generators: Dict[str, ParamGenerator]
+) -> Optional[Dict[str, Any]]:
+    """Draw a value for every placeholder of a query, or None if it has none"""
+    names = template_params(query)
+    if not names:
+        return None
+
+    missing = names - generators.keys()
+    if missing:
+        raise KeyError(f"No generator for parameter(s) {', '.join(sorted(missing))}")
+    return {name: generators[name].next() for name in names}
+
+
+def _scalar(value: Any) -> Any:
+    # Values read back through pandas/numpy (e.g. numpy.int64) to Python scalars
+    return value.item() if hasattr(value, "item") else value
+
+
+def load_param_generators(
+    path: str, fetch_values: Callable[[str], List[Dict[str, Any]]]
+) -> Dict[str, ParamGenerator]:
+    """
+    Load parameter generators from a JSON file mapping each parameter name to
+    its source and distribution, e.g.
+
+        {
+          "name": {"query": "MATCH (p:Person) RETURN p.name", "distribution": "zipf"},
+          "id": {"csv": "ids.csv", "column": "id", "distribution": "sequential"},
+          "label": {"values": ["Drug", "Taxon"]}
+        }
+
+    Query sources are run once, untimed, with `fetch_values` (the driver's
+    execute_query) and take the first column of every record.
+    """
+    with open(path, "r") as f:
+        specs = json.load(f)
+
+    generators = {}
+    for name, spec in specs.items():
+        if "values" in spec:
+            values = list(spec["values"])
+        elif "query" in spec:
+            values = [
+                _scalar(next(iter(record.values())))
+                for record in fetch_values(spec["query"])
+            ]
+        elif "csv" in spec:
+            with open(spec["csv"], "r", newline="") as csv_file:
+                values = [row[spec["column"]] for row in csv.DictReader(csv_file)]
+        else:
+            raise ValueError(f"Parameter '{name}' has no values, query or csv source")
+
+        generators[name] = ParamGenerator(
+            values, spec.get("distribution", "uniform"), spec.get("exponent", 1.0)
+        )
+        print(
+            f"Parameter ${name}: {len(values)} values, "
+            f"{generators[name].distribution} distribution"
+        )
+
+    return generators
+
+
+def cypher_literal(value: Any) -> str:
+    """Cypher literal of a parameter value"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(cypher_literal(v) for v in value) + "]"
+    if isinstance(value, dict):
+        entries = (f"`{k}`: {cypher_literal(v)}" for k, v in value.items())
+        return "{" + ", ".join(entries) + "}"
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def inline_params(query: str, params: Dict[str, Any]) -> str:
+    """Substitute the $placeholders of a query with Cypher literals"""
+    return PARAM_PATTERN.sub(lambda m: cypher_literal(params[m.group(1)]), query)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+import os
+import threading
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .cold_start import REPO_ROOT
+
+PROC = Path("/proc")
+PID_DIR = REPO_ROOT / "scripts" / ".cache"
+
+# How to recognize each engine's server among the running processes: the
+# basename of its executable, or an argument of its command line (Neo4j runs
+# in a JVM). The PID files of ServerManager name the shell the server was
+# started from, or a launcher that exits once the server is up.
+SERVER_EXECUTABLES = {"turingdb": "turingdb", "memgraph": "memgraph"}
+SERVER_ARGUMENTS = {"neo4j": "org.neo4j.server.CommunityEntryPoint"}
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+@dataclass
+class ResourceUsage:
+    """Server resources used during one query run"""
+
+    # Peak resident memory above the resident memory at the start of the run
+    rss_peak_delta_bytes: int = 0
+    # CPU time at the kernel's clock tick resolution, usually 10ms
+    user_cpu_us: int = 0
+    system_cpu_us: int = 0
+    # CPU time of the server's threads at nanosecond resolution, None without
+    # /proc/<pid>/task/<tid>/schedstat (kernels without schedstats)
+    cpu_us: Optional[int] = None
+    # Bytes read from and written to storage, None if /proc/<pid>/io is not
+    # readable (it needs the server's user or root)
+    read_bytes: Optional[int] = None
+    write_bytes: Optional[int] = None
+    # Server threads which ran on a CPU during the run
+    active_threads: int = 0
+
+
+# Columns of ResourceUsage in the raw sample files written by --samples
+RESOURCE_COLUMNS = [f.name for f in fields(ResourceUsage)]
+
+
+def _cmdline(pid: int) -> List[str]:
+    try:
+        raw = (PROC / str(pid) / "cmdline").read_bytes()
+    except OSError:
+        return []
+    return [arg.decode(errors="replace") for arg in raw.split(b"\0") if arg]
+
+
+def _is_server(engine: str, pid: int) -> bool:
+    args = _cmdline(pid)
+    if not args:
+        return False
+    if engine in SERVER_EXECUTABLES:
+        return os.path.basename(args[0]) == SERVER_EXECUTABLES[engine]
+    return SERVER_ARGUMENTS.get(engine) in args
+
+
+def find_server_pid(engine: str) -> Optional[int]:
+    """
+    PID of the running server of an engine: the one recorded by
+    ServerManager if it is the server itself, else the oldest matching
+    process
+    """
+    pid_file = PID_DIR / f"{engine}.pid"
+    try:
+        pid = int(pid_file.read_text().strip())
+        if _is_server(engine, pid):
+            return pid
+    except (OSError, ValueError):
+        pass
+
+    pids = sorted(
+        int(entry.name)
+        for entry in PROC.iterdir()
+        if entry.name.isdigit() and int(entry.name) != os.getpid()
+    )
+    return next((pid for pid in pids if _is_server(engine, pid)), None)
+
+
+class ResourceSampler:
+    """
+    Measures the resources a server process uses while a query runs.
+
+    CPU time, storage I/O and per-thread CPU time are read from /proc at the
+    start and the end of the run; resident memory is polled every
+    `interval_s` by a background thread to catch its peak.
+    """
+
+    def __init__(self, pid: int, interval_s: float = 0.005):
+        self.pid = pid
+        self.interval_s = interval_s
+        self.proc = PROC / str(pid)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_rss = 0
+        self._peak_rss = 0
+        self._start_cpu = (0, 0)
+        self._start_io: Tuple[Optional[int], Optional[int]] = (None, None)
+        self._start_threads: Dict[str, int] = {}
+        self.schedstat = (self.proc / "schedstat").exists()
+
+    def _rss(self) -> int:
+        # Second field of statm: resident pages
+        return int((self.proc / "statm").read_text().split()[1]) * PAGE_SIZE
+
+    def _cpu(self) -> Tuple[int, int]:
+        """User and system CPU time in clock ticks"""
+        stat = (self.proc / "stat").read_text()
+        # Fields after the parenthesized command name, which may contain spaces
+        values = stat[stat.rindex(")") + 2 :].split()
+        return int(values[11]), int(values[12])
+
+    def _io(self) -> Tuple[Optional[int], Optional[int]]:
+        try:
+            lines = (self.proc / "io").read_text().splitlines()
+        except OSError:
+            return None, None
+        io = dict(line.split(": ") for line in lines if ": " in line)
+        return int(io["read_bytes"]), int(io["write_bytes"])
+
+    def _thread_times(self) -> Dict[str, int]:
+        """CPU time of every thread, in ns (schedstat) or clock ticks (stat)"""
+        times = {}
+        for task in (self.proc / "task").iterdir():
+            try:
+                schedstat = task / "schedstat"
+                if schedstat.exists():
+                    times[task.name] = int(schedstat.read_text().split()[0])
+                else:
+                    stat = (task / "stat").read_text()
+                    values = stat[stat.rindex(")") + 2 :].split()
+                    times[task.name] = int(values[11]) + int(values[12])
+            except (OSError, ValueError, IndexError):
+                # Thread exited while listing
+                continue
+        return times
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                self._peak_rss = max(self._peak_rss, self._rss())
+            except OSError:
+                return
+
+    def start(self) -> None:
+        """Snapshot the server's counters and start polling its memory"""
+        self._start_threads = self._thread_times()
+        self._start_io = self._io()
+        self._start_cpu = self._cpu()
+        self._start_rss = self._peak_rss = self._rss()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> ResourceUsage:
+        """Stop polling and return the resources used since start()"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._peak_rss = max(self._peak_rss, self._rss())
+
+        user, system = self._cpu()
+        read_bytes, write_bytes = self._io()
+        threads = self._thread_times()
+        deltas = [
+            time - self._start_threads.get(name, 0) for name, time in threads.items()
+        ]
+        active = sum(1 for delta in deltas if delta > 0)
+
+        return ResourceUsage(
+            rss_peak_delta_bytes=self._peak_rss - self._start_rss,
+            user_cpu_us=(user - self._start_cpu[0]) * 1_000_000 // CLOCK_TICKS,
+            system_cpu_us=(system - self._start_cpu[1]) * 1_000_000 // CLOCK_TICKS,
+            cpu_us=sum(max(delta, 0) for delta in deltas) // 1_000
+            if self.schedstat
+            else None,
+            read_bytes=(
+                None
+                if read_bytes is None or self._start_io[0] is None
+                else read_bytes - self._start_io[0]
+            ),
+            write_bytes=(
+                None
+                if write_bytes is None or self._start_io[1] is None
+                else write_bytes - self._start_io[1]
+            ),
+            active_threads=active,
+        )
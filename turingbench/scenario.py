@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+import json
+import random
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+
+def read_query_file(path: str) -> List[str]:
+    """Queries of a query file, one per line, without their trailing ';'"""
+    with open(path, "r") as f:
+        return [line.strip().split(";")[0] for line in f if line.strip()]
+
+
+@dataclass
+class QueryClass:
+    """Queries of a scenario sharing a share of the traffic"""
+
+    name: str
+    weight: float
+    queries: List[str]
+
+
+@dataclass
+class Scenario:
+    """
+    Weighted mix of query classes. `mix` is the sequence of queries load
+    workers loop over: every class appears in proportion to its weight,
+    spread evenly over its queries, in a shuffled but reproducible order.
+    """
+
+    classes: List[QueryClass]
+    mix: List[str]
+
+    def queries(self) -> List[str]:
+        """Distinct queries of the scenario, in class order"""
+        return list(dict.fromkeys(q for c in self.classes for q in c.queries))
+
+
+def _apportion(weights: List[float], total: int) -> List[int]:
+    """Split `total` slots in proportion to `weights` (largest remainders)"""
+    quotas = [w / sum(weights) * total for w in weights]
+    counts = [int(q) for q in quotas]
+    by_remainder = sorted(
+        range(len(weights)), key=lambda i: quotas[i] - counts[i], reverse=True
+    )
+    for i in by_remainder[: total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def load_scenario(path: str) -> Scenario:
+    """
+    Load a scenario from a JSON file of weighted query classes, e.g.
+
+        {
+          "length": 1000,
+          "seed": 0,
+          "classes": {
+            "lookup": {"weight": 70, "query_file": "lookups.cypher"},
+            "traversal": {
+              "weight": 20,
+              "query_file": "queries_reactome.cypher",
+              "match": "\\)-->\\(.*\\)-->\\("
+            },
+            "scan": {"weight": 10, "queries": ["MATCH (n:Drug) RETURN n"]}
+          }
+        }
+
+    Classes take their queries from a list, or from a query file (relative to
+    the scenario file) optionally filtered by a `match` regular expression.
+    The mix is `length` queries long (default: 1000).
+    """
+    with open(path, "r") as f:
+        spec = json.load(f)
+
+    base_dir = Path(path).parent
+    classes = []
+    for name, class_spec in spec["classes"].items():
+        if "queries" in class_spec:
+            queries = list(class_spec["queries"])
+        elif "query_file" in class_spec:
+            queries = read_query_file(str(base_dir / class_spec["query_file"]))
+        else:
+            raise ValueError(f"Query class '{name}' has no queries or query_file")
+
+        if "match" in class_spec:
+            pattern = re.compile(class_spec["match"], re.IGNORECASE)
+            queries = [q for q in queries if pattern.search(q)]
+        if not queries:
+            raise ValueError(f"Query class '{name}' has no queries")
+
+        classes.append(QueryClass(name, float(class_spec["weight"]), queries))
+
+    length = spec.get("length", 1000)
+    mix: List[str] = []
+    counts = _apportion([c.weight for c in classes], length)
+    for query_class, count in zip(classes, counts):
+        mix += [query_class.queries[i % len(query_class.queries)] for i in range(count)]
+    random.Random(spec.get("seed", 0)).shuffle(mix)
+
+    total_weight = sum(c.weight for c in classes)
+    print(
+        f"Scenario {path}: "
+        + ", ".join(
+            f"{c.name} {c.weight / total_weight:.0%} ({len(c.queries)} queries)"
+            for c in classes
+        )
+    )
+
+    return Scenario(classes, mix)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Upper bound on the number of counts drawn at once by the bootstrap, to keep
+# its memory bounded whatever the number of distinct latencies
+_MAX_BATCH_CELLS = 10_000_000
+
+
+def bootstrap_intervals(
+    values: np.ndarray,
+    counts: np.ndarray,
+    resamples: int = 1000,
+    confidence: float = 0.95,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+    """
+    Percentile bootstrap confidence intervals of the mean and the median of a
+    latency distribution given as sorted distinct values and their counts
+    (raw samples or histogram buckets alike).
+
+    Each resample redraws the counts of the n samples from a multinomial over
+    the distinct values, which is equivalent to resampling the samples with
+    replacement, vectorized over batches of resamples.
+    Returns ((mean_low, mean_high), (median_low, median_high)).
+    """
+    rng = rng or np.random.default_rng(0)
+    n = int(counts.sum())
+    pvals = counts / n
+    means = np.empty(resamples)
+    medians = np.empty(resamples)
+
+    batch = max(1, _MAX_BATCH_CELLS // len(values))
+    for start in range(0, resamples, batch):
+        size = min(batch, resamples - start)
+        drawn = rng.multinomial(n, pvals, size=size)
+        means[start : start + size] = drawn @ values / n
+
+        # Lower median: first value whose cumulative count reaches half the samples
+        cumulative = np.cumsum(drawn, axis=1)
+        medians[start : start + size] = values[
+            np.argmax(cumulative >= (n + 1) // 2, axis=1)
+        ]
+
+    tail = (1 - confidence) / 2 * 100
+    mean_low, mean_high = np.percentile(means, [tail, 100 - tail])
+    median_low, median_high = np.percentile(medians, [tail, 100 - tail])
+    return (float(mean_low), float(mean_high)), (float(median_low), float(median_high))
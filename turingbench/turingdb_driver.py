@@ -1,19 +1,32 @@
 #!/usr/bin/env python3
 
+import json
+import re
 import sys
+import time
 import argparse
-from typing import List, Dict, Any, cast
+from typing import List, Dict, Any, Iterator, Optional
 
-from .abstract_driver import AbstractDriver
+from .abstract_driver import AbstractDriver, QueryTimer
+from .fingerprint import ResultFingerprint
+from .scenario import read_query_file
+from .params import inline_params
+from .writes import MATCH_CREATE_EDGE, Statement
 
+import httpx
+import numpy as np
 from turingdb import TuringDB
 
+HEADERS = {"Accept": "application/json", "Content-Type": "application/json"}
+
 
 class TuringDBDriver(AbstractDriver):
     _default_url: str = "http://localhost:6667"
     _default_db: str = "default"
+    query_errors = (httpx.HTTPError, RuntimeError, OSError)
 
     def connect(self, url: str, database: str = "default") -> None:
+        self.connect_args = {"url": url, "database": database}
         try:
             self.client = TuringDB(host=url)
             self.client.try_reach()
@@ -24,7 +37,9 @@ class TuringDBDriver(AbstractDriver):
         try:
             loaded_graphs = self.client.list_loaded_graphs()
             if database not in loaded_graphs:
+                start = time.perf_counter()
                 self.client.load_graph(graph_name=database, raise_if_loaded=False)
+                print(f"Graph {database} loaded in {time.perf_counter() - start:.3f}s")
         except Exception as e:
             print(f"Failed to load graph: {e}")
             sys.exit(-1)
@@ -35,12 +50,114 @@ class TuringDBDriver(AbstractDriver):
             print(f"Failed to use graph: {e}")
             sys.exit(-1)
 
+        # The SDK decodes results into a DataFrame once fully received, which
+        # hides the phases of a query: queries go to the HTTP endpoint directly
+        self.http = httpx.Client(base_url=url, timeout=None)
+        self.params = {"graph": database}
+
     def close(self) -> None:
-        pass
+        if hasattr(self, "http"):
+            self.http.close()
+
+    def execute_query(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        # The response is timed as it is received, then decoded into records
+        # once the timer has seen its last chunk: decoding is materialization
+        return records_from_response(
+            checked_response(self._post(query, timer or QueryTimer(), params))
+        )
+
+    def _iter_response(
+        self, query: str, params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[bytes]:
+        """POST a query to the /query endpoint and yield its response as it arrives"""
+        # The HTTP API takes no query parameters: the values of the template's
+        # $placeholders are sent inlined as Cypher literals
+        if params:
+            query = inline_params(query, params)
+
+        with self.http.stream(
+            "POST", "/query", content=query, params=self.params, headers=HEADERS
+        ) as response:
+            response.raise_for_status()
+            yield from response.iter_bytes()
+
+    def _post(
+        self, query: str, timer: QueryTimer, params: Optional[Dict[str, Any]] = None
+    ) -> bytes:
+        """
+        POST a query and return the whole raw response. Rows are only known
+        once it is decoded: the first row is timed at its first byte.
+        """
+        chunks = []
+        for chunk in self._iter_response(query, params):
+            if not chunks:
+                timer.first_row()
+            chunks.append(chunk)
+        timer.last_row()
+
+        return b"".join(chunks)
+
+    def stream_query(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Count the rows of the JSON response as it arrives, without keeping it"""
+        timer = timer or QueryTimer()
+        counter = RowCounter()
+        for chunk in self._iter_response(query, params):
+            counter.feed(chunk)
+            if counter.rows:
+                timer.first_row()
+        timer.last_row()
+
+        return counter.finish()
+
+    def discard_query(
+        self,
+        query: str,
+        timer: Optional[QueryTimer] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """Read the whole response and drop it undecoded"""
+        self._post(query, timer or QueryTimer(), params)
+        return None
+
+    def fingerprint_query(self, query: str) -> ResultFingerprint:
+        """Fold the rows of the JSON response into a fingerprint, chunk by chunk"""
+        body = checked_response(self._post(query, QueryTimer()))
+        fingerprint = ResultFingerprint(query, body["header"]["column_names"])
+        for chunk in body["data"]:
+            for row in zip(*chunk):
+                fingerprint.add(row)
+        return fingerprint
 
-    def execute_query(self, query: str) -> List[Dict[str, Any]]:
-        df = self.client.query(query)
-        return cast(List[Dict[str, Any]], df.to_dict("records"))
+    def begin_writes(self) -> None:
+        """
+        Check out a new change: every write batch is committed to it, and the
+        change is never submitted, which leaves the graph itself untouched
+        """
+        self.client.new_change()
+
+    def write_batch(self, statements: List[Statement]) -> None:
+        """Run write statements in the checked out change, then COMMIT them"""
+        for query, params in statements:
+            self.client.query(inline_params(query, params) if params else query)
+        self.client.query("COMMIT")
+
+    def edge_statements(self, rows: List[Dict[str, int]]) -> List[Statement]:
+        """One MATCH ... CREATE statement per edge, committed together"""
+        return [(MATCH_CREATE_EDGE, row) for row in rows]
+
+    def reset_writes(self) -> None:
+        """Drop the change by checking out the main branch again"""
+        self.client.checkout()
 
     @classmethod
     def add_db_arguments(cls, parser: argparse.ArgumentParser) -> None:
@@ -59,17 +176,177 @@ class TuringDBDriver(AbstractDriver):
         )
 
 
+def checked_response(raw: bytes) -> Dict[str, Any]:
+    """Decode a TuringDB JSON response, raising if the query failed"""
+    body = json.loads(raw)
+
+    if body.get("error") is not None:
+        details = body.get("error_details")
+        raise RuntimeError(f"{body['error']}: {details}" if details else body["error"])
+
+    return body
+
+
+def records_from_response(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Convert a TuringDB JSON response into a list of records.
+    The response holds column names in its header and the rows as a list of
+    column-major chunks.
+    """
+    columns = body["header"]["column_names"]
+    return [dict(zip(columns, row)) for chunk in body["data"] for row in zip(*chunk)]
+
+
+# Complete JSON strings, and the longest prefix of a response that does not
+# end inside a string
+JSON_STRING = re.compile(rb'"(?:[^"\\]++|\\.)*+"', re.DOTALL)
+COMPLETE_STRINGS = re.compile(rb'(?:[^"]++|"(?:[^"\\]++|\\.)*+")*+', re.DOTALL)
+# Bytes of numbers, true, false and null
+SCALAR_BYTES = np.zeros(256, dtype=bool)
+SCALAR_BYTES[list(b"0123456789+-.eEtruefalsn")] = True
+DATA_KEY = re.compile(rb'"data"\s*:\s*\[')
+
+# Depths of the response's "data" array of chunks, of a chunk (a list of
+# columns) and of a column (a list of values)
+DATA_DEPTH = 2
+CHUNK_DEPTH = 3
+COLUMN_DEPTH = 4
+
+
+def _depth(prefix: bytes) -> int:
+    """Nesting depth at the end of a JSON prefix ending outside of a string"""
+    tokens = JSON_STRING.sub(b"", prefix)
+    return (
+        tokens.count(b"[")
+        + tokens.count(b"{")
+        - tokens.count(b"]")
+        - tokens.count(b"}")
+    )
+
+
+class RowCounter:
+    """
+    Counts the rows of a TuringDB JSON response as its bytes arrive, without
+    decoding or keeping its "data": the rows are the values of the first
+    column of each chunk. Every piece received is scanned with numpy for
+    its strings, depth and columns; the part of the response before "data" is kept for finish() to check.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.outside = bytearray()
+        self.in_data = False
+        self.done = False
+        self.carry = b""
+        self.depth = DATA_DEPTH
+        self.column = 0
+
+    def feed(self, data: bytes) -> None:
+        if self.done:
+            return
+        if self.in_data:
+            self._scan(data)
+            return
+
+        self.outside += data
+        outside = bytes(self.outside)
+        for match in DATA_KEY.finditer(outside):
+            prefix = outside[: match.start()]
+            complete = COMPLETE_STRINGS.match(prefix)
+            if complete and complete.end() == len(prefix) and _depth(prefix) == 1:
+                del self.outside[match.end() :]
+                self.in_data = True
+                self._scan(outside[match.end() :])
+                return
+
+    def _scan(self, data: bytes) -> None:
+        chars = np.frombuffer(self.carry + data, np.uint8)
+        if not len(chars):
+            self.carry = b""
+            return
+        index = np.arange(len(chars), dtype=np.int32)
+
+        # Quotes that are not escaped by an odd run of backslashes open and
+        # close strings, whose bytes are not structure
+        backslashes = index - np.maximum.accumulate(
+            np.where(chars == ord("\\"), -1, index)
+        )
+        quotes = chars == ord('"')
+        quotes[1:] &= backslashes[:-1] % 2 == 0
+        in_string = np.cumsum(quotes) % 2 == 1
+        structure = ~in_string & ~quotes
+        scalar = SCALAR_BYTES[chars] & structure
+
+        # A string or scalar cut off at the end is kept for the next piece
+        end = len(chars)
+        if in_string[-1]:
+            end = np.flatnonzero(quotes)[-1]
+        elif scalar[-1]:
+            end = np.flatnonzero(~scalar)[-1] + 1 if not scalar.all() else 0
+        self.carry = chars[end:].tobytes()
+        chars, quotes, in_string, structure, scalar = (
+            a[:end] for a in (chars, quotes, in_string, structure, scalar)
+        )
+        if not len(chars):
+            return
+
+        opens = structure & ((chars == ord("[")) | (chars == ord("{")))
+        closes = structure & ((chars == ord("]")) | (chars == ord("}")))
+        delta = opens.astype(np.int32) - closes
+        after = self.depth + np.cumsum(delta)
+        before = after - delta
+
+        # Column of every byte: commas between columns since its chunk began
+        commas = np.cumsum(structure & (chars == ord(",")) & (before == CHUNK_DEPTH))
+        chunk_start = np.where(opens & (after == CHUNK_DEPTH), index[:end], -1)
+        last_start = np.maximum.accumulate(chunk_start)
+        column = np.where(
+            last_start >= 0,
+            commas - commas[np.maximum(last_start, 0)],
+            self.column + commas,
+        )
+
+        starts = opens | (quotes & in_string)
+        starts[0] |= scalar[0]
+        starts[1:] |= scalar[1:] & ~scalar[:-1]
+        counted = starts & (before == COLUMN_DEPTH) & (column == 0)
+        closed = np.flatnonzero(after < DATA_DEPTH)
+        if len(closed):
+            # The end of "data": the rest of the response is not needed
+            self.done = True
+            counted = counted[: closed[0]]
+        self.rows += int(np.count_nonzero(counted))
+        self.depth = int(after[-1])
+        self.column = int(column[-1])
+
+    def finish(self) -> int:
+        """Check the response for an error and return its number of rows"""
+        checked_response(bytes(self.outside) + (b"]}" if self.in_data else b""))
+        return self.rows
+
+
 def main(args: argparse.Namespace) -> None:
-    driver = TuringDBDriver()
+    connect_args: Dict[str, Any] = {"url": args.url, "database": args.database}
+
+    if args.use_async:
+        from .async_turingdb_driver import AsyncTuringDBDriver
+
+        driver: AbstractDriver = AsyncTuringDBDriver()
+        connect_args["pool_size"] = args.pool_size
+    else:
+        driver = TuringDBDriver()
 
     try:
-        driver.connect(url=args.url, database=args.database)
+        driver.connect(**connect_args)
+
+        if args.writes:
+            driver.run_write_benchmark(args)
+            return
 
-        # Load queries from file
-        with open(args.query, "r") as f:
-            queries = [line.strip().split(";")[0] for line in f if line.strip()]
+        # Load queries from file, or from the --scenario
+        queries = read_query_file(args.query) if args.query else []
 
-        driver.run_benchmark(queries, args.runs)
+        driver.run_benchmark(queries, args)
 
     finally:
         driver.close()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Write workloads of --writes:
+# - create: single-node CREATE statements
+# - merge: single-node MERGE statements on an unindexed property
+# - merge-indexed: the same MERGE statements on an indexed property
+# - unwind-edges: edges between existing nodes, created by batched UNWIND
+WRITE_WORKLOADS = ["create", "merge", "merge-indexed", "unwind-edges"]
+
+# How state is reset after each run: delete what the run wrote, or also
+# restart the server through scripts/manage_servers.py, reloading its dump
+WRITE_RESETS = ["delete", "restart"]
+
+# Label and edge type of everything the write benchmarks create
+WRITE_LABEL = "TuringBenchWrite"
+WRITE_EDGE_TYPE = "TURINGBENCH_WRITE"
+
+CREATE_NODE = f"CREATE (:{WRITE_LABEL} {{id: $id}})"
+MERGE_NODE = f"MERGE (:{WRITE_LABEL} {{id: $id}})"
+UNWIND_EDGES = (
+    f"UNWIND $rows AS row "
+    f"MATCH (a:{WRITE_LABEL} {{id: row.src}}), (b:{WRITE_LABEL} {{id: row.dst}}) "
+    f"CREATE (a)-[:{WRITE_EDGE_TYPE}]->(b)"
+)
+MATCH_CREATE_EDGE = (
+    f"MATCH (a:{WRITE_LABEL} {{id: $src}}), (b:{WRITE_LABEL} {{id: $dst}}) "
+    f"CREATE (a)-[:{WRITE_EDGE_TYPE}]->(b)"
+)
+
+# Batch size of the untimed creation of the nodes of unwind-edges
+SETUP_BATCH_SIZE = 1000
+
+# A write statement and its parameters
+Statement = Tuple[str, Dict[str, Any]]
+
+
+@dataclass
+class WriteResult:
+    """Throughput of one write workload at one batch size"""
+
+    workload: str
+    batch_size: int
+    nodes: int = 0
+    edges: int = 0
+    wall_time_us: int = 0
+    # Latency of every batch, from its first statement to its commit
+    batch_times_us: List[int] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def batches(count: int, size: int) -> Iterator[range]:
+    """Ranges of ids 0..count-1 split into batches of `size`"""
+    for start in range(0, count, size):
+        yield range(start, min(start + size, count))
+
+
+def edge_rows(count: int, nodes: int, seed: int = 0) -> List[Dict[str, int]]:
+    """Endpoints of `count` random edges between nodes 0..nodes-1"""
+    rng = random.Random(seed)
+    return [
+        {"src": rng.randrange(nodes), "dst": rng.randrange(nodes)} for _ in range(count)
+    ]